@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark: gzip (the current fullCode path) vs zstd levels, with and without the shipped dictionary.
+
+Builds the real fullCode text for each repository (scan, then
+payload.iter_code_snippets, streamed through the encoder one piece at a
+time as a request is) and reports compressed size, ratio and compress and
+decompress throughput. "incremental" compresses random 5-file subsets, the
+size of a typical `dokugen update`, where a dictionary matters most.
+
+Requires the zstd extra: pip install 'dokugen[zstd]'
+
+Usage: python benchmarks/bench_compression.py [REPO ...] [--repeat 3] [--incremental-samples 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import zstandard
+
+from dokugen import utils
+from dokugen.payload import GZIP, ZSTD, Codec, iter_code_snippets, load_dictionary
+
+DEFAULT_REPO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", ".."))
+INCREMENTAL_FILES = 5
+
+
+def codecs(dictionary):
+    yield "gzip -6", Codec(GZIP, 6)
+    yield "gzip -9 (current)", Codec(GZIP, 9)
+    for level in (3, 6, 9, 15, 19):
+        yield f"zstd -{level}", Codec(ZSTD, level)
+        if dictionary is not None:
+            yield f"zstd -{level} +dict", Codec(ZSTD, level, dictionary)
+
+
+def compress(codec, pieces):
+    encoder = codec.encoder()
+    out = [encoder.write(piece) for piece in pieces]
+    out.append(encoder.close())
+    return b"".join(out)
+
+
+def decompress(codec, data):
+    if codec.name == GZIP:
+        return zlib.decompress(data, 31)
+    return zstandard.ZstdDecompressor(dict_data=codec.dictionary).decompressobj().decompress(data)
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def measure(codec, samples, repeat):
+    """(compressed bytes, raw bytes, compress s, decompress s) summed over samples."""
+    packed = raw = c_time = d_time = 0
+    for pieces in samples:
+        size = sum(len(p.encode("utf-8")) for p in pieces)
+        elapsed, data = best_of(repeat, lambda: compress(codec, pieces))
+        c_time += elapsed
+        elapsed, text = best_of(repeat, lambda: decompress(codec, data))
+        d_time += elapsed
+        assert len(text) == size
+        packed += len(data)
+        raw += size
+    return packed, raw, c_time, d_time
+
+
+def report(title, samples, dictionary, repeat):
+    print(f"\n{title}")
+    print(f"  {'codec':<20} {'bytes':>12} {'ratio':>7} {'vs gzip -9':>10} {'compress':>12} {'decompress':>12}")
+    baseline = None
+    for label, codec in codecs(dictionary):
+        packed, raw, c_time, d_time = measure(codec, samples, repeat)
+        if codec.name == GZIP and codec.level == 9:
+            baseline = packed
+        versus = f"{packed / baseline * 100:.0f}%" if baseline else ""
+        print(f"  {label:<20} {packed:>12,} {raw / packed:>6.2f}x {versus:>10} "
+              f"{raw / c_time / 1e6:>8.1f} MB/s {raw / d_time / 1e6:>8.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("repos", nargs="*", default=[DEFAULT_REPO], help="Repositories to build fullCode from (default: this one)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest counts")
+    parser.add_argument("--incremental-samples", type=int, default=50, help="Random 5-file subsets per repository")
+    args = parser.parse_args()
+
+    dictionary = load_dictionary()
+    if dictionary is None:
+        print("No zstd dictionary found; run benchmarks/train_zstd_dictionary.py first for the +dict rows.")
+    else:
+        print(f"Dictionary {dictionary.dict_id()} ({len(dictionary.as_bytes()) // 1024} KB)")
+
+    rng = random.Random(1)
+    for repo in args.repos:
+        repo = os.path.abspath(repo)
+        files = utils.scan_files(repo)
+        full = list(iter_code_snippets(files, repo))
+        report(f"{repo}: full, {len(files)} files", [full], dictionary, args.repeat)
+
+        subsets = [rng.sample(files, min(INCREMENTAL_FILES, len(files))) for _ in range(args.incremental_samples)]
+        incremental = [list(iter_code_snippets(subset, repo)) for subset in subsets]
+        report(f"{repo}: incremental, {len(subsets)} x {INCREMENTAL_FILES} files", incremental, dictionary, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
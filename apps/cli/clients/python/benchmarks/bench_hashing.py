@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark: legacy serial SHA-256 (4 KB reads) vs dokugen.hashing.hash_files.
+
+Creates synthetic file trees with different count/size distributions in a
+temp directory and hashes each one with every strategy.
+
+Usage: python benchmarks/bench_hashing.py [--scale 1.0]
+"""
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from dokugen import hashing
+
+# (label, file count, min size, max size)
+DISTRIBUTIONS = [
+    ("many tiny (<2 KB)", 20000, 64, 2 * 1024),
+    ("typical source (1-64 KB)", 5000, 1024, 64 * 1024),
+    ("near scan limit (100-150 KB)", 1000, 100 * 1024, 150 * 1024),
+    ("few large (8-32 MB)", 8, 8 * 1024 * 1024, 32 * 1024 * 1024),
+]
+
+
+def legacy_hash(file_path):
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(4096), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def make_tree(root, count, min_size, max_size, rng):
+    paths = []
+    for i in range(count):
+        sub = os.path.join(root, f"d{i % 50}")
+        os.makedirs(sub, exist_ok=True)
+        path = os.path.join(sub, f"f{i}.txt")
+        with open(path, "wb") as f:
+            f.write(rng.randbytes(rng.randint(min_size, max_size)))
+        paths.append(path)
+    return paths
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply file counts by this factor")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"cpus: {os.cpu_count()}, default algorithm: {hashing.DEFAULT_ALGORITHM}")
+    print(f"{'distribution':32} {'files':>7} {'MB':>8} {'legacy':>9} {'sha256 ||':>10} {'blake2b ||':>11}")
+    for label, count, min_size, max_size in DISTRIBUTIONS:
+        count = max(1, int(count * args.scale))
+        root = tempfile.mkdtemp(prefix="dokugen-bench-")
+        try:
+            paths = make_tree(root, count, min_size, max_size, rng)
+            total_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+
+            legacy = timed(lambda: [legacy_hash(p) for p in paths])
+            sha_parallel = timed(lambda: hashing.hash_files(paths, "sha256"))
+            blake_parallel = timed(lambda: hashing.hash_files(paths, "blake2b-128"))
+
+            print(f"{label:32} {count:>7} {total_mb:>8.1f} {legacy:>8.3f}s {sha_parallel:>9.3f}s {blake_parallel:>10.3f}s")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: compiled IgnoreMatcher vs the per-pattern loop it replaced.
+
+Usage: python benchmarks/bench_ignore_matcher.py [--names 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from dokugen import utils
+from dokugen.ignore import IgnoreMatcher
+
+SAMPLE_NAMES = [
+    "index.ts", "App.tsx", "main.py", "utils.go", "lib.rs", "README.md", "package.json",
+    "logo.png", "bundle.min.js", "types.d.ts", "yarn.lock", "Dockerfile", ".eslintrc.json",
+    ".prettierrc", "server.log", "photo.jpeg", "styles.css", "schema.prisma", "Makefile",
+]
+
+
+def matches_ignore_pattern(filename, pattern):
+    # The matcher utils used before IgnoreMatcher, kept here as the baseline
+    if pattern.startswith("*."):
+        ext = pattern[1:]
+        return filename.endswith(ext)
+    return filename == pattern
+
+
+def legacy_is_ignored(name):
+    for pattern in utils.IGNORE_FILES:
+        if matches_ignore_pattern(name, pattern):
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    names = [rng.choice(SAMPLE_NAMES) for _ in range(args.names)]
+
+    matcher = IgnoreMatcher(utils.IGNORE_FILES)
+    compile_time = timeit.timeit(lambda: IgnoreMatcher(utils.IGNORE_FILES), number=100) / 100
+
+    legacy = min(timeit.repeat(lambda: [legacy_is_ignored(n) for n in names], number=1, repeat=3))
+    compiled = min(timeit.repeat(lambda: [matcher.match(n) for n in names], number=1, repeat=3))
+
+    print(f"patterns:          {len(utils.IGNORE_FILES)}")
+    print(f"names:             {len(names)}")
+    print(f"compile:           {compile_time * 1000:.3f} ms")
+    print(f"legacy loop:       {legacy:.3f} s ({legacy / len(names) * 1e6:.2f} us/name)")
+    print(f"IgnoreMatcher:     {compiled:.3f} s ({compiled / len(names) * 1e6:.2f} us/name)")
+    print(f"speedup:           {legacy / compiled:.1f}x")
+
+    disagreements = sorted({n for n in SAMPLE_NAMES if legacy_is_ignored(n) != matcher.match(n)})
+    if disagreements:
+        print(f"differs from legacy loop on: {', '.join(disagreements)}")
+
+
+if __name__ == "__main__":
+    main()
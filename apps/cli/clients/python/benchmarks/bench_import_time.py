@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmark: CLI startup import time, checked against a budget.
+
+Runs dokugen/cli.py under `python -X importtime` for a few command lines
+and reports import time on top of a bare interpreter (site, encodings).
+Exits non-zero if any scenario's median is over its budget, so it can
+guard the startup latency felt when dokugen runs from git hooks.
+
+Usage: python benchmarks/bench_import_time.py [--runs 5] [--top 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "dokugen", "cli.py")
+
+# (command line, budget in ms on top of the bare interpreter)
+SCENARIOS = [
+    (["--version"], 60),
+    (["--help"], 60),
+    (["revert", "--help"], 300),
+    (["aic", "--help"], 300),
+    (["generate", "--help"], 300),
+]
+
+
+def top_level_imports(argv):
+    """{module: cumulative ms} for the top-level imports of one interpreter run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "DOKUGEN_NO_UPDATE_CHECK": "1"},
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented two extra spaces per level
+        if name.startswith("   "):
+            continue
+        imports[name.strip()] = int(cumulative) / 1000
+    return imports
+
+
+def median_run(argv, runs):
+    samples = [top_level_imports(argv) for _ in range(runs)]
+    total = statistics.median(sum(s.values()) for s in samples)
+    modules = {}
+    for sample in samples:
+        for name, ms in sample.items():
+            modules.setdefault(name, []).append(ms)
+    return total, {name: statistics.median(v) for name, v in modules.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario (median is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports to list per scenario")
+    args = parser.parse_args()
+
+    baseline, baseline_modules = median_run(["-c", "pass"], args.runs)
+    print(f"bare interpreter: {baseline:.1f} ms")
+    print(f"{'command':24} {'import ms':>10} {'budget':>8}  slowest imports")
+
+    over_budget = False
+    for argv, budget in SCENARIOS:
+        total, modules = median_run([CLI, *argv], args.runs)
+        cost = total - baseline
+        slowest = sorted(
+            ((ms, name) for name, ms in modules.items() if name not in baseline_modules),
+            reverse=True,
+        )[:args.top]
+        status = "" if cost <= budget else "  OVER BUDGET"
+        over_budget = over_budget or cost > budget
+        print(f"{' '.join(argv):24} {cost:>10.1f} {budget:>8}  {', '.join(f'{n} {ms:.0f}' for ms, n in slowest)}{status}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
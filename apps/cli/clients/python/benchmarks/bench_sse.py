@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Benchmark: the legacy README stream loop vs dokugen.sse with batched, atomic writes.
+
+Serves a synthetic README as token-sized SSE events (the backend's
+`data: {"response": ...}` format, with ": keep-alive" heartbeats) from a
+local HTTP server, and times each client strategy end to end: request,
+parse and write. The legacy loop is the iter_lines / str.replace /
+json.loads / flush-per-token code it replaced. "decode only" times the
+parsers alone on the same bytes, cut into TCP-sized packets.
+
+Usage: python benchmarks/bench_sse.py [--tokens 200000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import requests
+
+from dokugen import sse
+from dokugen.commands.generate import write_readme_stream
+
+WORDS = ["the", " project", " uses", " `dokugen`", " to", " generate", "\n\n## ", "Install", "ation", " — ", "über", " ✅", "\n- ", "```bash\n"]
+HEARTBEAT_EVERY = 1000
+PACKET_BYTES = 1400
+
+
+def make_stream(tokens, rng):
+    """(SSE body bytes, the README text it carries)."""
+    events, text = [], []
+    for i in range(tokens):
+        token = rng.choice(WORDS)
+        text.append(token)
+        events.append(f"data: {json.dumps({'response': token})}\n\n")
+        if i % HEARTBEAT_EVERY == 0:
+            events.append(": keep-alive\n\n")
+    return "".join(events).encode("utf-8"), "".join(text)
+
+
+def serve(body):
+    packets = [body[i:i + PACKET_BYTES * 8] for i in range(0, len(body), PACKET_BYTES * 8)]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.0"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for packet in packets:
+                self.wfile.write(packet)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def legacy_write(response, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for line in response.iter_lines():
+            if line:
+                decoded = line.decode("utf-8")
+                if decoded.startswith("data:"):
+                    json_str = decoded.replace("data: ", "").strip()
+                    try:
+                        data = json.loads(json_str)
+                        if "response" in data and isinstance(data["response"], str):
+                            f.write(data["response"])
+                            f.flush()
+                    except Exception:
+                        pass
+
+
+def sse_write(response, path):
+    write_readme_stream(response.iter_content(chunk_size=None), path)
+
+
+def legacy_decode(packets):
+    pending = b""
+    out = []
+    for packet in packets:
+        lines = (pending + packet).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line:
+                decoded = line.decode("utf-8")
+                if decoded.startswith("data:"):
+                    data = json.loads(decoded.replace("data: ", "").strip())
+                    out.append(data["response"])
+    return "".join(out)
+
+
+def sse_decode(packets):
+    return "".join(json.loads(event.data)["response"] for event in sse.iter_events(packets))
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=200000, help="Events in the synthetic README stream")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest counts")
+    args = parser.parse_args()
+
+    body, expected = make_stream(args.tokens, random.Random(1))
+    print(f"{args.tokens:,} events, {len(body) / 1e6:.1f} MB of SSE, {len(expected.encode('utf-8')) / 1e6:.2f} MB of README")
+
+    packets = [body[i:i + PACKET_BYTES] for i in range(0, len(body), PACKET_BYTES)]
+    print(f"\n  {'decode only':<28} {'time':>9} {'events/s':>12}")
+    for label, decode in (("legacy line loop", legacy_decode), ("dokugen.sse", sse_decode)):
+        assert decode(packets) == expected, label
+        elapsed = best_of(args.repeat, lambda: decode(packets))
+        print(f"  {label:<28} {elapsed:>8.3f}s {args.tokens / elapsed:>12,.0f}")
+
+    server, url = serve(body)
+    session = requests.Session()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "README.md")
+        print(f"\n  {'end to end (local server)':<28} {'time':>9} {'events/s':>12} {'MB/s':>8}")
+        for label, write in (("legacy, flush per token", legacy_write), ("dokugen.sse, batched", sse_write)):
+            def run():
+                with session.get(url, stream=True) as response:
+                    write(response, path)
+
+            run()
+            with open(path, encoding="utf-8") as f:
+                assert f.read() == expected, label
+            elapsed = best_of(args.repeat, run)
+            print(f"  {label:<28} {elapsed:>8.3f}s {args.tokens / elapsed:>12,.0f} {len(body) / elapsed / 1e6:>8.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Train the zstd dictionary shipped as dokugen/data/source.zdict.
+
+Samples source files from the given trees (checkouts, module caches, site-
+packages), formats each one exactly as it appears in the fullCode payload
+(payload.format_snippet) and trains a dictionary on them, capping every
+language so no single ecosystem dominates.
+
+The server needs the same file (apps/server/dictionaries/) to decompress;
+frames name their dictionary by the ID zstd stores in it, so retraining
+just means shipping both copies together.
+
+Requires the zstd extra: pip install 'dokugen[zstd]'
+
+Usage: python benchmarks/train_zstd_dictionary.py ROOT [ROOT ...] [--size 65536] [--exclude DIR] [--out PATH]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import zstandard
+
+from dokugen.payload import DICTIONARY_PATH, format_snippet
+
+EXTENSIONS = {
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".go", ".rs", ".rb", ".php", ".java", ".kt", ".cs",
+    ".c", ".h", ".cpp", ".swift", ".vue", ".svelte", ".json", ".toml", ".yaml", ".yml",
+    ".md", ".html", ".css", ".scss", ".sql", ".sh", ".gradle", ".xml",
+}
+SKIP_DIRS = {".git", "__pycache__", "dist", "build", "target", "vendor", "tests", "test", "testdata"}
+PER_EXTENSION = 1500
+MAX_FILE_BYTES = 64 * 1024
+# fastcover segment and d-mer sizes; leaving them unset makes zstd search for
+# them, which takes hours on a sample set this size for a percent or two
+SEGMENT_SIZE = 1024
+DMER_SIZE = 8
+
+
+def collect(roots, rng, exclude=()):
+    by_ext = {}
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in SKIP_DIRS and not d.startswith(".") and os.path.join(dirpath, d) not in exclude
+            ]
+            for name in filenames:
+                ext = os.path.splitext(name)[1].lower()
+                if ext in EXTENSIONS:
+                    by_ext.setdefault(ext, []).append((root, os.path.join(dirpath, name)))
+
+    samples = []
+    for ext, paths in sorted(by_ext.items()):
+        rng.shuffle(paths)
+        taken = 0
+        for root, path in paths:
+            if taken >= PER_EXTENSION:
+                break
+            try:
+                size = os.path.getsize(path)
+                if not 0 < size <= MAX_FILE_BYTES:
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            samples.append(format_snippet(os.path.relpath(path, root), content, size).encode("utf-8"))
+            taken += 1
+        print(f"{ext:>8}: {taken} files")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("roots", nargs="+", help="Directory trees to sample source files from")
+    parser.add_argument("--size", type=int, default=64 * 1024, help="Dictionary size in bytes")
+    parser.add_argument("--out", default=DICTIONARY_PATH, help="Where to write the dictionary")
+    parser.add_argument("--exclude", action="append", default=[], help="Skip this directory (e.g. repos held out for the benchmark)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    exclude = {os.path.abspath(p) for p in args.exclude}
+    samples = collect([os.path.abspath(r) for r in args.roots], random.Random(args.seed), exclude)
+    print(f"Training a {args.size // 1024} KB dictionary on {len(samples)} samples "
+          f"({sum(map(len, samples)) / 1024 / 1024:.1f} MB)...")
+    dictionary = zstandard.train_dictionary(args.size, samples, k=SEGMENT_SIZE, d=DMER_SIZE, level=19, threads=-1)
+
+    with open(args.out, "wb") as f:
+        f.write(dictionary.as_bytes())
+    print(f"Wrote {args.out} (dictionary ID {dictionary.dict_id()})")
+
+
+if __name__ == "__main__":
+    main()
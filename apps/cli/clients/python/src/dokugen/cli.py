@@ -5,119 +5,164 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import argparse
-import questionary
-from importlib.metadata import version as _get_version
-from rich.console import Console
-from dokugen import utils
-from dokugen.commands.generate import cmd_generate, register_generate_parser, DOKUGEN_BANNER
-from dokugen.commands.update import cmd_update, register_update_parser
-from dokugen.commands.revert import cmd_revert, register_revert_parser
-from dokugen.commands.aic import cmd_aic, register_aic_parser
-from dokugen.commands.license import cmd_license, register_license_parser
-from dokugen.commands.og import cmd_og, register_og_parser
-from dokugen.commands.changelog import cmd_changelog, register_changelog_parser
+import importlib
 
-console = Console()
+
+class Command:
+    """A subcommand whose module is imported only when it is dispatched.
+
+    The help text here is what `dokugen --help` lists; the module's own
+    register_<name>_parser adds the full argument set once it is loaded.
+    """
+
+    def __init__(self, name, help, aliases=()):
+        self.name = name
+        self.help = help
+        self.aliases = list(aliases)
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(f"dokugen.commands.{self.name}")
+        return self._module
+
+    def register(self, subparsers):
+        getattr(self.module, f"register_{self.name}_parser")(subparsers)
+
+    def register_stub(self, subparsers, project_name):
+        subparsers.add_parser(self.name, aliases=self.aliases, help=self.help.format(project=project_name))
+
+    def run(self, args):
+        return getattr(self.module, f"cmd_{self.name}")(args)
+
+
+COMMANDS = [
+    Command("generate", "Scan {project} and generate README.md"),
+    Command("update", "Update auto-generated sections of {project} README while preserving custom content"),
+    Command("revert", "Revert {project} README.md to the previous Dokugen-generated backup"),
+    Command("license", "Generate a LICENSE file for {project}"),
+    Command("aic", "AI-powered Git commit generator for {project}", aliases=["ai-commit"]),
+    Command("og", "Generate a beautiful 1200x630 OG social preview card for your project"),
+    Command("changelog", "AI-powered CHANGELOG generator for {project}", aliases=["ai-changelog"]),
+    Command("detect", "Show the detected project type of {project} with candidates and evidence"),
+    Command("batch", "Generate READMEs for many repositories at once, without prompts"),
+]
+
+COMMANDS_BY_NAME = {alias: c for c in COMMANDS for alias in [c.name, *c.aliases]}
+
+
+class _VersionAction(argparse.Action):
+    # Resolves the installed version only when --version is actually passed
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help="show program's version number and exit"):
+        super().__init__(option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.exit(message=f"{parser.prog} {get_version()}\n")
+
+
+def get_version():
+    try:
+        from importlib.metadata import version
+
+        return version("dokugen")
+    except Exception:
+        return "unknown"
+
+
+def requested_command(argv):
+    """The subcommand named on the command line, if any (top-level options take no values)."""
+    for arg in argv:
+        if not arg.startswith("-"):
+            return COMMANDS_BY_NAME.get(arg)
+    return None
+
+
+def build_parser(project_name, command=None):
+    parser = argparse.ArgumentParser(
+        prog="dokugen",
+        description=f"Automatically generate high-quality README for {project_name}",
+    )
+    parser.add_argument("--version", "-v", action=_VersionAction)
+
+    subparsers = parser.add_subparsers(dest="command")
+    for c in COMMANDS:
+        if c is command:
+            c.register(subparsers)
+        else:
+            c.register_stub(subparsers, project_name)
+    return parser
+
+
+def goodbye():
+    from rich.console import Console
+
+    sys.stdout.write('\x1b[2J\x1b[3J\x1b[H')
+    sys.stdout.flush()
+    Console().print("[bold #000080]Dokugen: Goodbye![/bold #000080]")
+
+
+def interactive_menu(parser, project_name):
+    import questionary
+    from rich.console import Console
+    from dokugen import utils
+    from dokugen.commands.generate import DOKUGEN_BANNER
+
+    console = Console()
+    utils.check_and_update()
+    console.print(DOKUGEN_BANNER, style="#000080")
+    console.print(f"[blue]Welcome to Dokugen (v{get_version()}) - Automatic README Generator\n[/blue]")
+
+    action = questionary.select(
+        "What would you like to do?",
+        choices=[
+            questionary.Choice(f"Generate README  - Scan {project_name} and create a new README.md", value="generate"),
+            questionary.Choice(f"Update README    - Update an existing Dokugen-generated README for {project_name}", value="update"),
+            questionary.Choice(f"Revert README    - Restore the previous Dokugen-generated README for {project_name}", value="revert"),
+            questionary.Choice("Generate LICENSE - Protect your work and open the door to collaboration for {project_name}.", value="license"),
+            questionary.Choice(f"Generate CHANGELOG - Analyze commit history and update CHANGELOG.md for {project_name}", value="changelog"),
+            questionary.Choice(f"AI Git Commit    - Generate commit message and commit staged changes for {project_name}", value="aic"),
+            questionary.Choice("View Help        - Show all available commands and options", value="help"),
+            questionary.Choice("Exit", value="exit"),
+        ],
+    ).ask()
+
+    if action == "exit" or action is None:
+        goodbye()
+        return
+
+    class Args:
+        template = None
+        overwrite = True
+        push = False
+        force_new = False
+        version_tag = None
+        limit = "200"
+        model = None
+        outfile = "CHANGELOG.md"
+
+    if action == "help":
+        parser.print_help()
+    else:
+        COMMANDS_BY_NAME[action].run(Args())
 
 
 def main():
     try:
-        try:
-            __version__ = _get_version("dokugen")
-        except Exception:
-            __version__ = "unknown"
         project_name = os.path.basename(os.getcwd())
-        parser = argparse.ArgumentParser(
-            prog="dokugen",
-            description=f"Automatically generate high-quality README for {project_name}",
-        )
-        parser.add_argument("--version", "-v", action="version", version=f"%(prog)s {__version__}")
-
-        subparsers = parser.add_subparsers(dest="command")
-
-        # Register subcommand parsers
-        register_generate_parser(subparsers)
-        register_update_parser(subparsers)
-        register_revert_parser(subparsers)
-        register_license_parser(subparsers)
-        register_aic_parser(subparsers)
-        register_og_parser(subparsers)
-        register_changelog_parser(subparsers)
+        command = requested_command(sys.argv[1:])
+        parser = build_parser(project_name, command)
 
         if len(sys.argv) == 1:
-            utils.check_and_update()
-            console.print(DOKUGEN_BANNER, style="#000080")
-            console.print(f"[blue]Welcome to Dokugen (v{__version__}) - Automatic README Generator\n[/blue]")
-
-            action = questionary.select(
-                "What would you like to do?",
-                choices=[
-                    questionary.Choice(f"Generate README  - Scan {project_name} and create a new README.md", value="generate"),
-                    questionary.Choice(f"Update README    - Update an existing Dokugen-generated README for {project_name}", value="update"),
-                    questionary.Choice(f"Revert README    - Restore the previous Dokugen-generated README for {project_name}", value="revert"),
-                    questionary.Choice("Generate LICENSE - Protect your work and open the door to collaboration for {project_name}.", value="license"),
-                    questionary.Choice(f"Generate CHANGELOG - Analyze commit history and update CHANGELOG.md for {project_name}", value="changelog"),
-                    questionary.Choice(f"AI Git Commit    - Generate commit message and commit staged changes for {project_name}", value="aic"),
-                    questionary.Choice("View Help        - Show all available commands and options", value="help"),
-                    questionary.Choice("Exit", value="exit"),
-                ],
-            ).ask()
-
-            if action == "exit" or action is None:
-                sys.stdout.write('\x1b[2J\x1b[3J\x1b[H')
-                sys.stdout.flush()
-                console.print("[bold #000080]Dokugen: Goodbye![/bold #000080]")
-                return
-
-            class Args:
-                template = None
-                overwrite = True
-                push = False
-                force_new = False
-                version_tag = None
-                limit = "200"
-                model = None
-                outfile = "CHANGELOG.md"
-
-            if action == "generate":
-                cmd_generate(Args())
-            elif action == "update":
-                cmd_update(Args())
-            elif action == "revert":
-                cmd_revert(Args())
-            elif action == "license":
-                cmd_license(Args())
-            elif action == "changelog":
-                cmd_changelog(Args())
-            elif action == "aic":
-                cmd_aic(Args())
-            elif action == "og":
-                cmd_og(Args())
-            elif action == "help":
-                parser.print_help()
-
+            interactive_menu(parser, project_name)
         else:
             args = parser.parse_args()
-            if args.command == "generate":
-                cmd_generate(args)
-            elif args.command == "update":
-                cmd_update(args)
-            elif args.command == "revert":
-                cmd_revert(args)
-            elif args.command == "license":
-                cmd_license(args)
-            elif args.command in ["changelog", "ai-changelog"]:
-                cmd_changelog(args)
-            elif args.command in ["aic", "ai-commit"]:
-                cmd_aic(args)
-            elif args.command == "og":
-                cmd_og(args)
+            if command is not None:
+                command.run(args)
             else:
                 parser.print_help()
     except KeyboardInterrupt:
-        sys.stdout.write('\x1b[2J\x1b[3J\x1b[H')
-        sys.stdout.flush()
-        console.print("[bold #000080]Dokugen: Goodbye![/bold #000080]")
+        goodbye()
         sys.exit(0)
 
 
@@ -5,7 +5,7 @@ import requests
 import subprocess
 import questionary
 from rich.console import Console
-from dokugen import utils
+from dokugen import network, utils
 
 console = Console()
 
@@ -16,11 +16,9 @@ def cmd_aic(args):
         console.print("[red]Opps... No Git repository found. Please navigate to a project directory that has a Git repository, or initialize one using 'git init'.[/red]")
         sys.exit(1)
 
-    if not utils.check_internet_connection():
-        raw_username = utils.get_user_info().get("username", "")
-        username = "".join([i for i in raw_username if not i.isdigit()]) if raw_username else ""
-        console.print(f"[red]Opps... {username} kindly check your device or pc internet connection and try again.[/red]")
-        sys.exit(1)
+    # Connectivity is established optimistically: resolve the backend while
+    # git runs, and report connection failures where the API call fails
+    utils.prefetch_backend_domain()
 
     try:
         try:
@@ -58,7 +56,7 @@ def cmd_aic(args):
             backend_domain = utils.get_backend_domain()
             user_info = utils.get_user_info()
 
-            response = requests.post(
+            response = network.post(
                 f"{backend_domain}/api/generate-commit",
                 json={
                     "diff": diff,
@@ -113,7 +111,7 @@ def cmd_aic(args):
             elif action == "Regenerate message":
                 with utils.create_ticking_spinner("Regenerating commit message...") as spinner:
                     try:
-                        response = requests.post(
+                        response = network.post(
                             f"{backend_domain}/api/generate-commit",
                             json={
                                 "diff": diff,
@@ -142,9 +140,7 @@ def cmd_aic(args):
             console.print("[green]Push successful[/green]")
 
     except (requests.exceptions.RequestException, requests.exceptions.ConnectionError):
-        raw_username = utils.get_user_info().get("username", "")
-        username = "".join([i for i in raw_username if not i.isdigit()]) if raw_username else ""
-        console.print(f"[red]Opps... {username} kindly check your device or pc internet connection and try again.[/red]")
+        utils.print_connection_error()
         sys.exit(1)
     except Exception as e:
         console.print(f"[red]Commit failed: {e}[/red]")
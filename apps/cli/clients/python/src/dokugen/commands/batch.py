@@ -0,0 +1,292 @@
+import os
+import sys
+import glob
+import json
+import time
+import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from rich.console import Console
+from rich.markup import escape
+from dokugen import network, utils
+from dokugen.commands.generate import (
+    ReadmeOptions, ReadmeRequestError, is_dokugen_readme, prepare_readme_job, send_readme_job,
+)
+
+console = Console()
+
+DEFAULT_REPORT = "dokugen-batch-report.json"
+DEFAULT_CONCURRENCY = 4
+
+STATUS_STYLES = {
+    "generated": "green",
+    "prepared": "green",
+    "up-to-date": "blue",
+    "skipped": "yellow",
+    "failed": "red",
+}
+
+
+def expand_repos(patterns, list_file=None):
+    """Directories named by paths/globs (and lines of list_file, "-" for stdin), deduplicated in order."""
+    patterns = list(patterns)
+    if list_file:
+        f = sys.stdin if list_file == "-" else open(list_file, "r", encoding="utf-8")
+        with f:
+            patterns.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+
+    repos = []
+    seen = set()
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            path = os.path.abspath(path)
+            if os.path.isdir(path) and path not in seen:
+                seen.add(path)
+                repos.append(path)
+    return repos
+
+
+def prepare_repo(project_dir, settings):
+    """Scan, detect, hash and pack one repository; runs in a worker process.
+
+    Returns (result, job) where job is None when there is nothing to send.
+    """
+    started = time.perf_counter()
+    result = {"path": project_dir, "status": None, "timings": {}}
+
+    def finish(status, reason=None):
+        result["status"] = status
+        if reason:
+            result["reason"] = reason
+        result["timings"]["prepare"] = round(time.perf_counter() - started, 3)
+        return result, None
+
+    if not utils.is_git_repository(project_dir):
+        return finish("skipped", "not a git repository")
+
+    readme_path = os.path.join(project_dir, "README.md")
+    existing_readme = None
+    if os.path.exists(readme_path):
+        if settings["existing"] == "skip":
+            return finish("skipped", "README.md exists")
+        if settings["existing"] == "update":
+            with open(readme_path, "r", encoding="utf-8") as f:
+                existing_readme = f.read()
+            # Like `dokugen update`, only README.md files Dokugen wrote are updated in place
+            if not is_dokugen_readme(existing_readme):
+                return finish("skipped", "README.md was not generated by Dokugen")
+
+    snapshot = utils.snapshot_project(project_dir, use_git_index=settings["git_index"])
+    detection = utils.detect_project_tree_cached(project_dir, snapshot)
+    result["projectType"] = detection.type
+    result["files"] = len(snapshot.files)
+    result["timings"]["scan"] = round(time.perf_counter() - started, 3)
+
+    job = prepare_readme_job(
+        detection.type, snapshot.files, project_dir, existing_readme, settings["template"],
+        ReadmeOptions(**settings["options"]), settings["token_budget"], settings["skeleton"],
+        snapshot, detection,
+    )
+    if job.up_to_date:
+        return finish("up-to-date")
+
+    result["sentFiles"] = len(job.context.files)
+    result["estimatedTokens"] = job.context.estimated_tokens
+    result["timings"]["prepare"] = round(time.perf_counter() - started, 3)
+    return result, job
+
+
+def send_job(job, backend_domain, result):
+    """Send one prepared job, recording its status and timing in result."""
+    started = time.perf_counter()
+    try:
+        send_readme_job(job, backend_domain)
+        result["status"] = "generated"
+    except ReadmeRequestError as e:
+        result["status"] = "failed"
+        result["reason"] = str(e)
+    except network.CONNECTION_ERRORS as e:
+        result["status"] = "failed"
+        result["reason"] = f"connection error: {e}"
+    except Exception as e:
+        result["status"] = "failed"
+        result["reason"] = str(e)
+    result["timings"]["generate"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def print_result(result):
+    style = STATUS_STYLES.get(result["status"], "white")
+    total = sum(result["timings"].get(k, 0) for k in ("prepare", "generate"))
+    line = f"[{style}]{result['status']:>10}[/{style}]  {escape(result['path'])}  [dim]{total:.1f}s"
+    if result.get("projectType"):
+        line += f"  {escape(result['projectType'])}"
+    if result.get("reason"):
+        line += f"  ({escape(result['reason'])})"
+    console.print(line + "[/dim]")
+
+
+def write_report(path, report):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def cmd_batch(args):
+    repos = expand_repos(getattr(args, "repos", []) or [], getattr(args, "from_file", None))
+    if not repos:
+        console.print("[red]No repository directories matched.[/red]")
+        sys.exit(1)
+
+    dry_run = getattr(args, "dry_run", False)
+    if not dry_run:
+        # Resolve the backend while the first repositories are being prepared
+        utils.prefetch_backend_domain()
+
+    settings = {
+        "existing": getattr(args, "existing", "skip"),
+        "git_index": getattr(args, "git_index", False),
+        "template": getattr(args, "template", None),
+        "token_budget": getattr(args, "token_budget", None),
+        "skeleton": getattr(args, "skeleton", False),
+        "options": {
+            "include_setup": getattr(args, "setup", False),
+            "include_contrib": getattr(args, "contrib", False),
+            "include_api_docs": getattr(args, "api_docs", False),
+            "include_diagrams": getattr(args, "diagrams", False),
+            "linkedin_username": getattr(args, "linkedin", None),
+            "twitter_username": getattr(args, "twitter", None),
+        },
+    }
+    jobs = getattr(args, "jobs", None) or min(len(repos), os.cpu_count() or 1)
+    concurrency = max(1, getattr(args, "concurrency", None) or DEFAULT_CONCURRENCY)
+
+    console.print(f"[blue]Preparing {len(repos)} repositories on {jobs} process(es), "
+                  f"sending up to {concurrency} request(s) at a time...[/blue]")
+    started_at = datetime.datetime.now().isoformat()
+    start_time = time.time()
+    started = time.perf_counter()
+    results = {}
+    backend_domain = None
+
+    # Workers are spawned rather than forked: the parent already runs threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as workers, \
+            ThreadPoolExecutor(max_workers=concurrency) as senders:
+        prepared = {workers.submit(prepare_repo, repo, settings): repo for repo in repos}
+        sending = []
+        for future in as_completed(prepared):
+            repo = prepared[future]
+            try:
+                result, job = future.result()
+            except Exception as e:
+                result, job = {"path": repo, "status": "failed", "reason": str(e), "timings": {}}, None
+            results[repo] = result
+
+            if job is None:
+                print_result(result)
+            elif dry_run:
+                result["status"] = "prepared"
+                print_result(result)
+            else:
+                if backend_domain is None:
+                    backend_domain = utils.get_backend_domain()
+                sending.append(senders.submit(send_job, job, backend_domain, result))
+
+        for future in as_completed(sending):
+            print_result(future.result())
+
+    summary = {}
+    for result in results.values():
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+
+    report_path = os.path.abspath(getattr(args, "report", None) or DEFAULT_REPORT)
+    write_report(report_path, {
+        "startedAt": started_at,
+        "elapsed": round(time.perf_counter() - started, 3),
+        "backend": backend_domain,
+        "summary": summary,
+        "repos": [results[repo] for repo in repos],
+    })
+
+    counts = ", ".join(f"{n} {status}" for status, n in sorted(summary.items()))
+    console.print(f"\n[blue]{counts} in {utils.format_elapsed_time(start_time)}. "
+                  f"Report written to {report_path}[/blue]")
+
+    if summary.get("failed"):
+        sys.exit(1)
+
+
+def register_batch_parser(subparsers):
+    parser = subparsers.add_parser("batch", help="Generate READMEs for many repositories at once, without prompts")
+    parser.add_argument(
+        "repos",
+        nargs="*",
+        help="Repository directories or globs (e.g. 'services/*')",
+    )
+    parser.add_argument(
+        "--from",
+        dest="from_file",
+        default=None,
+        help="Read repository paths from a file, one per line ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--existing",
+        choices=["skip", "update", "overwrite"],
+        default="skip",
+        help="What to do with repositories that already have a README.md (default: skip); "
+             "update only touches READMEs Dokugen generated",
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="Worker processes that scan and pack repositories (default: CPU count)",
+    )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Generation requests in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--report",
+        default=DEFAULT_REPORT,
+        help=f"Where to write the JSON summary report (default: {DEFAULT_REPORT})",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=False,
+        help="Scan, detect and pack every repository but send nothing",
+    )
+    parser.add_argument("--setup", action="store_true", default=False, help="Include setup instructions")
+    parser.add_argument("--contrib", action="store_true", default=False, help="Include contribution guidelines")
+    parser.add_argument("--api-docs", action="store_true", default=False, help="Include API documentation")
+    parser.add_argument("--diagrams", action="store_true", default=False, help="Include system design diagrams")
+    parser.add_argument("--linkedin", default=None, help="LinkedIn username for the author section")
+    parser.add_argument("--twitter", default=None, help="X (Twitter) username for the author section")
+    parser.add_argument(
+        "--template",
+        help="use a custom GitHub repo readme file as a template",
+    )
+    parser.add_argument(
+        "--git-index",
+        action="store_true",
+        default=False,
+        help="List files from the Git index instead of walking the directory tree (skips untracked build artifacts)",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=None,
+        help="Approximate token budget for the code sent to the model (0 = unlimited, default 250000 or $DOKUGEN_TOKEN_BUDGET)",
+    )
+    parser.add_argument(
+        "--skeleton",
+        action="store_true",
+        default=False,
+        help="Send source files as skeletons (imports, signatures, docstrings, routes) instead of full bodies",
+    )
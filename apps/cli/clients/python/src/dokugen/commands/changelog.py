@@ -5,7 +5,7 @@ import time
 import requests
 import subprocess
 from rich.console import Console
-from dokugen import utils
+from dokugen import network, utils
 
 console = Console()
 
@@ -16,11 +16,9 @@ def cmd_changelog(args):
         console.print("[red]Opps... No Git repository found. Please navigate to a project directory that has a Git repository, or initialize one using 'git init'.[/red]")
         sys.exit(1)
 
-    if not utils.check_internet_connection():
-        raw_username = utils.get_user_info().get("username", "")
-        username = "".join([i for i in raw_username if not i.isdigit()]) if raw_username else ""
-        console.print(f"[red]Opps... {username} kindly check your device or pc internet connection and try again.[/red]")
-        sys.exit(1)
+    # Connectivity is established optimistically: resolve the backend while
+    # git runs, and report connection failures where the API call fails
+    utils.prefetch_backend_domain()
 
     try:
         limit_val = getattr(args, "limit", "200")
@@ -102,7 +100,7 @@ def cmd_changelog(args):
             if model_name:
                 payload["model"] = model_name
 
-            response = requests.post(
+            response = network.post(
                 f"{backend_domain}/api/generate-changelog",
                 json=payload,
                 timeout=60,
@@ -125,9 +123,7 @@ def cmd_changelog(args):
         console.print(f"[green]CHANGELOG generated successfully in {elapsed_str}! Written to {os.path.basename(outfile)}[/green]")
 
     except (requests.exceptions.RequestException, requests.exceptions.ConnectionError):
-        raw_username = utils.get_user_info().get("username", "")
-        username = "".join([i for i in raw_username if not i.isdigit()]) if raw_username else ""
-        console.print(f"[red]Opps... {username} kindly check your device or pc internet connection and try again.[/red]")
+        utils.print_connection_error()
         sys.exit(1)
     except Exception as e:
         console.print(f"[red]Changelog generation failed: {e}[/red]")
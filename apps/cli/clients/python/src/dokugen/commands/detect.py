@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from rich.console import Console
+from rich.markup import escape
+from rich.tree import Tree
+from dokugen import project_detect, utils
+from dokugen.scanner import default_workers
+
+console = Console()
+
+# Candidates listed per package in the human-readable tree
+SHOWN_CANDIDATES = 3
+
+
+def detect_one(project_dir, use_cache=True):
+    """{"projectDir", "detection"} for one directory, or {"projectDir", "error"}."""
+    project_dir = os.path.abspath(project_dir)
+    if not os.path.isdir(project_dir):
+        return {"projectDir": project_dir, "error": "not a directory"}
+    try:
+        if use_cache:
+            tree = utils.detect_project_tree_cached(project_dir)
+        else:
+            tree = project_detect.detect_project_tree(project_dir)
+    except Exception as e:
+        return {"projectDir": project_dir, "error": str(e)}
+    return {"projectDir": project_dir, "detection": tree.to_dict()}
+
+
+def _label(node):
+    label = f"[bold]{escape(node['path'] or '.')}[/bold]  [cyan]{escape(node['type'])}[/cyan]"
+    if node["confidence"] is not None:
+        label += f" [dim]({node['category']}, {node['confidence']})[/dim]"
+    elif node["layout"] != "single":
+        label += f" [dim]({node['layout']})[/dim]"
+    return label
+
+
+def _add_node(parent, node):
+    branch = parent.add(_label(node))
+    for candidate in node["candidates"][:SHOWN_CANDIDATES]:
+        evidence = ", ".join(
+            f"{e['file']} ({e['reason']})" if e["reason"] != "present" else e["file"]
+            for e in candidate["evidence"] if e["file"]
+        )
+        branch.add(f"[dim]{candidate['confidence']:>3}[/dim] {escape(candidate['type'])} [dim]{escape(evidence)}[/dim]")
+    for child in node["children"]:
+        _add_node(branch, child)
+
+
+def print_result(result):
+    if "error" in result:
+        console.print(f"[red]{escape(result['projectDir'])}: {escape(result['error'])}[/red]")
+        return
+    root = Tree(f"[blue]{escape(result['projectDir'])}[/blue]")
+    _add_node(root, result["detection"])
+    console.print(root)
+
+
+def cmd_detect(args):
+    paths = getattr(args, "paths", None) or [os.getcwd()]
+    as_json = getattr(args, "json", False)
+    use_cache = not getattr(args, "no_cache", False)
+
+    # Results are written as they complete, in argument order; one JSON document
+    # for a single path, one per line (JSON Lines) for batch audits
+    failed = False
+    with ThreadPoolExecutor(max_workers=min(len(paths), getattr(args, "jobs", None) or default_workers())) as pool:
+        for result in pool.map(lambda p: detect_one(p, use_cache), paths):
+            failed = failed or "error" in result
+            if as_json:
+                sys.stdout.write(json.dumps(result, indent=2 if len(paths) == 1 else None) + "\n")
+                sys.stdout.flush()
+            else:
+                print_result(result)
+
+    if failed:
+        sys.exit(1)
+
+
+def register_detect_parser(subparsers):
+    project_name = os.path.basename(os.getcwd())
+    parser = subparsers.add_parser("detect", help=f"Show the detected project type of {project_name} with candidates and evidence")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Project directories to detect (default: current directory)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        default=False,
+        help="Print machine-readable JSON (one object per line when several paths are given)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Always re-run detection instead of reusing the cached result",
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="Directories detected in parallel",
+    )
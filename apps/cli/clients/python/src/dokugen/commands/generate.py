@@ -1,14 +1,18 @@
 import os
 import sys
 import json
+import time
+import itertools
 import platform
-import requests
+import shutil
 import questionary
 import webbrowser
 import subprocess
 from rich.console import Console
-from dokugen import utils
-from dokugen.project_detect import detect_project_type
+from rich.markup import escape
+from dokugen import hashing, headless, network, sse, upload, utils
+from dokugen.payload import Base64Encoder, Codec, iter_code_snippets, iter_encoded, iter_json_body, negotiate_codec
+from dokugen.packer import get_token_budget, pack_context
 
 console = Console()
 
@@ -22,6 +26,10 @@ DOKUGEN_BANNER = """
 """
 
 API_TIMEOUT = 300
+# The streamed README is written out in batches of this many characters, or
+# after this many seconds, rather than with a flush per token
+STREAM_FLUSH_CHARS = 64 * 1024
+STREAM_FLUSH_INTERVAL = 1.0
 
 
 def ask_yes_no(message):
@@ -158,7 +166,7 @@ def prompt_myhappr():
         with utils.create_ticking_spinner("Opening myhappr...") as spinner:
             for attempt in range(1, max_retries + 1):
                 try:
-                    res = requests.get("https://api.myhappr.com/api/v1/auth/google-auth", timeout=5)
+                    res = network.get("https://api.myhappr.com/api/v1/auth/google-auth", timeout=5)
                     if res.status_code == 200:
                         data = res.json()
                         uri = data.get("data", {}).get("uri")
@@ -177,139 +185,358 @@ def prompt_myhappr():
         pass
 
 
-def generate_readme_remote(project_type, project_files, project_dir, existing_readme=None, template_url=None):
-    try:
-        console.print("[blue]Analyzing project files...[/blue]")
-        readme_path = os.path.join(project_dir, "README.md")
+class ReadmeOptions:
+    """Answers to the README questions, from the prompts or given up front."""
 
-        include_setup = False
-        include_contrib = False
-        include_api_docs = False
-        include_diagrams = False
-        linkedin_url = ""
-        twitter_url = ""
+    def __init__(self, include_setup=False, include_contrib=False, include_api_docs=False,
+                 include_diagrams=False, linkedin_username=None, twitter_username=None):
+        self.include_setup = include_setup
+        self.include_contrib = include_contrib
+        self.include_api_docs = include_api_docs
+        self.include_diagrams = include_diagrams
+        self.linkedin_username = linkedin_username
+        self.twitter_username = twitter_username
 
-        if not template_url:
-            ans_setup = ask_yes_no("Do you want to include setup instructions in the README?")
-            if ans_setup == "cancel":
-                return None
-            include_setup = (ans_setup == "yes")
+    def to_payload(self):
+        return {
+            "includeSetup": self.include_setup,
+            "includeContributionGuideLine": self.include_contrib,
+            "includeApiDocs": self.include_api_docs,
+            "includeDiagrams": self.include_diagrams,
+            "linkedinUrl": f"https://linkedin.com/in/{self.linkedin_username}" if self.linkedin_username else "",
+            "twitterUrl": f"https://x.com/{self.twitter_username}" if self.twitter_username else "",
+        }
 
-            ans_contrib = ask_yes_no("Include contribution guidelines in README?")
-            if ans_contrib == "cancel":
-                return None
-            include_contrib = (ans_contrib == "yes")
 
-            ans_api = ask_yes_no("Include API documentation in README?")
-            if ans_api == "cancel":
-                return None
-            include_api_docs = (ans_api == "yes")
+def ask_readme_options():
+    """ReadmeOptions from the interactive prompts, or None if the user cancelled."""
+    answers = []
+    for question in [
+        "Do you want to include setup instructions in the README?",
+        "Include contribution guidelines in README?",
+        "Include API documentation in README?",
+        "Include system design diagrams in README?",
+    ]:
+        ans = ask_yes_no(question)
+        if ans == "cancel":
+            return None
+        answers.append(ans == "yes")
+
+    socials = ask_social_handles()
+    return ReadmeOptions(*answers, socials.get("linkedinUsername"), socials.get("twitterUsername"))
+
+
+class ReadmeRequestError(Exception):
+    def __init__(self, status, text):
+        # status is None for errors reported inside an already-started stream
+        super().__init__(f"Error {status}: {text}" if status is not None else text)
+        self.status = status
+        self.text = text
+
+
+class ReadmeJob:
+    """One README request, prepared without prompts or calls to the backend.
+
+    Plain data apart from the scan snapshot, which is not pickled, so jobs
+    can be prepared in worker processes and sent from the parent.
+    """
+
+    def __init__(self, project_dir, project_files, payload, context, file_index, hash_algorithm,
+                 modified_files=(), deleted_files=(), is_incremental=False, up_to_date=False, snapshot=None):
+        self.project_dir = project_dir
+        self.readme_path = os.path.join(project_dir, "README.md")
+        self.project_files = project_files
+        self.payload = payload
+        self.context = context
+        self.file_index = file_index
+        self.hash_algorithm = hash_algorithm
+        self.modified_files = list(modified_files)
+        self.deleted_files = list(deleted_files)
+        self.is_incremental = is_incremental
+        self.up_to_date = up_to_date
+        self.snapshot = snapshot
+        # Chunk counts of the last chunked upload, if one was made
+        self.upload_stats = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["snapshot"] = None
+        return state
+
+    @property
+    def code_bytes(self):
+        """On-disk size of the files whose code goes into the request."""
+        return sum(self.file_index[f]["size"] for f in self.context.files)
+
+    def snippets(self):
+        """The fullCode text, one piece per directory header or file."""
+        read = self.snapshot.read_snippet if self.snapshot is not None else None
+        return iter_code_snippets(self.context.files, self.project_dir, self.context.transform, read)
+
+    def json_payload(self, codec=None):
+        """The payload for JSON transports, with existingReadme compressed and base64-encoded."""
+        codec = codec or Codec()
+        existing_readme = self.payload["existingReadme"]
+        return {
+            **self.payload,
+            **codec.payload_fields(),
+            "existingReadme": utils.compress_data(existing_readme, codec) if existing_readme else None,
+            "compressed": True,
+        }
 
-            ans_diagrams = ask_yes_no("Include system design diagrams in README?")
-            if ans_diagrams == "cancel":
-                return None
-            include_diagrams = (ans_diagrams == "yes")
+    def body(self, codec=None):
+        """The JSON request body; fullCode is compressed and base64-encoded while it is being sent."""
+        codec = codec or Codec()
+        return iter_json_body(self.json_payload(codec), "fullCode", iter_encoded(self.snippets(), Base64Encoder(codec.encoder())))
+
+    def binary_body(self, codec=None):
+        """(metadata length, body) for the binary transport.
+
+        The body is the payload as JSON followed by the compressed fullCode as
+        raw bytes, streamed, which spares the base64 step and its third more bytes.
+        """
+        codec = codec or Codec()
+        metadata = json.dumps({**self.payload, **codec.payload_fields()}).encode("utf-8")
+        return len(metadata), itertools.chain([metadata], iter_encoded(self.snippets(), codec.encoder()))
+
+    def manifest_body(self, manifest, codec=None):
+        """The request body naming already-uploaded chunks instead of carrying the code."""
+        return json.dumps({**self.json_payload(codec), "fullCodeManifest": manifest}).encode("utf-8")
+
+
+def prepare_readme_job(project_type, project_files, project_dir, existing_readme=None, template_url=None,
+                       options=None, token_budget=None, skeleton=False, snapshot=None, detection=None):
+    """Hash, diff against the cache and pack the context for one README request."""
+    options = options or ReadmeOptions()
+    cache = utils.load_cache(project_dir)
+    cached_files = cache.get("files", {}) if cache else {}
+    hash_algorithm = utils.cache_hash_algorithm(cache) if cache else hashing.DEFAULT_ALGORITHM
+
+    file_index = utils.fingerprint_files(project_dir, project_files, cached_files, hash_algorithm, snapshot)
+    # Files deleted or made unreadable since the scan have no size to pack and nothing to send
+    unreadable = {f for f, entry in file_index.items() if entry["size"] is None}
+    if unreadable:
+        project_files = [f for f in project_files if f not in unreadable]
+        for f in unreadable:
+            del file_index[f]
+
+    is_incremental = False
+    modified_files = []
+    deleted_files = []
+    if existing_readme and cache:
+        modified_files = [
+            f for f in project_files if file_index[f]["hash"] != utils.cached_file_hash(cached_files.get(f))
+        ]
+        deleted_files = [f for f in cached_files if f not in file_index]
+        if not modified_files and not deleted_files:
+            return ReadmeJob(project_dir, project_files, None, None, file_index, hash_algorithm, up_to_date=True)
+        is_incremental = True
+
+    code_files = modified_files if is_incremental else project_files
+    recent_files = modified_files if is_incremental else utils.get_recently_changed_files(project_dir)
+    context = pack_context(
+        code_files,
+        {f: file_index[f]["size"] for f in code_files},
+        get_token_budget(token_budget),
+        project_type,
+        recent_files,
+        skeleton=skeleton,
+        detection=detection,
+    )
 
-            socials = ask_social_handles()
-            linkedin_username = socials.get("linkedinUsername")
-            twitter_username = socials.get("twitterUsername")
+    payload = {
+        "projectType": project_type,
+        "detection": detection.to_dict() if detection is not None else None,
+        "projectFiles": project_files,
+        "userInfo": utils.get_user_info(project_dir),
+        "options": {
+            **options.to_payload(),
+            "isIncremental": is_incremental,
+            "modifiedFiles": modified_files if is_incremental else None,
+            "contextPack": context.to_dict(),
+        },
+        "existingReadme": existing_readme or None,
+        "repoUrl": utils.get_git_repo_url(project_dir),
+        "templateUrl": template_url,
+    }
+    return ReadmeJob(
+        project_dir, project_files, payload, context, file_index, hash_algorithm,
+        modified_files, deleted_files, is_incremental, snapshot=snapshot,
+    )
 
-            if linkedin_username:
-                linkedin_url = f"https://linkedin.com/in/{linkedin_username}"
-            if twitter_username:
-                twitter_url = f"https://x.com/{twitter_username}"
 
-        is_incremental = False
-        modified_files = []
-        cache = utils.load_cache(project_dir)
+def request_readme(job, backend_domain, out_path=None):
+    """Send a prepared job and stream the generated README into out_path (default: the job's README.md).
 
-        if existing_readme and cache:
-            console.print("[blue]Checking for codebase changes since last generation...[/blue]")
-            for f in project_files:
-                file_path = os.path.join(project_dir, f)
-                current_hash = utils.get_file_hash(file_path)
-                cached_hash = cache.get("files", {}).get(f)
-                if current_hash != cached_hash:
-                    modified_files.append(f)
+    Large contexts go as content-addressed chunks when the backend supports
+    it, so only chunks it doesn't already hold are uploaded. The README is
+    replaced only once the whole stream has arrived. Raises
+    ReadmeRequestError for a non-200 response or an error reported mid-stream;
+    connection errors propagate.
+    """
+    response = None
+    try:
+        response = _post_readme_job(job, backend_domain)
 
-            # Check if any files were deleted
-            cache_file_paths = cache.get("files", {}).keys()
-            deleted_files = [f for f in cache_file_paths if f not in project_files]
+        if response.status_code != 200:
+            raise ReadmeRequestError(response.status_code, response.text)
 
-            if not modified_files and not deleted_files:
-                console.print("[green]No changes detected in codebase. README is already up to date![/green]")
-                return readme_path
+        write_readme_stream(response.iter_content(chunk_size=None), out_path or job.readme_path)
+    finally:
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+
+def write_readme_stream(chunks, path):
+    """Decode the backend's README event stream from byte chunks and write it to path atomically.
+
+    Text is written to a temp file beside path in batches of STREAM_FLUSH_CHARS
+    or every STREAM_FLUSH_INTERVAL seconds, whichever comes first, then moved
+    over path. A failed or empty stream leaves path untouched.
+    """
+    # Beside path so os.replace stays atomic; the detection cache is keyed on
+    # the names detection looks up, so this file never invalidates it
+    tmp_path = f"{path}.dokugen-{os.getpid()}.tmp"
+    pending = []
+    pending_chars = 0
+    written = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            last_flush = time.monotonic()
+            for event in sse.iter_events(chunks):
+                if event.type != "message":
+                    continue
+                try:
+                    data = json.loads(event.data)
+                except ValueError:
+                    data = None
+                if not isinstance(data, dict):
+                    raise ReadmeRequestError(None, f"Malformed event in README stream: {event.data[:200]!r}")
+                if data.get("error"):
+                    raise ReadmeRequestError(None, data["error"])
+
+                text = data.get("response")
+                if not isinstance(text, str) or not text:
+                    continue
+                pending.append(text)
+                pending_chars += len(text)
+                if pending_chars >= STREAM_FLUSH_CHARS or time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL:
+                    f.write("".join(pending))
+                    f.flush()
+                    written += pending_chars
+                    pending, pending_chars = [], 0
+                    last_flush = time.monotonic()
+
+            f.write("".join(pending))
+            written += pending_chars
+
+        if not written:
+            raise ReadmeRequestError(None, "The backend returned an empty README")
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _post_readme_job(job, backend_domain):
+    url = f"{backend_domain}/api/generate-readme"
+    features = utils.get_backend_features(backend_domain)
+    codec = negotiate_codec(features, job.code_bytes)
+    if job.code_bytes < upload.CHUNKED_UPLOAD_MIN_BYTES or upload.CHUNKED_UPLOAD_FEATURE not in features:
+        if upload.BINARY_UPLOAD_FEATURE in features:
+            metadata_length, body = job.binary_body(codec)
+            headers = {"Content-Type": "application/octet-stream", "X-Dokugen-Metadata-Length": str(metadata_length)}
+            return network.post(url, data=body, headers=headers, stream=True, timeout=API_TIMEOUT)
+        return network.post(url, data=job.body(codec), headers={"Content-Type": "application/json"}, stream=True, timeout=API_TIMEOUT)
+
+    # 409 means chunks expired between upload and generation; the second pass re-sends just those
+    for attempt in range(2):
+        manifest, job.upload_stats = upload.upload_chunks(backend_domain, job.snippets())
+        response = network.post(
+            url, data=job.manifest_body(manifest, codec), headers={"Content-Type": "application/json"},
+            stream=True, timeout=API_TIMEOUT,
+        )
+        if response.status_code != 409 or attempt:
+            return response
+        response.close()
+
+
+def save_readme_cache(job):
+    """Record the hashes the README was generated from, re-hashing only what changed since (e.g. README.md itself)."""
+    file_index = job.file_index if job.hash_algorithm == hashing.DEFAULT_ALGORITHM else {}
+    utils.save_cache(job.project_dir, {
+        "version": utils.CACHE_VERSION,
+        "hashAlgorithm": hashing.DEFAULT_ALGORITHM,
+        "files": utils.fingerprint_files(job.project_dir, job.project_files, file_index),
+    })
+
+
+def send_readme_job(job, backend_domain):
+    """Generate one README unattended, replacing README.md only once the whole response has arrived.
+
+    The previous README is kept on disk for `dokugen revert`. Raises like request_readme.
+    """
+    if os.path.exists(job.readme_path):
+        with open(job.readme_path, "r", encoding="utf-8", errors="ignore") as f:
+            utils.write_readme_backup(job.project_dir, f.read())
+    request_readme(job, backend_domain)
+    save_readme_cache(job)
+
+
+def is_dokugen_readme(content):
+    return "<!-- DOKUGEN:" in content or "[![Readme was generated by Dokugen]" in content
+
+
+def generate_readme_remote(project_type, project_files, project_dir, existing_readme=None, template_url=None, token_budget=None, skeleton=False, snapshot=None, detection=None):
+    try:
+        console.print("[blue]Analyzing project files...[/blue]")
+        readme_path = os.path.join(project_dir, "README.md")
 
-            is_incremental = True
-            console.print(f"[yellow]Incremental update: {len(modified_files)} file(s) changed, {len(deleted_files)} file(s) deleted.[/yellow]")
+        options = ReadmeOptions()
+        if not template_url:
+            options = ask_readme_options()
+            if options is None:
+                return None
 
-        full_code = utils.extract_full_code(modified_files if is_incremental else project_files, project_dir)
-        user_info = utils.get_user_info()
-        repo_url = utils.get_git_repo_url()
+        job = prepare_readme_job(
+            project_type, project_files, project_dir, existing_readme, template_url,
+            options, token_budget, skeleton, snapshot, detection,
+        )
 
-        backend_domain = utils.get_backend_domain()
+        if job.up_to_date or job.is_incremental:
+            console.print("[blue]Checking for codebase changes since last generation...[/blue]")
+        if job.up_to_date:
+            console.print("[green]No changes detected in codebase. README is already up to date![/green]")
+            return readme_path
 
-        compressed_full_code = utils.compress_data(full_code)
-        compressed_existing_readme = utils.compress_data(existing_readme) if existing_readme else None
-
-        payload = {
-            "projectType": project_type,
-            "projectFiles": project_files,
-            "fullCode": compressed_full_code,
-            "userInfo": user_info,
-            "options": {
-                "includeSetup": include_setup, 
-                "includeContributionGuideLine": include_contrib,
-                "includeApiDocs": include_api_docs,
-                "includeDiagrams": include_diagrams,
-                "linkedinUrl": linkedin_url,
-                "twitterUrl": twitter_url,
-                "isIncremental": is_incremental,
-                "modifiedFiles": modified_files if is_incremental else None,
-            },
-            "existingReadme": compressed_existing_readme,
-            "repoUrl": repo_url,
-            "templateUrl": template_url,
-            "compressed": True,
-        }
+        if job.is_incremental:
+            console.print(f"[yellow]Incremental update: {len(job.modified_files)} file(s) changed, {len(job.deleted_files)} file(s) deleted.[/yellow]")
+
+        context = job.context
+        if context.summarized or context.dropped:
+            console.print(
+                f"[yellow]Context budget (~{context.budget} tokens): {len(context.full)} file(s) in full, "
+                f"{len(context.summarized)} summarized, {len(context.dropped)} dropped[/yellow]"
+            )
+
+        backend_domain = utils.get_backend_domain()
 
-        import time
         start_time = time.time()
-        response = None
         with utils.create_ticking_spinner("Generating README...") as spinner:
             try:
-                response = requests.post(
-                    f"{backend_domain}/api/generate-readme",
-                    json=payload,
-                    stream=True,
-                    timeout=API_TIMEOUT,
-                )
-
-                if response.status_code != 200:
-                    console.print(f"[red]Error {response.status_code}: {response.text}[/red]")
-                    utils.restore_readme()
-                    return None
-
-                # Write response with proper resource management
-                with open(readme_path, "w", encoding="utf-8") as f:
-                    for line in response.iter_lines():
-                        if line:
-                            decoded = line.decode("utf-8")
-                            if decoded.startswith("data:"):
-                                json_str = decoded.replace("data: ", "").strip()
-                                try:
-                                    data = json.loads(json_str)
-                                    if "response" in data and isinstance(data["response"], str):
-                                        f.write(data["response"])
-                                        f.flush()
-                                except Exception:
-                                    pass
-            finally:
-                if response is not None:
-                    try:
-                        response.close()
-                    except Exception:
-                        pass
+                request_readme(job, backend_domain)
+            except (ReadmeRequestError, upload.ChunkUploadError) as e:
+                console.print(f"[red]{e}[/red]")
+                utils.restore_readme()
+                return None
 
         elapsed_str = utils.format_elapsed_time(start_time)
         console.print(f"\n[green]README.md created successfully in {elapsed_str}[/green]")
@@ -318,17 +545,16 @@ def generate_readme_remote(project_type, project_files, project_dir, existing_re
                       "[dim] (Ctrl+Click or Cmd+Click to follow link)[/dim]")
         utils.readme_backup = None
 
-        # Save cache
-        new_cache_files = {}
-        for f in project_files:
-            file_path = os.path.join(project_dir, f)
-            new_cache_files[f] = utils.get_file_hash(file_path)
-        utils.save_cache(project_dir, {"version": "1.0", "files": new_cache_files})
+        save_readme_cache(job)
 
         prompt_myhappr()
 
         return readme_path
 
+    except network.CONNECTION_ERRORS:
+        utils.print_connection_error()
+        utils.restore_readme()
+        return None
     except (Exception, KeyboardInterrupt) as e:
         if isinstance(e, KeyboardInterrupt):
             console.print("[yellow]\nProcess interrupted. Restoring backup...[/yellow]")
@@ -338,7 +564,149 @@ def generate_readme_remote(project_type, project_files, project_dir, existing_re
         return None
 
 
+class _Stopwatch:
+    """Per-stage wall times for the headless result, in seconds."""
+
+    def __init__(self, timings):
+        self.timings = timings
+        self.started = self.mark = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.timings[stage] = round(now - self.mark, 3)
+        self.mark = now
+
+    def stop(self):
+        self.timings["total"] = round(time.perf_counter() - self.started, 3)
+
+
+def run_headless(project_dir, settings, update=False, log=None):
+    """Generate (or update) README.md with no prompts and no calls beyond the README request.
+
+    settings come from headless.resolve_settings. Returns a JSON-ready result
+    with "status", "exitCode" and per-stage "timings"; never raises.
+    """
+    log = log or console
+    result = {
+        "command": "update" if update else "generate",
+        "projectDir": project_dir,
+        "status": None,
+        "exitCode": None,
+        "timings": {},
+    }
+    clock = _Stopwatch(result["timings"])
+
+    def finish(status, exit_code, reason=None):
+        clock.stop()
+        result["status"] = status
+        result["exitCode"] = exit_code
+        if reason:
+            result["reason"] = reason
+        return result
+
+    try:
+        if not utils.is_git_repository(project_dir):
+            return finish("failed", headless.EXIT_NO_PROJECT, "not a git repository")
+
+        template_url = settings["template"]
+        if template_url and "github.com" not in template_url:
+            return finish("failed", headless.EXIT_USAGE, "invalid GitHub template URL")
+
+        readme_path = os.path.join(project_dir, "README.md")
+        existing_readme = None
+        if os.path.exists(readme_path):
+            with open(readme_path, "r", encoding="utf-8") as f:
+                content = f.read()
+            if not update:
+                existing_readme = None if settings["overwrite"] else content
+            elif is_dokugen_readme(content):
+                existing_readme = content
+            elif not settings["overwrite"]:
+                return finish("skipped", headless.EXIT_SKIPPED, "README.md was not generated by Dokugen")
+        elif update:
+            return finish("failed", headless.EXIT_NO_PROJECT, "no README.md to update")
+
+        # Resolve the backend while the project is scanned and detected
+        utils.prefetch_backend_domain()
+
+        snapshot = utils.snapshot_project(project_dir, use_git_index=settings["git_index"])
+        clock.lap("scan")
+        detection = utils.detect_project_tree_cached(project_dir, snapshot)
+        clock.lap("detect")
+        result["projectType"] = detection.type
+        result["files"] = len(snapshot.files)
+        log.print(f"[yellow]Found: {len(snapshot.files)} files in the project[/yellow]")
+        log.print(f"[blue]Detected project type: {escape(detection.type)}[/blue]")
+
+        job = prepare_readme_job(
+            detection.type, snapshot.files, project_dir, existing_readme, template_url,
+            ReadmeOptions(**settings["options"]), settings["token_budget"], settings["skeleton"],
+            snapshot, detection,
+        )
+        clock.lap("prepare")
+        if job.up_to_date:
+            return finish("up-to-date", headless.EXIT_OK)
+        result["incremental"] = job.is_incremental
+        result["sentFiles"] = len(job.context.files)
+        result["estimatedTokens"] = job.context.estimated_tokens
+
+        backend_domain = utils.get_backend_domain()
+        result["backend"] = backend_domain
+        clock.lap("backend")
+
+        log.print("[blue]Generating README...[/blue]")
+        try:
+            send_readme_job(job, backend_domain)
+        except (ReadmeRequestError, upload.ChunkUploadError) as e:
+            clock.lap("generate")
+            return finish("failed", headless.EXIT_BACKEND_ERROR, str(e))
+        except network.CONNECTION_ERRORS as e:
+            clock.lap("generate")
+            return finish("failed", headless.EXIT_UNREACHABLE, f"connection error: {e}")
+        finally:
+            if job.upload_stats:
+                result["upload"] = job.upload_stats
+        clock.lap("generate")
+        return finish("updated" if update else "generated", headless.EXIT_OK)
+
+    except KeyboardInterrupt:
+        return finish("interrupted", headless.EXIT_INTERRUPTED)
+    except Exception as e:
+        return finish("failed", headless.EXIT_ERROR, str(e))
+
+
+def cmd_headless(args, project_dir, config, update=False):
+    """Run generate/update from flags and the project config, then exit with the run's code."""
+    settings = headless.resolve_settings(args, config, update)
+    # stdout is kept for a `--report -` result; progress goes to stderr
+    log = Console(stderr=True)
+    result = run_headless(project_dir, settings, update, log)
+
+    style = "green" if result["exitCode"] == headless.EXIT_OK else "yellow" if result["status"] == "skipped" else "red"
+    line = f"[{style}]README.md {result['status']}[/{style}] [dim]in {result['timings']['total']:.1f}s"
+    if result.get("reason"):
+        line += f" ({escape(result['reason'])})"
+    log.print(line + f", exit code {result['exitCode']}[/dim]")
+
+    if settings["report"]:
+        headless.write_report(settings["report"], result)
+    sys.exit(result["exitCode"])
+
+
+def load_config_or_exit(project_dir):
+    try:
+        return headless.load_project_config(project_dir)
+    except headless.ConfigError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(headless.EXIT_USAGE)
+
+
 def cmd_generate(args):
+    project_dir = os.getcwd()
+    config = load_config_or_exit(project_dir)
+    if headless.is_headless(args, config):
+        cmd_headless(args, project_dir, config)
+
     if not utils.is_git_repository():
         console.print("[red]Opps... No Git repository found. Please navigate to a project directory that has a Git repository, or initialize one using 'git init'.[/red]")
         sys.exit(1)
@@ -346,56 +714,51 @@ def cmd_generate(args):
     utils.check_and_update()
     console.print(DOKUGEN_BANNER, style="#000080")
 
-    project_dir = os.getcwd()
     readme_path = os.path.join(project_dir, "README.md")
     readme_exists = os.path.exists(readme_path)
 
-    with utils.create_spinner("Checking internet..."):
-        has_connection = utils.check_internet_connection()
-
-    if not has_connection:
-        raw_username = utils.get_user_info().get("username", "Unknown")
-        import re
-        username = re.sub(r'\d+', '', raw_username)
-        console.print(f"[red]Opps... {username} kindly check your device or pc internet connection and try again.[/red]")
-        return
+    # Resolve the backend while the project is scanned and detected
+    utils.prefetch_backend_domain()
 
     if readme_exists:
         utils.backup_readme(readme_path)
 
     try:
         template_url = getattr(args, "template", None)
+        token_budget = getattr(args, "token_budget", None)
+        skeleton = getattr(args, "skeleton", False)
         if template_url and "github.com" not in template_url:
             console.print("[red]Invalid GitHub URL. Use format: https://github.com/user/repo/blob/main/README.md[/red]")
             sys.exit(1)
 
-        project_type = detect_project_type(project_dir)
-
         with utils.create_spinner("Scanning project files...") as spinner:
-            project_files = utils.scan_files(project_dir)
+            snapshot = utils.snapshot_project(project_dir, use_git_index=getattr(args, "git_index", False))
+        project_files = snapshot.files
+        detection = utils.detect_project_tree_cached(project_dir, snapshot)
+        project_type = detection.type
 
         console.print(f"[yellow]Found: {len(project_files)} files in the project[/yellow]")
-        console.print(f"[blue]Detected project type: {project_type}[/blue]")
+        console.print(f"[blue]Detected project type: {escape(project_type)}[/blue]")
 
         if template_url:
             existing_content = None
-            if readme_exists and not getattr(args, "overwrite", True):
+            if readme_exists and getattr(args, "overwrite", None) is False:
                 with open(readme_path, "r", encoding="utf-8") as f:
                     existing_content = f.read()
-            generate_readme_remote(project_type, project_files, project_dir, existing_content, template_url)
+            generate_readme_remote(project_type, project_files, project_dir, existing_content, template_url, token_budget=token_budget, skeleton=skeleton, snapshot=snapshot, detection=detection)
             console.print("[green]README.md generated from template![/green]")
             return
 
         if readme_exists:
-            if not getattr(args, "overwrite", True):
+            if getattr(args, "overwrite", None) is False:
                 with open(readme_path, "r", encoding="utf-8") as f:
                     existing_content = f.read()
-                generate_readme_remote(project_type, project_files, project_dir, existing_content, None)
+                generate_readme_remote(project_type, project_files, project_dir, existing_content, None, token_budget=token_budget, skeleton=skeleton, snapshot=snapshot, detection=detection)
             else:
                 project_name = os.path.basename(project_dir)
                 ans = ask_yes_no(f"README.md exists for {project_name}. Overwrite?")
                 if ans == "yes":
-                    generate_readme_remote(project_type, project_files, project_dir, None, None)
+                    generate_readme_remote(project_type, project_files, project_dir, None, None, token_budget=token_budget, skeleton=skeleton, snapshot=snapshot, detection=detection)
                 elif ans == "no":
                     console.print("[yellow]README update skipped (user selected No)[/yellow]")
                     return
@@ -404,7 +767,7 @@ def cmd_generate(args):
                     utils.restore_readme()
                     return
         else:
-            generate_readme_remote(project_type, project_files, project_dir, None, None)
+            generate_readme_remote(project_type, project_files, project_dir, None, None, token_budget=token_budget, skeleton=skeleton, snapshot=snapshot, detection=detection)
 
     except (Exception, KeyboardInterrupt) as e:
         if isinstance(e, KeyboardInterrupt):
@@ -422,10 +785,35 @@ def register_generate_parser(subparsers):
         "--no-overwrite",
         dest="overwrite",
         action="store_false",
-        default=True,
+        default=None,
         help="Do not overwrite existing README.md, append new features instead",
     )
+    gen_parser.add_argument(
+        "--overwrite",
+        dest="overwrite",
+        action="store_true",
+        help="Regenerate an existing README.md from scratch without asking (the headless default)",
+    )
     gen_parser.add_argument(
         "--template",
         help="use a custom GitHub repo readme file as a template to generate a concise and strict readme for your project",
     )
+    gen_parser.add_argument(
+        "--git-index",
+        action="store_true",
+        default=False,
+        help="List files from the Git index instead of walking the directory tree (skips untracked build artifacts)",
+    )
+    gen_parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=None,
+        help="Approximate token budget for the code sent to the model (0 = unlimited, default 250000 or $DOKUGEN_TOKEN_BUDGET)",
+    )
+    gen_parser.add_argument(
+        "--skeleton",
+        action="store_true",
+        default=False,
+        help="Send source files as skeletons (imports, signatures, docstrings, routes) instead of full bodies",
+    )
+    headless.add_headless_arguments(gen_parser)
@@ -3,7 +3,7 @@ import sys
 import datetime
 import questionary
 from rich.console import Console
-from dokugen import utils
+from dokugen import network, utils
 
 console = Console()
 
@@ -215,7 +215,7 @@ def cmd_license(args):
             if user_info and user_info.get("username") and user_info.get("email"):
                 import threading
                 threading.Thread(
-                    target=lambda: __import__("requests").post(
+                    target=lambda: network.post(
                         f"{backend_domain}/api/track",
                         json={"userInfo": user_info, "usageType": "license"},
                         timeout=5
@@ -2,10 +2,8 @@ import os
 import sys
 import json
 import base64
-import requests
 from rich.console import Console
-from dokugen import utils
-from dokugen.project_detect import detect_project_type
+from dokugen import network, utils
 
 console = Console()
 
@@ -51,19 +49,14 @@ def cmd_og(args):
     has_config = os.path.exists(config_path)
     force_new = getattr(args, "force_new", False)
 
-    with utils.create_spinner("Checking internet..."):
-        has_internet = utils.check_internet_connection()
-
-    if not has_internet:
-        console.print("[red]Please check your internet connection and try again.[/red]")
-        return
+    utils.prefetch_backend_domain()
 
     metadata = None
 
     if not has_config or force_new:
         with utils.create_ticking_spinner("Analyzing project to generate card profile..."):
             try:
-                project_type = detect_project_type(project_dir)
+                project_type = utils.detect_project_type_cached(project_dir)
                 codebase_summary = f"Project Name: {project_name}\nDetected Tech Stack: {project_type}\n"
 
                 readme_path = os.path.join(project_dir, "README.md")
@@ -93,7 +86,7 @@ def cmd_og(args):
                         break
 
                 backend_url = utils.get_backend_domain()
-                res = requests.post(
+                res = network.post(
                     f"{backend_url}/api/og-metadata",
                     json={"summary": codebase_summary},
                     timeout=30,
@@ -109,6 +102,9 @@ def cmd_og(args):
 
                 console.print("[green]✔ Created configuration: .dokugen/card.json[/green]")
 
+            except network.CONNECTION_ERRORS:
+                console.print("[red]Please check your internet connection and try again.[/red]")
+                return
             except Exception as e:
                 console.print(f"[red]Failed to generate card profile: {e}[/red]")
                 return
@@ -128,7 +124,7 @@ def cmd_og(args):
                     metadata["logo"] = f"data:{mime};base64,{encoded}"
 
             backend_url = utils.get_backend_domain()
-            res = requests.post(
+            res = network.post(
                 f"{backend_url}/api/render-og",
                 json=metadata,
                 timeout=20,
@@ -158,6 +154,9 @@ def cmd_og(args):
             with open(seo_path, "w", encoding="utf-8") as sf:
                 sf.write(seo_text)
 
+        except network.CONNECTION_ERRORS:
+            console.print("[red]Please check your internet connection and try again.[/red]")
+            return
         except Exception as e:
             console.print(f"[red]Failed to render social card PNG: {e}[/red]")
             return
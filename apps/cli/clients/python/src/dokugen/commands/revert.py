@@ -1,10 +1,9 @@
 import os
 import sys
 import threading
-import requests
 import questionary
 from rich.console import Console
-from dokugen import utils
+from dokugen import network, utils
 
 console = Console()
 
@@ -51,7 +50,7 @@ def cmd_revert(args):
         user_info = utils.get_user_info()
         if user_info and user_info.get("username") and user_info.get("email"):
             threading.Thread(
-                target=lambda: requests.post(
+                target=lambda: network.post(
                     f"{backend_domain}/api/track",
                     json={"userInfo": user_info, "usageType": "revert"},
                     timeout=5
@@ -1,14 +1,21 @@
 import os
 import sys
 from rich.console import Console
-from dokugen import utils
-from dokugen.project_detect import detect_project_type
-from dokugen.commands.generate import generate_readme_remote, ask_yes_no, DOKUGEN_BANNER
+from rich.markup import escape
+from dokugen import headless, utils
+from dokugen.commands.generate import (
+    generate_readme_remote, ask_yes_no, cmd_headless, is_dokugen_readme, load_config_or_exit, DOKUGEN_BANNER,
+)
 
 console = Console()
 
 
 def cmd_update(args):
+    project_dir = os.getcwd()
+    config = load_config_or_exit(project_dir)
+    if headless.is_headless(args, config):
+        cmd_headless(args, project_dir, config, update=True)
+
     if not utils.is_git_repository():
         console.print("[red]Opps... No Git repository found. Please navigate to a project directory that has a Git repository, or initialize one using 'git init'.[/red]")
         sys.exit(1)
@@ -16,27 +23,21 @@ def cmd_update(args):
     utils.check_and_update()
     console.print(DOKUGEN_BANNER, style="#000080")
 
-    project_dir = os.getcwd()
     readme_path = os.path.join(project_dir, "README.md")
 
     if not os.path.exists(readme_path):
         console.print("[red]No README.md found. Use 'dokugen generate' to create one first.[/red]")
         sys.exit(1)
 
-    with utils.create_spinner("Checking internet..."):
-        has_connection = utils.check_internet_connection()
-
-    if not has_connection:
-        raw_username = utils.get_user_info().get("username", "Unknown")
-        import re
-        username = re.sub(r'\d+', '', raw_username)
-        console.print(f"[red]Opps... {username} kindly check your device or pc internet connection and try again.[/red]")
-        return
+    # Resolve the backend while the project is scanned and detected
+    utils.prefetch_backend_domain()
 
     try:
         utils.backup_readme(readme_path)
 
         template_url = getattr(args, "template", None)
+        token_budget = getattr(args, "token_budget", None)
+        skeleton = getattr(args, "skeleton", False)
 
         if template_url and "github.com" not in template_url:
             console.print("[red]Invalid GitHub URL. Use format: https://github.com/user/repo/blob/main/README.md[/red]")
@@ -45,20 +46,20 @@ def cmd_update(args):
         with open(readme_path, "r", encoding="utf-8") as f:
             existing_content = f.read()
 
-        has_markers = "<!-- DOKUGEN:" in existing_content or "[![Readme was generated by Dokugen]" in existing_content
-
-        if not has_markers:
+        if not is_dokugen_readme(existing_content):
             console.print("[yellow]This README doesn't appear to be generated by Dokugen.[/yellow]")
             project_name = os.path.basename(project_dir)
             ans = ask_yes_no(f"Do you want to regenerate the entire {project_name} README?")
 
             if ans == "yes":
-                project_type = detect_project_type(project_dir)
                 with utils.create_spinner("Scanning project files..."):
-                    project_files = utils.scan_files(project_dir)
+                    snapshot = utils.snapshot_project(project_dir, use_git_index=getattr(args, "git_index", False))
+                project_files = snapshot.files
+                detection = utils.detect_project_tree_cached(project_dir, snapshot)
+                project_type = detection.type
                 console.print(f"[yellow]Found: {len(project_files)} files in the project[/yellow]")
 
-                generate_readme_remote(project_type, project_files, project_dir, None, template_url)
+                generate_readme_remote(project_type, project_files, project_dir, None, template_url, token_budget=token_budget, skeleton=skeleton, snapshot=snapshot, detection=detection)
                 console.print("[green]README.md regenerated successfully![/green]")
                 return
             else:
@@ -67,16 +68,17 @@ def cmd_update(args):
                 return
 
         console.print("[blue]Analyzing README structure...[/blue]")
-        project_type = detect_project_type(project_dir)
-
         with utils.create_spinner("Scanning project files..."):
-            project_files = utils.scan_files(project_dir)
+            snapshot = utils.snapshot_project(project_dir, use_git_index=getattr(args, "git_index", False))
+        project_files = snapshot.files
+        detection = utils.detect_project_tree_cached(project_dir, snapshot)
+        project_type = detection.type
 
         console.print(f"[yellow]Found: {len(project_files)} files in the project[/yellow]")
-        console.print(f"[blue]Detected project type: {project_type}[/blue]")
+        console.print(f"[blue]Detected project type: {escape(project_type)}[/blue]")
         console.print("[blue]Updating auto-generated sections...[/blue]")
 
-        generate_readme_remote(project_type, project_files, project_dir, existing_content, template_url)
+        generate_readme_remote(project_type, project_files, project_dir, existing_content, template_url, token_budget=token_budget, skeleton=skeleton, snapshot=snapshot, detection=detection)
         console.print("[green]README.md updated successfully! Custom sections preserved.[/green]")
 
     except (Exception, KeyboardInterrupt) as e:
@@ -91,7 +93,32 @@ def cmd_update(args):
 def register_update_parser(subparsers):
     project_name = os.path.basename(os.getcwd())
     up_parser = subparsers.add_parser("update", help=f"Update auto-generated sections of {project_name} README while preserving custom content")
+    up_parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        default=None,
+        help="Headless: regenerate a README.md that was not generated by Dokugen instead of skipping it",
+    )
     up_parser.add_argument(
         "--template",
         help="use a custom GitHub repo readme file as a template",
     )
+    up_parser.add_argument(
+        "--git-index",
+        action="store_true",
+        default=False,
+        help="List files from the Git index instead of walking the directory tree (skips untracked build artifacts)",
+    )
+    up_parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=None,
+        help="Approximate token budget for the code sent to the model (0 = unlimited, default 250000 or $DOKUGEN_TOKEN_BUDGET)",
+    )
+    up_parser.add_argument(
+        "--skeleton",
+        action="store_true",
+        default=False,
+        help="Send source files as skeletons (imports, signatures, docstrings, routes) instead of full bodies",
+    )
+    headless.add_headless_arguments(up_parser)
@@ -0,0 +1,161 @@
+import os
+import struct
+import subprocess
+from collections import namedtuple
+
+IndexEntry = namedtuple("IndexEntry", ["path", "size", "mtime_ns", "ino", "mode"])
+
+_ENTRY_HEADER = struct.Struct(">10I20sH")
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE_MASK = 0x3000
+_FLAG_NAME_MASK = 0x0FFF
+_EXT_FLAG_SKIP_WORKTREE = 0x4000
+
+_MODE_TYPE_MASK = 0o170000
+_MODE_REGULAR = 0o100000
+
+
+class UnsupportedIndex(Exception):
+    pass
+
+
+def _read_varint(data, pos):
+    # git's offset encoding (varint.c), used by index v4 path compression
+    c = data[pos]
+    pos += 1
+    value = c & 0x7F
+    while c & 0x80:
+        c = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (c & 0x7F)
+    return value, pos
+
+
+def parse_index(data):
+    """Parse a .git/index (versions 2-4) into IndexEntry tuples for regular stage-0 files."""
+    if len(data) < 12 or data[:4] != b"DIRC":
+        raise UnsupportedIndex("not a git index")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        raise UnsupportedIndex(f"index version {version}")
+
+    entries = []
+    pos = 12
+    prev_name = b""
+    for _ in range(count):
+        start = pos
+        (_, _, mtime_s, mtime_ns, _, ino, mode, _, _, size, _, flags) = _ENTRY_HEADER.unpack_from(data, pos)
+        pos += _ENTRY_HEADER.size
+
+        ext_flags = 0
+        if flags & _FLAG_EXTENDED:
+            if version < 3:
+                raise UnsupportedIndex("extended flag in v2 index")
+            ext_flags = struct.unpack_from(">H", data, pos)[0]
+            pos += 2
+
+        if version == 4:
+            strip, pos = _read_varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = prev_name[:len(prev_name) - strip] + data[pos:end]
+            pos = end + 1
+            prev_name = name
+        else:
+            name_len = flags & _FLAG_NAME_MASK
+            if name_len == _FLAG_NAME_MASK:
+                name_len = data.index(b"\0", pos) - pos
+            name = data[pos:pos + name_len]
+            # Entries are NUL-padded to a multiple of 8 bytes
+            pos = start + ((pos - start + name_len + 8) & ~7)
+
+        if (mode & _MODE_TYPE_MASK) != _MODE_REGULAR:
+            continue
+        if flags & _FLAG_STAGE_MASK or ext_flags & _EXT_FLAG_SKIP_WORKTREE:
+            continue
+
+        entries.append(IndexEntry(
+            name.decode("utf-8", errors="surrogateescape"),
+            size,
+            mtime_s * 1_000_000_000 + mtime_ns,
+            ino,
+            mode,
+        ))
+
+    # Split and sparse indexes reference entries stored elsewhere
+    while pos + 8 <= len(data) - 20:
+        signature, ext_size = struct.unpack_from(">4sI", data, pos)
+        if signature in (b"link", b"sdir"):
+            raise UnsupportedIndex(f"{signature.decode()} extension")
+        pos += 8 + ext_size
+
+    return entries
+
+
+def _git(args, cwd):
+    return subprocess.check_output(["git", *args], cwd=cwd, stderr=subprocess.DEVNULL)
+
+
+def _ls_files(project_dir, extra_args):
+    out = _git(["ls-files", "-z", *extra_args], project_dir)
+    return [p.decode("utf-8", errors="surrogateescape") for p in out.split(b"\0") if p]
+
+
+def _stat_entry(project_dir, rel_path):
+    try:
+        st = os.stat(os.path.join(project_dir, rel_path))
+    except OSError:
+        return None
+    if (st.st_mode & _MODE_TYPE_MASK) != _MODE_REGULAR:
+        return None
+    return IndexEntry(rel_path, st.st_size, st.st_mtime_ns, st.st_ino, st.st_mode)
+
+
+def tracked_entries(project_dir):
+    """Return IndexEntry tuples for tracked files under project_dir, relative to it.
+
+    Reads the index directly; falls back to `git ls-files` plus a stat per
+    file when the index uses a layout this parser does not understand. Files
+    deleted from the worktree but still in the index are left out, as the
+    os.walk scanner would never see them.
+    """
+    prefix, index_path = _git(["rev-parse", "--show-prefix", "--git-path", "index"], project_dir).decode("utf-8").splitlines()
+    index_path = os.path.join(project_dir, index_path)
+
+    try:
+        with open(index_path, "rb") as f:
+            entries = parse_index(f.read())
+    except (OSError, UnsupportedIndex, struct.error, ValueError, IndexError):
+        entries = None
+
+    if entries is None:
+        tracked = []
+        for rel_path in _ls_files(project_dir, ["--cached"]):
+            entry = _stat_entry(project_dir, rel_path)
+            if entry:
+                tracked.append(entry)
+        return tracked
+
+    # One ls-files run instead of a stat per entry; paths come back relative to project_dir
+    deleted = set(_ls_files(project_dir, ["--deleted"]))
+    tracked = []
+    for entry in entries:
+        if prefix:
+            if not entry.path.startswith(prefix):
+                continue
+            entry = entry._replace(path=entry.path[len(prefix):])
+        if entry.path in deleted:
+            continue
+        if os.sep != "/":
+            entry = entry._replace(path=entry.path.replace("/", os.sep))
+        tracked.append(entry)
+    return tracked
+
+
+def untracked_entries(project_dir):
+    """Untracked files that are not excluded by .gitignore, via git's untracked cache."""
+    entries = []
+    for rel_path in _ls_files(project_dir, ["--others", "--exclude-standard"]):
+        entry = _stat_entry(project_dir, rel_path.replace("/", os.sep))
+        if entry:
+            entries.append(entry)
+    return entries
@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+
+# Project-level answers for unattended generate/update runs, committed with the code
+CONFIG_PATH = os.path.join(".dokugen", "config")
+
+# Exit codes of headless generate/update
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_NO_PROJECT = 3
+EXIT_UNREACHABLE = 4
+EXIT_BACKEND_ERROR = 5
+EXIT_SKIPPED = 6
+EXIT_INTERRUPTED = 130
+
+CONFIG_KEYS = {
+    "headless": bool,
+    "setup": bool,
+    "contrib": bool,
+    "apiDocs": bool,
+    "diagrams": bool,
+    "linkedin": str,
+    "twitter": str,
+    "template": str,
+    "overwrite": bool,
+    "gitIndex": bool,
+    "tokenBudget": int,
+    "skeleton": bool,
+}
+
+
+class ConfigError(Exception):
+    pass
+
+
+def load_project_config(project_dir):
+    """The project's .dokugen/config (a JSON object), or {} if there is none."""
+    path = os.path.join(project_dir, CONFIG_PATH)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"{CONFIG_PATH}: {e}")
+
+    if not isinstance(config, dict):
+        raise ConfigError(f"{CONFIG_PATH}: expected a JSON object")
+    for key, value in config.items():
+        expected = CONFIG_KEYS.get(key)
+        if expected is None:
+            raise ConfigError(f"{CONFIG_PATH}: unknown key '{key}' (expected one of {', '.join(CONFIG_KEYS)})")
+        # null leaves the option unset; bool is an int subclass, so check it exactly
+        if value is not None and type(value) is not expected:
+            raise ConfigError(f"{CONFIG_PATH}: '{key}' must be a {expected.__name__}")
+    return config
+
+
+def is_headless(args, config):
+    """--headless, "headless": true in the project config, or $CI."""
+    if getattr(args, "headless", False) or config.get("headless"):
+        return True
+    return os.environ.get("CI", "").lower() not in ("", "0", "false")
+
+
+def _pick(args, name, config, key, default=None):
+    # Command-line flags win over the project config, which wins over the default
+    value = getattr(args, name, None)
+    if value is None:
+        value = config.get(key)
+    return default if value is None else value
+
+
+def resolve_settings(args, config, update=False):
+    """Everything a headless run needs, from flags and the project config; nothing is asked.
+
+    "overwrite" defaults to regenerating for generate and to leaving READMEs
+    not written by Dokugen alone for update.
+    """
+    return {
+        "overwrite": _pick(args, "overwrite", config, "overwrite", not update),
+        "git_index": bool(getattr(args, "git_index", False) or config.get("gitIndex")),
+        "template": _pick(args, "template", config, "template"),
+        "token_budget": _pick(args, "token_budget", config, "tokenBudget"),
+        "skeleton": bool(getattr(args, "skeleton", False) or config.get("skeleton")),
+        "report": getattr(args, "report", None),
+        "options": {
+            "include_setup": _pick(args, "setup", config, "setup", False),
+            "include_contrib": _pick(args, "contrib", config, "contrib", False),
+            "include_api_docs": _pick(args, "api_docs", config, "apiDocs", False),
+            "include_diagrams": _pick(args, "diagrams", config, "diagrams", False),
+            "linkedin_username": _pick(args, "linkedin", config, "linkedin"),
+            "twitter_username": _pick(args, "twitter", config, "twitter"),
+        },
+    }
+
+
+def write_report(path, result):
+    """Write the run's result as JSON to path ("-" for stdout)."""
+    text = json.dumps(result, indent=2) + "\n"
+    if path == "-":
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def add_headless_arguments(parser):
+    """Flags shared by generate and update for answering the README questions up front."""
+    parser.add_argument(
+        "--headless", "--yes", "-y",
+        dest="headless",
+        action="store_true",
+        default=False,
+        help=f"Never prompt: take answers from these flags and {CONFIG_PATH} (implied on CI)",
+    )
+    for flag, dest, what in [
+        ("setup", "setup", "setup instructions"),
+        ("contrib", "contrib", "contribution guidelines"),
+        ("api-docs", "api_docs", "API documentation"),
+        ("diagrams", "diagrams", "system design diagrams"),
+    ]:
+        parser.add_argument(f"--{flag}", dest=dest, action="store_true", default=None, help=f"Include {what} (headless)")
+        parser.add_argument(f"--no-{flag}", dest=dest, action="store_false", help=f"Leave out {what} (headless)")
+    parser.add_argument("--linkedin", default=None, help="LinkedIn username for the author section (headless)")
+    parser.add_argument("--twitter", default=None, help="X (Twitter) username for the author section (headless)")
+    parser.add_argument(
+        "--report",
+        default=None,
+        help="Write the headless run's status, exit code and timings as JSON to this file ('-' for stdout)",
+    )
@@ -0,0 +1,137 @@
+import fnmatch
+import os
+import re
+
+import pathspec
+
+GITIGNORE_FILE = ".gitignore"
+PROJECT_IGNORE_FILE = ".dokugenignore"
+
+
+class IgnoreMatcher:
+    """Name matcher compiled once from shell-style ignore rules.
+
+    Rules are split into three buckets so a lookup costs a couple of hash
+    probes and at most one regex call:
+      - exact names ("Dockerfile", "yarn.lock")
+      - extensions ("*.png", "*.min.js"), matched against every dotted suffix
+      - everything else (".eslintrc*"), folded into one combined regex
+    """
+
+    def __init__(self, patterns):
+        self.names = set()
+        self.extensions = set()
+        globs = []
+
+        for pattern in patterns:
+            if pattern.startswith("*.") and not _has_magic(pattern[1:]):
+                self.extensions.add(pattern[1:])
+            elif _has_magic(pattern):
+                globs.append(pattern)
+            else:
+                self.names.add(pattern)
+
+        self.glob_regex = None
+        if globs:
+            self.glob_regex = re.compile("|".join(fnmatch.translate(g) for g in sorted(globs)))
+
+    def match(self, name):
+        if name in self.names:
+            return True
+
+        if self.extensions:
+            dot = name.find(".")
+            while dot != -1:
+                if name[dot:] in self.extensions:
+                    return True
+                dot = name.find(".", dot + 1)
+
+        return self.glob_regex is not None and self.glob_regex.match(name) is not None
+
+    __call__ = match
+
+    def filter(self, names):
+        """Return the names that are not ignored, preserving order."""
+        return [n for n in names if not self.match(n)]
+
+
+def _has_magic(pattern):
+    return any(c in pattern for c in "*?[")
+
+
+class IgnoreLayer:
+    """One compiled ignore file, anchored at the directory that contains it."""
+
+    def __init__(self, base, spec):
+        self.base = base
+        self.prefix = base + os.sep if base else ""
+        self.spec = spec
+
+    def check(self, rel_path, is_dir):
+        """Return True (ignored), False (re-included by a negation) or None (no rule matched)."""
+        if self.prefix:
+            if not rel_path.startswith(self.prefix):
+                return None
+            rel_path = rel_path[len(self.prefix):]
+        if is_dir:
+            rel_path += "/"
+        return self.spec.check_file(rel_path).include
+
+
+class IgnoreStack:
+    """Immutable chain of layers from the project root down to one directory.
+
+    Deeper .gitignore files take precedence over shallower ones, as in git;
+    the project-level .dokugenignore overrides all of them.
+    """
+
+    def __init__(self, layers=(), override=None):
+        self.layers = layers
+        self.override = override
+
+    def push(self, layer):
+        return IgnoreStack(self.layers + (layer,), self.override)
+
+    def is_ignored(self, rel_path, is_dir=False):
+        if self.override is not None:
+            result = self.override.check(rel_path, is_dir)
+            if result is not None:
+                return result
+        for layer in reversed(self.layers):
+            result = layer.check(rel_path, is_dir)
+            if result is not None:
+                return result
+        return False
+
+
+class IgnoreTree:
+    """Loads and compiles every directory's ignore file at most once per run."""
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        self._layers = {}
+
+    def _compile(self, path, base):
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                spec = pathspec.GitIgnoreSpec.from_lines(f)
+        except OSError:
+            return None
+        return IgnoreLayer(base, spec) if spec.patterns else None
+
+    def layer_for(self, rel_dir):
+        if rel_dir not in self._layers:
+            path = os.path.join(self.root_dir, rel_dir, GITIGNORE_FILE)
+            self._layers[rel_dir] = self._compile(path, rel_dir)
+        return self._layers[rel_dir]
+
+    def root_stack(self):
+        override = self._compile(os.path.join(self.root_dir, PROJECT_IGNORE_FILE), "")
+        return IgnoreStack(override=override)
+
+    def enter(self, stack, rel_dir, names):
+        """Return the stack for rel_dir, given the entry names it contains."""
+        if GITIGNORE_FILE not in names:
+            return stack
+        layer = self.layer_for(rel_dir)
+        return stack.push(layer) if layer else stack
@@ -0,0 +1,109 @@
+import os
+import threading
+from collections import deque, namedtuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from rich.console import Console
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 16
+TIMING_HISTORY = 100
+
+# Failures that mean the server was never reached (offline, DNS, timeouts)
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+# Connection failures are retried for every method since nothing reached the
+# server; status-based retries only for idempotent calls (chunk uploads are
+# content-addressed PUTs) so a README or commit message is never generated twice.
+DEFAULT_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=1,
+    status=2,
+    backoff_factor=0.3,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(["GET", "HEAD", "OPTIONS", "PUT"]),
+    raise_on_status=False,
+)
+
+# Local backend probes must fail fast on closed ports
+LOCAL_PREFIXES = ("http://localhost:", "http://127.0.0.1:")
+
+RequestTiming = namedtuple("RequestTiming", ["method", "url", "status", "elapsed"])
+
+# stderr, so debug timings never mix into --report - or --json output
+console = Console(stderr=True)
+
+_session = None
+_session_lock = threading.Lock()
+_timings = deque(maxlen=TIMING_HISTORY)
+
+
+def _record_timing(response, *args, **kwargs):
+    # elapsed covers sending the request until the response headers were parsed
+    timing = RequestTiming(response.request.method, response.url, response.status_code, response.elapsed.total_seconds())
+    _timings.append(timing)
+    if os.environ.get("DOKUGEN_DEBUG_HTTP"):
+        console.print(
+            f"[http] {timing.method} {timing.url} -> {timing.status} in {timing.elapsed * 1000:.0f} ms",
+            style="dim", markup=False, highlight=False,
+        )
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=DEFAULT_RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    probe_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    for prefix in LOCAL_PREFIXES:
+        session.mount(prefix, probe_adapter)
+
+    # Advertise every decoder urllib3 has available (br/zstd when installed)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    session.headers["Connection"] = "keep-alive"
+    session.hooks["response"].append(_record_timing)
+    return session
+
+
+def get_session():
+    """The process-wide pooled session; created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def request(method, url, **kwargs):
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def timings():
+    """Timings of the most recent requests, oldest first."""
+    return list(_timings)
+
+
+def last_timing():
+    return _timings[-1] if _timings else None
+
+
+def close():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
@@ -0,0 +1,192 @@
+import os
+
+from dokugen.project_detect import detection_patterns
+from dokugen.skeleton import can_skeletonize, skeletonize
+
+# Rough source-code average; good enough to keep requests within budget
+BYTES_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 250_000
+# Share of the budget kept back for summaries of files that don't fit in full
+SUMMARY_SHARE = 0.15
+SUMMARY_MAX_LINES = 25
+SUMMARY_MAX_BYTES = 1024
+# Skeletons typically keep a fifth to a third of a source file
+SKELETON_RATIO = 0.3
+
+MANIFEST_FILES = {
+    "package.json", "pyproject.toml", "requirements.txt", "setup.py", "setup.cfg", "Pipfile",
+    "environment.yml", "go.mod", "Cargo.toml", "pom.xml", "build.gradle", "build.gradle.kts",
+    "settings.gradle", "composer.json", "Gemfile", "mix.exs", "pubspec.yaml", "deno.json",
+    "project.clj", "stack.yaml", "Package.swift", "CMakeLists.txt", "Makefile", "docker-compose.yml",
+    "pnpm-workspace.yaml", "turbo.json", "nx.json", "lerna.json",
+}
+
+ENTRY_POINT_FILES = {
+    "main.py", "app.py", "__main__.py", "cli.py", "manage.py", "wsgi.py", "asgi.py", "server.py",
+    "main.go", "main.rs", "lib.rs", "mod.rs", "Program.cs", "main.dart", "Main.java", "Application.java",
+    "index.js", "index.ts", "index.jsx", "index.tsx", "main.js", "main.ts", "app.js", "app.ts",
+    "server.js", "server.ts", "App.jsx", "App.tsx", "App.vue", "App.svelte", "index.php", "main.c",
+    "main.cpp", "main.swift", "main.kt", "index.html",
+}
+
+SCORE_MANIFEST = 100
+SCORE_ENTRY_POINT = 80
+SCORE_DETECTED = 60
+SCORE_RECENT = 40
+DEPTH_PENALTY = 5
+
+
+def get_token_budget(value=None):
+    """Resolve the budget from an explicit value or DOKUGEN_TOKEN_BUDGET; 0 means unlimited."""
+    raw = value if value is not None else os.environ.get("DOKUGEN_TOKEN_BUDGET")
+    if raw is None or raw == "":
+        return DEFAULT_TOKEN_BUDGET
+    try:
+        return max(int(raw), 0)
+    except (TypeError, ValueError):
+        return DEFAULT_TOKEN_BUDGET
+
+
+def estimate_tokens(size_bytes):
+    return (size_bytes + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+
+def _pattern_files(pattern):
+    files = {f for f in pattern.get("files", []) if "*" not in f}
+    files.update(c["file"] for c in pattern.get("contents", []))
+    return files
+
+
+def detected_type_files(project_type):
+    """Files that detection patterns tie to the frameworks named in project_type."""
+    files = set()
+    for type_name, pattern in detection_patterns.items():
+        if type_name in project_type:
+            files.update(_pattern_files(pattern))
+    return {os.path.normpath(f) for f in files}
+
+
+def detection_files(detection):
+    """Pattern files of every candidate in a DetectionNode tree, plus the files cited as evidence.
+
+    Paths are relative to the project root, so a package's next.config.js
+    is ranked up under its own directory rather than at the root.
+    """
+    files = set()
+    for node in detection.walk():
+        for candidate in node.candidates:
+            node_files = _pattern_files(detection_patterns.get(candidate["type"], {}))
+            node_files.update(e["file"] for e in candidate.get("evidence", ()) if e["file"] and "*" not in e["file"])
+            files.update(os.path.normpath(os.path.join(node.path, f)) for f in node_files)
+    return files
+
+
+def score_file(file, detected_files=frozenset(), recent_files=frozenset()):
+    name = os.path.basename(file)
+    score = 0
+    if name in MANIFEST_FILES:
+        score += SCORE_MANIFEST
+    if name in ENTRY_POINT_FILES:
+        score += SCORE_ENTRY_POINT
+    if file in detected_files:
+        score += SCORE_DETECTED
+    if file in recent_files:
+        score += SCORE_RECENT
+    return score - DEPTH_PENALTY * file.count(os.sep)
+
+
+def summarize(file, content):
+    """Default overflow summary: the file's skeleton, or its head if it has no skeletonizer."""
+    skeleton = skeletonize(file, content)
+    text = skeleton if skeleton is not None else "\n".join(content.splitlines()[:SUMMARY_MAX_LINES])
+    return f"{text[:SUMMARY_MAX_BYTES]}\n... (truncated to fit the context budget)"
+
+
+class ContextPlan:
+    def __init__(self, budget, summarizer=None, skeleton=False):
+        self.budget = budget
+        self.summarizer = summarizer or summarize
+        self.skeleton = skeleton
+        # Files to send (full or summarized) in their original scan order
+        self.files = []
+        self.full = []
+        self.summarized = []
+        self.dropped = []
+        self.estimated_tokens = 0
+        self._summarized = set()
+
+    def transform(self, file, content):
+        if file in self._summarized:
+            return self.summarizer(file, content)
+        if self.skeleton:
+            skeleton = skeletonize(file, content)
+            if skeleton is not None:
+                return skeleton
+        return content
+
+    def to_dict(self):
+        return {
+            "budget": self.budget,
+            "skeleton": self.skeleton,
+            "estimatedTokens": self.estimated_tokens,
+            "summarizedFiles": self.summarized,
+            "droppedFiles": self.dropped,
+        }
+
+
+def pack_context(project_files, sizes, budget, project_type="", recent_files=(), summarizer=None, skeleton=False, detection=None):
+    """Choose which files go in full, which are summarized and which are dropped.
+
+    Files are ranked by importance (manifests, entry points, files named by
+    the detected frameworks, recently changed files, shallow paths first)
+    and admitted in full until the budget minus the summary reserve is
+    spent; the rest are summarized while the reserve lasts, then dropped.
+    With skeleton=True, source files are sent as skeletons and budgeted
+    at SKELETON_RATIO of their size. A detection tree, when given, names
+    the framework files per package instead of the project_type string.
+    """
+    plan = ContextPlan(budget, summarizer, skeleton)
+
+    def file_tokens(f):
+        size = sizes.get(f) or 0
+        if skeleton and can_skeletonize(f):
+            size = int(size * SKELETON_RATIO)
+        return estimate_tokens(size)
+
+    if not budget:
+        plan.files = list(project_files)
+        plan.full = plan.files
+        plan.estimated_tokens = sum(file_tokens(f) for f in project_files)
+        return plan
+
+    detected_files = detection_files(detection) if detection is not None else detected_type_files(project_type or "")
+    recent_files = set(recent_files)
+    order = {f: i for i, f in enumerate(project_files)}
+    ranked = sorted(project_files, key=lambda f: (-score_file(f, detected_files, recent_files), order[f]))
+
+    full_budget = int(budget * (1 - SUMMARY_SHARE))
+    summary_tokens = estimate_tokens(SUMMARY_MAX_BYTES)
+    used = 0
+    full = set()
+    overflow = []
+    for f in ranked:
+        tokens = file_tokens(f)
+        if used + tokens <= full_budget:
+            full.add(f)
+            used += tokens
+        else:
+            overflow.append(f)
+
+    for f in overflow:
+        tokens = min(file_tokens(f), summary_tokens)
+        if used + tokens <= budget:
+            plan._summarized.add(f)
+            used += tokens
+        else:
+            plan.dropped.append(f)
+
+    plan.estimated_tokens = used
+    plan.files = [f for f in project_files if f in full or f in plan._summarized]
+    plan.full = [f for f in plan.files if f in full]
+    plan.summarized = [f for f in plan.files if f in plan._summarized]
+    return plan
@@ -0,0 +1,224 @@
+import base64
+import json
+import os
+import zlib
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+
+# stderr, so read warnings never mix into --report - output
+console = Console(stderr=True)
+
+EMPTY_CODE = "No code snippets available"
+
+GZIP = "gzip"
+ZSTD = "zstd"
+GZIP_LEVEL = 9
+# Past 9, zstd compresses slower than gzip -9 does (benchmarks/bench_compression.py)
+ZSTD_LEVEL = 9
+# The dictionary pays off on update-sized payloads; on whole repositories zstd's
+# own window has learnt more than 64 KB of generic source can teach it
+DICTIONARY_MAX_BYTES = 1024 * 1024
+
+# Trained on typical project sources by benchmarks/train_zstd_dictionary.py
+DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "source.zdict")
+_dictionary = None
+
+
+def _zstandard():
+    """The zstandard module (optional: pip install 'dokugen[zstd]'), imported on first use; None if missing."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def format_snippet(file, content, size):
+    ext = Path(file).suffix[1:] or "txt"
+    return f"### {file}\n- **Path:** {file}\n- **Size:** {size / 1024:.2f} KB\n```{ext}\n{content}\n```\n"
+
+
+def read_snippet(project_dir, file):
+    """(text, size in bytes) of one project file; raises OSError if it can't be read."""
+    with open(os.path.join(project_dir, file), "r", encoding="utf-8", errors="replace") as f:
+        size = os.fstat(f.fileno()).st_size
+        return f.read(), size
+
+
+def iter_code_snippets(project_files, project_dir, transform=None, read=None):
+    """Yield the fullCode markdown one file at a time, grouped by directory.
+
+    Produces exactly the text extract_full_code used to build in memory, but
+    only one file's content is alive at any moment. transform(file, content)
+    may replace a file's content (e.g. with a summary) before it is emitted;
+    read(file) may supply (content, size) instead of read_snippet.
+    """
+    file_groups = {}
+    for f in project_files:
+        file_groups.setdefault(os.path.dirname(f), []).append(f)
+
+    empty = True
+    for d, files in file_groups.items():
+        header_sent = False
+        for file in files:
+            try:
+                content, size = read(file) if read is not None else read_snippet(project_dir, file)
+            except Exception as e:
+                console.print(f"[red]Failed to read file: {escape(file)} - {escape(str(e))}[/red]")
+                continue
+
+            if transform is not None:
+                content = transform(file, content)
+
+            if not header_sent:
+                yield f"## {d}\n"
+                header_sent = True
+            yield format_snippet(file, content, size)
+            empty = False
+
+    if empty:
+        yield EMPTY_CODE
+
+
+class Base64Encoder:
+    """Wraps a bytes encoder so its output concatenates to base64 of the whole stream.
+
+    Output is produced in chunks as the compressor fills its window; base64
+    is emitted on 3-byte boundaries so chunks can simply be concatenated.
+    """
+
+    def __init__(self, encoder):
+        self._encoder = encoder
+        self._pending = b""
+
+    def _encode(self, data, final=False):
+        data = self._pending + data
+        cut = len(data) if final else len(data) - len(data) % 3
+        self._pending = data[cut:]
+        return base64.b64encode(data[:cut]).decode("ascii")
+
+    def write(self, text):
+        return self._encode(self._encoder.write(text))
+
+    def close(self):
+        return self._encode(self._encoder.close(), final=True)
+
+
+class GzipEncoder:
+    """Incremental gzip(text) as raw bytes, for transports that carry binary."""
+
+    def __init__(self, level=9):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def write(self, text):
+        return self._compressor.compress(text.encode("utf-8"))
+
+    def close(self):
+        return self._compressor.flush()
+
+
+class GzipBase64Encoder(Base64Encoder):
+    """Incremental equivalent of base64(gzip(text))."""
+
+    def __init__(self, level=9):
+        super().__init__(GzipEncoder(level))
+
+
+class ZstdEncoder:
+    """Incremental zstd(text) as raw bytes, optionally against a dictionary."""
+
+    def __init__(self, level=ZSTD_LEVEL, dictionary=None):
+        self._compressor = _zstandard().ZstdCompressor(level=level, dict_data=dictionary).compressobj()
+
+    def write(self, text):
+        return self._compressor.compress(text.encode("utf-8"))
+
+    def close(self):
+        return self._compressor.flush()
+
+
+def load_dictionary():
+    """The zstd dictionary shipped with the package, or None without zstandard or the file."""
+    global _dictionary
+    zstandard = _zstandard()
+    if _dictionary is None and zstandard is not None:
+        try:
+            with open(DICTIONARY_PATH, "rb") as f:
+                _dictionary = zstandard.ZstdCompressionDict(f.read())
+        except OSError:
+            _dictionary = False
+    return _dictionary or None
+
+
+class Codec:
+    """How fullCode and existingReadme are compressed: "gzip" or "zstd", a level, an optional dictionary."""
+
+    def __init__(self, name=GZIP, level=None, dictionary=None):
+        self.name = name
+        self.level = level if level is not None else (ZSTD_LEVEL if name == ZSTD else GZIP_LEVEL)
+        self.dictionary = dictionary
+
+    def encoder(self):
+        if self.name == ZSTD:
+            return ZstdEncoder(self.level, self.dictionary)
+        return GzipEncoder(self.level)
+
+    def compress(self, data):
+        encoder = self.encoder()
+        return encoder.write(data) + encoder.close()
+
+    def payload_fields(self):
+        """The request fields telling the backend how to decompress."""
+        return {
+            "compression": self.name,
+            "compressionDictionary": self.dictionary.dict_id() if self.dictionary is not None else None,
+        }
+
+
+def negotiate_codec(features, size=0):
+    """The best codec both sides support for size bytes of code, given the backend's features.
+
+    zstd needs the zstd extra installed here and "zstd" from the backend; the shipped
+    dictionary is used for payloads under DICTIONARY_MAX_BYTES when the backend
+    lists its ID too. DOKUGEN_COMPRESSION=gzip opts out of zstd and
+    DOKUGEN_ZSTD_LEVEL overrides its level.
+    """
+    if os.environ.get("DOKUGEN_COMPRESSION", "").lower() == GZIP or ZSTD not in features or _zstandard() is None:
+        return Codec(GZIP)
+
+    try:
+        level = int(os.environ["DOKUGEN_ZSTD_LEVEL"])
+    except (KeyError, ValueError):
+        level = None
+    dictionary = load_dictionary() if size < DICTIONARY_MAX_BYTES else None
+    if dictionary is not None and f"zstd-dictionary:{dictionary.dict_id()}" not in features:
+        dictionary = None
+    return Codec(ZSTD, level, dictionary)
+
+
+def iter_encoded(chunks, encoder=None):
+    """Stream text chunks through an encoder, skipping empty output."""
+    encoder = encoder or GzipBase64Encoder()
+    for chunk in chunks:
+        out = encoder.write(chunk)
+        if out:
+            yield out
+    out = encoder.close()
+    if out:
+        yield out
+
+
+def iter_json_body(payload, stream_field, stream_chunks):
+    """Serialize payload as UTF-8 JSON with one string field streamed from stream_chunks.
+
+    The chunks must already be JSON-string safe (e.g. base64) since they are
+    written verbatim between the quotes.
+    """
+    head = json.dumps({k: v for k, v in payload.items() if k != stream_field})
+    separator = ", " if head != "{}" else ""
+    yield (head[:-1] + separator + json.dumps(stream_field) + ': "').encode("utf-8")
+    for chunk in stream_chunks:
+        yield chunk.encode("ascii")
+    yield b'"}'
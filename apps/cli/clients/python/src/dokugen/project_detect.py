@@ -1,6 +1,11 @@
-import os
-import json
+import fnmatch
 import glob
+import json
+import os
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dokugen.ignore import IgnoreMatcher
 
 detection_patterns = {
     "Qwik": {"files": ["vite.config.ts"], "packageJson": {"dependencies": ["@builder.io/qwik"]}},
@@ -170,28 +175,309 @@ detection_patterns = {
     "PNPM Workspaces": {"files": ["pnpm-workspace.yaml"]},
 }
 
+# Bump whenever detection output can change (new rules, fixes, result fields,
+# helpers it depends on); cached detections from any other version are discarded
+DETECTOR_VERSION = 1
+
+# Any of these marks a directory as an independent service/app
+SERVICE_INDICATORS = [
+    "package.json", "go.mod", "requirements.txt", "pyproject.toml",
+    "Pipfile", "Cargo.toml", "pom.xml", "build.gradle", "composer.json",
+    "Gemfile", "mix.exs", "pubspec.yaml", "*.csproj"
+]
+
+# Root-level directories never treated as candidate services
+ROOT_SUBDIR_IGNORE = IgnoreMatcher([".*", "node_modules", "dist", "build", "docs", "scripts", "config"])
+
+
+def decode_text(data, errors="strict"):
+    """Bytes as open(path, "r", encoding="utf-8", errors=errors).read() returns them."""
+    return data.decode("utf-8", errors).replace("\r\n", "\n").replace("\r", "\n")
 
-def _read_file_safe(path):
-    try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
-    except Exception:
-        return ""
 
+def _case_insensitive_fs(path):
+    swapped = path.swapcase()
+    if swapped == path:
+        return sys.platform in ("win32", "darwin")
+    return os.path.exists(swapped)
 
-def _path_exists(p):
-    return os.path.exists(p)
 
+class _Entry:
+    __slots__ = ("name", "is_dir", "exists")
 
-def _is_dir(p):
-    return os.path.isdir(p)
+    def __init__(self, name, is_dir, exists):
+        self.name = name
+        self.is_dir = is_dir
+        self.exists = exists
 
 
-def _list_dir_safe(p):
+class _Listing:
+    """One directory read with scandir, in os.listdir order."""
+
+    def __init__(self, path, case_insensitive, scanned=None):
+        self.path = path
+        self.entries = {}
+        # Searchable but unreadable directories can't be listed, yet their children can be stat'ed
+        self.unreadable = False
+        if scanned is not None:
+            # Already listed by a Scanner(record=True) walk
+            for name, is_dir, is_symlink in scanned:
+                exists = is_dir or not is_symlink or os.path.exists(os.path.join(path, name))
+                self.entries[name] = _Entry(name, is_dir, exists)
+        else:
+            self._scan(path)
+        self.names = list(self.entries)
+        self._folded = {n.casefold(): entry for n, entry in self.entries.items()} if case_insensitive else None
+        self._suffixes = None
+        self._visible = None
+        self._fold_suffixes = os.path.normcase("A") != "A"
+
+    def _scan(self, path):
+        try:
+            with os.scandir(path) as it:
+                for e in it:
+                    try:
+                        is_dir = e.is_dir()
+                        # Broken symlinks are listed but os.path.exists() is False for them
+                        exists = is_dir or not e.is_symlink() or os.path.exists(e.path)
+                    except OSError:
+                        is_dir, exists = False, False
+                    self.entries[e.name] = _Entry(e.name, is_dir, exists)
+        except OSError:
+            self.unreadable = True
+
+    def get(self, name):
+        if self.unreadable:
+            try:
+                return _Entry(name, stat.S_ISDIR(os.stat(os.path.join(self.path, name)).st_mode), True)
+            except (OSError, ValueError):
+                return None
+        entry = self.entries.get(name)
+        if entry is None and self._folded is not None:
+            entry = self._folded.get(name.casefold())
+        return entry
+
+    def glob(self, pattern):
+        """True if glob.glob(<dir>/pattern) would match anything (hidden names excluded)."""
+        if pattern.startswith("*.") and not glob.has_magic(pattern[1:]):
+            if self._suffixes is None:
+                self._suffixes = set()
+                for n in self.visible():
+                    n = n.lower() if self._fold_suffixes else n
+                    i = n.find(".", 1)
+                    while i != -1:
+                        self._suffixes.add(n[i:])
+                        i = n.find(".", i + 1)
+            suffix = pattern[1:].lower() if self._fold_suffixes else pattern[1:]
+            return suffix in self._suffixes
+        return bool(fnmatch.filter(self.visible(), pattern))
+
+    def visible(self):
+        if self._visible is None:
+            self._visible = [n for n in self.names if not n.startswith(".")]
+        return self._visible
+
+
+def _state(entry):
+    """What an existence check saw: "dir", "file", or None (missing or a broken symlink)."""
+    if entry is None or not entry.exists:
+        return None
+    return "dir" if entry.is_dir else "file"
+
+
+# names_matching pattern under which fingerprints record subdirs() results
+SUBDIRS = "*/"
+
+
+class ProjectIndex:
+    """Filesystem view used by detection: each directory listed once, each file read once.
+
+    Children created with child() share the listing and read caches, so
+    sub-project detection reuses whatever the parent already touched.
+    scanned takes Scanner(record=True).listings so directories the walk
+    already listed are not listed again. Every answer detection gets is
+    recorded for fingerprint().
+    """
+
+    def __init__(self, root, _shared=None, scanned=None):
+        self.root = root
+        if _shared is None:
+            _shared = {
+                "listings": {}, "scanned": scanned or {}, "raw": {}, "texts": {}, "json": {}, "stats": {},
+                "seen": {"lookups": {}, "names": {}, "globs": {}},
+                "case_insensitive": _case_insensitive_fs(os.path.abspath(root)),
+            }
+        self._shared = _shared
+
+    def child(self, rel_path):
+        return ProjectIndex(os.path.join(self.root, *rel_path.split("/")), self._shared)
+
+    def _listing(self, path):
+        listings = self._shared["listings"]
+        listing = listings.get(path)
+        if listing is None:
+            listing = listings[path] = _Listing(path, self._shared["case_insensitive"], self._shared["scanned"].get(path))
+        return listing
+
+    def _get(self, dir_path, name):
+        entry = self._listing(dir_path).get(name)
+        self._shared["seen"]["lookups"].setdefault(dir_path, {})[name] = _state(entry)
+        return entry
+
+    def _lookup(self, rel_path):
+        path = self.root
+        *parents, name = rel_path.split("/")
+        for part in parents:
+            entry = self._get(path, part)
+            if entry is None or not entry.is_dir:
+                return None
+            path = os.path.join(path, entry.name)
+        return self._get(path, name)
+
+    def _dir_listing(self, rel_dir):
+        if rel_dir and not self.is_dir(rel_dir):
+            return None
+        return self._listing(self.path(rel_dir))
+
+    def _seen_names(self, rel_dir, pattern, names):
+        self._shared["seen"]["names"].setdefault(self.path(rel_dir), {})[pattern] = sorted(names)
+
+    def path(self, rel_path):
+        if not rel_path:
+            return self.root
+        return os.path.join(self.root, *rel_path.split("/"))
+
+    def names_matching(self, pattern, rel_dir=""):
+        """Entry names in rel_dir matching pattern case-sensitively, in os.listdir order (empty if missing)."""
+        listing = self._dir_listing(rel_dir)
+        names = [n for n in listing.names if fnmatch.fnmatchcase(n, pattern)] if listing else []
+        self._seen_names(rel_dir, pattern, names)
+        return names
+
+    def subdirs(self, rel_dir=""):
+        """Names of the directories in rel_dir, in os.listdir order (empty if missing)."""
+        listing = self._dir_listing(rel_dir)
+        names = [e.name for e in listing.entries.values() if e.is_dir] if listing else []
+        self._seen_names(rel_dir, SUBDIRS, names)
+        return names
+
+    def exists(self, rel_path):
+        entry = self._lookup(rel_path)
+        return entry is not None and entry.exists
+
+    def is_dir(self, rel_path):
+        entry = self._lookup(rel_path)
+        return entry is not None and entry.is_dir
+
+    def glob(self, pattern):
+        matched = self._listing(self.root).glob(pattern)
+        self._shared["seen"]["globs"].setdefault(self.root, {})[pattern] = matched
+        return matched
+
+    def read_bytes(self, rel_path):
+        """Contents of a file, memoized; None if it is missing or unreadable."""
+        path = self.path(rel_path)
+        raw = self._shared["raw"]
+        if path not in raw:
+            data = None
+            entry = self._lookup(rel_path)
+            if entry is not None and entry.exists and not entry.is_dir:
+                try:
+                    with open(path, "rb") as f:
+                        st = os.fstat(f.fileno())
+                        data = f.read()
+                    self._shared["stats"][path] = [st.st_size, st.st_mtime_ns]
+                except OSError:
+                    pass
+            raw[path] = data
+        return raw[path]
+
+    def held_bytes(self, path):
+        """Contents of an absolute path if detection already read it, else None."""
+        return self._shared["raw"].get(path)
+
+    def read(self, rel_path):
+        """Text of a file (undecodable bytes dropped), memoized; "" if it is missing or unreadable."""
+        path = self.path(rel_path)
+        texts = self._shared["texts"]
+        if path not in texts:
+            data = self.read_bytes(rel_path)
+            texts[path] = decode_text(data, "ignore") if data is not None else ""
+        return texts[path]
+
+    def package_json(self):
+        path = self.path("package.json")
+        cache = self._shared["json"]
+        if path not in cache:
+            data = {}
+            raw = self.read_bytes("package.json")
+            if raw is not None:
+                try:
+                    data = json.loads(decode_text(raw))
+                except Exception:
+                    pass
+            cache[path] = data
+        return cache[path]
+
+    def fingerprint(self):
+        """The answers detection got, relative to this index's root.
+
+        Per directory, "lookups" holds the state ("dir", "file" or None) of
+        each name looked up, "names" what each names_matching()/subdirs()
+        call returned and "globs" each glob() result; "files" holds the size
+        and mtime of every file read. Adding or removing files no rule asks
+        about (sources, editor swap files, a rewritten README) leaves all of
+        them unchanged.
+        """
+        def rel(path):
+            path = os.path.relpath(path, self.root)
+            return "" if path == "." else path.replace(os.sep, "/")
+
+        seen = self._shared["seen"]
+        return {
+            "lookups": {rel(p): dict(states) for p, states in seen["lookups"].items()},
+            "names": {rel(p): dict(patterns) for p, patterns in seen["names"].items()},
+            "globs": {rel(p): dict(patterns) for p, patterns in seen["globs"].items()},
+            "files": {rel(p): st for p, st in self._shared["stats"].items()},
+        }
+
+
+def fingerprint_matches(project_dir, fingerprint, snapshot=None):
+    """True if every answer recorded by ProjectIndex.fingerprint() is still the same.
+
+    The questions are asked again of a fresh index; with a ProjectSnapshot,
+    whatever its walk already listed or stat'ed is not touched again.
+    """
+    index = ProjectIndex(project_dir, scanned=snapshot.listings if snapshot is not None else None)
     try:
-        return os.listdir(p)
-    except Exception:
-        return []
+        for rel_dir, states in fingerprint["lookups"].items():
+            listing = index._listing(index.path(rel_dir))
+            for name, state in states.items():
+                if _state(listing.get(name)) != state:
+                    return False
+        for rel_dir, patterns in fingerprint["names"].items():
+            for pattern, names in patterns.items():
+                current = index.subdirs(rel_dir) if pattern == SUBDIRS else index.names_matching(pattern, rel_dir)
+                if sorted(current) != names:
+                    return False
+        for rel_dir, patterns in fingerprint["globs"].items():
+            listing = index._listing(index.path(rel_dir))
+            for pattern, matched in patterns.items():
+                if listing.glob(pattern) != matched:
+                    return False
+        for rel, recorded in fingerprint["files"].items():
+            known = snapshot.stat(rel) if snapshot is not None else None
+            if known is None:
+                try:
+                    st = os.stat(os.path.join(project_dir, rel))
+                except OSError:
+                    return False
+                known = (st.st_size, st.st_mtime_ns)
+            if [known[0], known[1]] != recorded:
+                return False
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return False
+    return True
 
 
 def get_category(type_name):
@@ -226,24 +512,151 @@ def get_category(type_name):
     return "other"
 
 
+class DetectionNode:
+    """Detection result for one directory; monorepo/microservice nodes carry per-package children.
+
+    candidates lists every type the directory's own files matched, best
+    first, as {"type", "category", "confidence", "evidence"} where each
+    evidence item is {"file", "reason"} with file relative to path (a
+    glob like "*.py" for file counts, None if no single file matched).
+    """
+
+    def __init__(self, path, type, layout="single", role="root", children=(), candidates=()):
+        self.path = path
+        self.type = type
+        self.layout = layout
+        self.role = role
+        self.children = list(children)
+        self.candidates = list(candidates)
+
+    @property
+    def name(self):
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def best(self):
+        """The candidate a single project was labelled with, or None."""
+        if self.layout == "single" and self.candidates:
+            return self.candidates[0]
+        return None
+
+    @property
+    def category(self):
+        if self.layout != "single":
+            return self.layout
+        return self.best["category"] if self.best else None
+
+    def walk(self):
+        """This node and every package below it, depth first."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["path"], data["type"], data["layout"], data["role"],
+            [cls.from_dict(c) for c in data["children"]],
+            data.get("candidates", []),
+        )
+
+    def relabel(self, path, role):
+        return DetectionNode(path, self.type, self.layout, role, self.children, self.candidates)
+
+    def to_dict(self):
+        best = self.best
+        return {
+            "path": self.path,
+            "type": self.type,
+            "layout": self.layout,
+            "role": self.role,
+            "category": self.category,
+            "confidence": best["confidence"] if best else None,
+            "candidates": self.candidates,
+            "children": [c.to_dict() for c in self.children],
+        }
+
+
+class _DetectionRun:
+    """Per-run state: results memoized by directory, sub-projects of the root fanned out on a pool."""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self.memo = {}
+
+    def detect(self, rel_path, index, role, depth):
+        node = self.memo.get(index.root)
+        if node is None:
+            node = self.memo[index.root] = _detect(index, self, rel_path, role, depth)
+        if node.path != rel_path or node.role != role:
+            node = node.relabel(rel_path, role)
+        return node
+
+    def detect_all(self, subprojects, depth):
+        """Detect (rel_path, index, role) sub-projects, keeping their order.
+
+        Only the root's fan-out uses the pool; deeper levels run inline in
+        the worker so nested waits can never exhaust it.
+        """
+        if depth == 0 and len(subprojects) > 1 and self.max_workers != 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                return list(pool.map(lambda s: self.detect(s[0], s[1], s[2], depth + 1), subprojects))
+        return [self.detect(rel_path, sub_index, role, depth + 1) for rel_path, sub_index, role in subprojects]
+
+
+def detect_project_tree(project_dir, max_workers=None, index=None):
+    """Detect the project and, for monorepos and microservices, every package in it."""
+    return _DetectionRun(max_workers).detect("", index or ProjectIndex(project_dir), "root", 0)
+
+
 def detect_project_type(project_dir):
+    return detect_project_tree(project_dir).type
+
+
+def _is_service_dir(index):
+    """Check if a directory looks like an independent service/app."""
+    for indicator in SERVICE_INDICATORS:
+        if "*" in indicator:
+            if index.glob(indicator):
+                return True
+        elif index.exists(indicator):
+            return True
+    return False
+
+
+def _evidence(file, reason="present"):
+    return {"file": file, "reason": reason}
+
+
+def _first_source(sources, needle):
+    """Name of the first (name, text) source whose lowercased text contains needle."""
+    for name, text in sources:
+        if needle in text.lower():
+            return name
+    return None
+
+
+def _detect(index, run, rel_path="", role="root", depth=0):
+    def node_for(type_name, layout="single", children=()):
+        return DetectionNode(rel_path, type_name, layout, role, children, detected_types)
+
+    def sub_path(name):
+        return f"{rel_path}/{name}" if rel_path else name
+
     detected_types = []
 
-    go_mod_path = os.path.join(project_dir, "go.mod")
-    try:
-        go_files = [f for f in os.listdir(project_dir) if f.endswith(".go")]
-    except Exception:
-        go_files = []
+    go_files = index.names_matching("*.go")
 
     has_go_files = len(go_files) > 0
-    has_go_mod = _path_exists(go_mod_path)
+    has_go_mod = index.exists("go.mod")
 
     if has_go_mod or has_go_files:
         go_type = "Go"
         confidence = 100 if has_go_mod else 80
+        evidence = [_evidence("go.mod")] if has_go_mod else [_evidence("*.go", f"{len(go_files)} Go file(s)")]
 
-        go_mod_content = _read_file_safe(go_mod_path) if has_go_mod else ""
-        main_go_content = _read_file_safe(os.path.join(project_dir, "main.go"))
+        go_mod_content = index.read("go.mod") if has_go_mod else ""
+        main_go_content = index.read("main.go")
 
         frameworks = {
             "github.com/gin-gonic/gin": "Gin",
@@ -260,17 +673,11 @@ def detect_project_type(project_dir):
             if pkg in go_mod_content or pkg in main_go_content:
                 go_type = f"Go {framework}"
                 confidence += 10
+                evidence.append(_evidence("go.mod" if pkg in go_mod_content else "main.go", f"imports {pkg}"))
 
-        detected_types.append({"type": go_type, "category": "backend", "confidence": min(confidence, 100)})
+        detected_types.append({"type": go_type, "category": "backend", "confidence": min(confidence, 100), "evidence": evidence})
 
-    package_json = {}
-    package_json_path = os.path.join(project_dir, "package.json")
-    if _path_exists(package_json_path):
-        try:
-            with open(package_json_path, "r", encoding="utf-8") as f:
-                package_json = json.load(f)
-        except Exception:
-            pass
+    package_json = index.package_json()
 
     dependencies = package_json.get("dependencies", {})
     dev_dependencies = package_json.get("devDependencies", {})
@@ -278,20 +685,16 @@ def detect_project_type(project_dir):
 
     if package_json:
         is_react_app = any(k in all_deps for k in ["react", "next", "gatsby", "remix"])
-        is_backend = (
-            "express" in all_deps
-            or "@nestjs/core" in all_deps
-            or "fastify" in all_deps
-            or "koa" in all_deps
-            or "hono" in all_deps
-            or "@trpc/server" in all_deps
-            or package_json.get("type") == "module"
-            or _path_exists(os.path.join(project_dir, "server.js"))
-            or _path_exists(os.path.join(project_dir, "app.js"))
-            or _path_exists(os.path.join(project_dir, "index.js"))
-            or _is_dir(os.path.join(project_dir, "src", "server"))
-            or _is_dir(os.path.join(project_dir, "src", "api"))
-        )
+        backend_evidence = [
+            _evidence("package.json", f"dependency {dep}")
+            for dep in ["express", "@nestjs/core", "fastify", "koa", "hono", "@trpc/server"]
+            if dep in all_deps
+        ]
+        if package_json.get("type") == "module":
+            backend_evidence.append(_evidence("package.json", "type module"))
+        backend_evidence.extend(_evidence(f) for f in ["server.js", "app.js", "index.js"] if index.exists(f))
+        backend_evidence.extend(_evidence(d, "folder") for d in ["src/server", "src/api"] if index.is_dir(d))
+        is_backend = bool(backend_evidence)
 
         if not is_react_app and is_backend:
             node_type = "TypeScript Node.js" if "typescript" in all_deps else "Node.js"
@@ -320,85 +723,90 @@ def detect_project_type(project_dir):
             if "mongoose" in all_deps:
                 node_type += " + Mongoose"
 
-            detected_types.append({"type": node_type, "category": "backend", "confidence": 95})
+            detected_types.append({"type": node_type, "category": "backend", "confidence": 95, "evidence": backend_evidence})
 
     for type_name, pattern in detection_patterns.items():
         if type_name == "Go" and any(t["type"] == "Go" for t in detected_types):
             continue
 
         confidence = 0
+        evidence = []
 
         if "files" in pattern:
             for file_pattern in pattern["files"]:
                 if "*" in file_pattern:
-                    if glob.glob(os.path.join(project_dir, file_pattern)):
+                    if index.glob(file_pattern):
                         confidence += 30
+                        evidence.append(_evidence(file_pattern))
                         break
-                elif _path_exists(os.path.join(project_dir, file_pattern)):
+                elif index.exists(file_pattern):
                     confidence += 30
+                    evidence.append(_evidence(file_pattern))
                     break
 
         if "folders" in pattern:
             for folder in pattern["folders"]:
-                if _is_dir(os.path.join(project_dir, folder)):
+                if index.is_dir(folder):
                     confidence += 20
+                    evidence.append(_evidence(folder, "folder"))
                     break
 
         if "contents" in pattern:
             for content_check in pattern["contents"]:
-                file_path = os.path.join(project_dir, content_check["file"])
-                if _path_exists(file_path):
-                    content = _read_file_safe(file_path)
-                    if any(kw in content for kw in content_check["keywords"]):
+                if index.exists(content_check["file"]):
+                    content = index.read(content_check["file"])
+                    keyword = next((kw for kw in content_check["keywords"] if kw in content), None)
+                    if keyword is not None:
                         confidence += 25
+                        evidence.append(_evidence(content_check["file"], f"mentions {keyword}"))
 
         if "packageJson" in pattern and package_json:
             pj = pattern["packageJson"]
             if "dependencies" in pj:
-                if any(dep in dependencies for dep in pj["dependencies"]):
+                dep = next((d for d in pj["dependencies"] if d in dependencies), None)
+                if dep is not None:
                     confidence += 25
+                    evidence.append(_evidence("package.json", f"dependency {dep}"))
             if "devDependencies" in pj:
-                if any(dep in dev_dependencies for dep in pj["devDependencies"]):
+                dep = next((d for d in pj["devDependencies"] if d in dev_dependencies), None)
+                if dep is not None:
                     confidence += 15
+                    evidence.append(_evidence("package.json", f"devDependency {dep}"))
             if "scripts" in pj:
                 scripts = package_json.get("scripts", {})
-                if any(s in scripts for s in pj["scripts"]):
+                script = next((s for s in pj["scripts"] if s in scripts), None)
+                if script is not None:
                     confidence += 10
+                    evidence.append(_evidence("package.json", f"script {script}"))
 
         if confidence > 0:
-            detected_types.append({"type": type_name, "category": get_category(type_name), "confidence": confidence})
+            detected_types.append({"type": type_name, "category": get_category(type_name), "confidence": confidence, "evidence": evidence})
 
-    requirements_path = os.path.join(project_dir, "requirements.txt")
-    pipfile_path = os.path.join(project_dir, "Pipfile")
-    poetry_path = os.path.join(project_dir, "pyproject.toml")
-    conda_path = os.path.join(project_dir, "environment.yml")
-    try:
-        python_files = [f for f in os.listdir(project_dir) if f.endswith(".py")]
-    except Exception:
-        python_files = []
+    python_files = index.names_matching("*.py")
 
     is_python_project = (
         len(python_files) > 0
-        or _path_exists(requirements_path)
-        or _path_exists(pipfile_path)
-        or _path_exists(poetry_path)
-        or _path_exists(conda_path)
+        or index.exists("requirements.txt")
+        or index.exists("Pipfile")
+        or index.exists("pyproject.toml")
+        or index.exists("environment.yml")
     )
 
     if is_python_project:
         python_type = "Python"
         py_confidence = 90
         py_frameworks = []
-
-        all_py_deps = (
-            _read_file_safe(requirements_path)
-            + _read_file_safe(pipfile_path)
-            + _read_file_safe(poetry_path)
-            + _read_file_safe(conda_path)
-            + _read_file_safe(os.path.join(project_dir, "main.py"))
-            + _read_file_safe(os.path.join(project_dir, "app.py"))
+        py_evidence = [_evidence("*.py", f"{len(python_files)} Python file(s)")] if python_files else []
+        py_evidence.extend(
+            _evidence(f) for f in ["requirements.txt", "Pipfile", "pyproject.toml", "environment.yml"] if index.exists(f)
         )
 
+        py_sources = [
+            (f, index.read(f))
+            for f in ["requirements.txt", "Pipfile", "pyproject.toml", "environment.yml", "main.py", "app.py"]
+        ]
+        all_py_deps = "".join(text for _, text in py_sources)
+
         framework_patterns = {
             "django": {"name": "Django", "score": 15, "files": ["manage.py", "wsgi.py", "asgi.py"]},
             "fastapi": {"name": "FastAPI", "score": 15, "imports": ["from fastapi import"]},
@@ -415,9 +823,10 @@ def detect_project_type(project_dir):
             if key in all_py_deps.lower():
                 py_frameworks.append(framework["name"])
                 py_confidence += framework["score"]
+                py_evidence.append(_evidence(_first_source(py_sources, key), f"mentions {key}"))
 
                 for f in framework.get("files", []):
-                    if _path_exists(os.path.join(project_dir, f)):
+                    if index.exists(f):
                         py_confidence += 5
 
                 for imp in framework.get("imports", []):
@@ -442,6 +851,7 @@ def detect_project_type(project_dir):
             if lib in all_py_deps.lower():
                 py_frameworks.append(name)
                 py_confidence += 5
+                py_evidence.append(_evidence(_first_source(py_sources, lib), f"mentions {lib}"))
 
         if py_frameworks:
             python_type = f"Python {' + '.join(py_frameworks)}"
@@ -449,24 +859,20 @@ def detect_project_type(project_dir):
         web_frameworks = {"Django", "FastAPI", "Flask", "Tornado", "Pyramid", "AIOHTTP", "Sanic"}
         category = "backend" if any(f in web_frameworks for f in py_frameworks) else "other"
 
-        detected_types.append({"type": python_type, "category": category, "confidence": min(py_confidence, 100)})
+        detected_types.append({"type": python_type, "category": category, "confidence": min(py_confidence, 100), "evidence": py_evidence})
 
-    gemfile_path = os.path.join(project_dir, "Gemfile")
-    try:
-        ruby_files = [f for f in os.listdir(project_dir) if f.endswith(".rb")]
-    except Exception:
-        ruby_files = []
+    ruby_files = index.names_matching("*.rb")
 
-    if _path_exists(gemfile_path) or len(ruby_files) > 0:
+    if index.exists("Gemfile") or len(ruby_files) > 0:
         ruby_type = "Ruby"
         rb_confidence = 90
         rb_frameworks = []
+        rb_evidence = [_evidence("Gemfile")] if index.exists("Gemfile") else []
+        if ruby_files:
+            rb_evidence.append(_evidence("*.rb", f"{len(ruby_files)} Ruby file(s)"))
 
-        all_gems = (
-            _read_file_safe(gemfile_path)
-            + _read_file_safe(os.path.join(project_dir, "Gemfile.lock"))
-            + _read_file_safe(os.path.join(project_dir, "config.ru"))
-        )
+        rb_sources = [(f, index.read(f)) for f in ["Gemfile", "Gemfile.lock", "config.ru"]]
+        all_gems = "".join(text for _, text in rb_sources)
 
         gem_patterns = {
             "rails": {
@@ -500,9 +906,10 @@ def detect_project_type(project_dir):
             if key in all_gems.lower():
                 rb_frameworks.append(gem_pattern["name"])
                 rb_confidence += gem_pattern["score"]
+                rb_evidence.append(_evidence(_first_source(rb_sources, key), f"mentions {key}"))
 
                 for f in gem_pattern.get("files", []):
-                    if _path_exists(os.path.join(project_dir, f)):
+                    if index.exists(f):
                         rb_confidence += 5
 
                 for req in gem_pattern.get("requires", []):
@@ -527,14 +934,21 @@ def detect_project_type(project_dir):
             if gem in all_gems.lower():
                 rb_frameworks.append(name)
                 rb_confidence += 5
+                rb_evidence.append(_evidence(_first_source(rb_sources, gem), f"mentions {gem}"))
 
         if rb_frameworks:
             ruby_type = f"Ruby {' + '.join(rb_frameworks)}"
 
-        detected_types.append({"type": ruby_type, "category": "backend", "confidence": min(rb_confidence, 100)})
+        detected_types.append({"type": ruby_type, "category": "backend", "confidence": min(rb_confidence, 100), "evidence": rb_evidence})
 
     if package_json and "react" in all_deps:
         react_type = "TypeScript React" if ("@types/react" in all_deps or "typescript" in all_deps) else "React"
+        react_evidence = [
+            _evidence("package.json", f"dependency {dep}")
+            for dep in ["react", "@types/react", "typescript", "next", "gatsby", "remix",
+                        "@mui/material", "@chakra-ui/react", "antd", "@tailwindcss/react"]
+            if dep in all_deps
+        ]
 
         if "next" in all_deps:
             react_type += " Next.js"
@@ -552,132 +966,105 @@ def detect_project_type(project_dir):
         elif "@tailwindcss/react" in all_deps:
             react_type += " Tailwind"
 
-        detected_types.append({"type": react_type, "category": "frontend", "confidence": 95})
+        detected_types.append({"type": react_type, "category": "frontend", "confidence": 95, "evidence": react_evidence})
 
-    has_client_dir = _is_dir(os.path.join(project_dir, "client"))
-    has_server_dir = _is_dir(os.path.join(project_dir, "server"))
-    has_apps_dir = _is_dir(os.path.join(project_dir, "apps"))
-    has_packages_dir = _is_dir(os.path.join(project_dir, "packages"))
-    has_services_dir = _is_dir(os.path.join(project_dir, "services"))
+    # Best first; the sort is stable so ties keep detection order
+    detected_types.sort(key=lambda x: x["confidence"], reverse=True)
+
+    has_client_dir = index.is_dir("client")
+    has_server_dir = index.is_dir("server")
+    has_apps_dir = index.is_dir("apps")
+    has_packages_dir = index.is_dir("packages")
+    has_services_dir = index.is_dir("services")
 
     # Detect microservices: a root directory with multiple service subdirectories,
     # each containing their own project files (no root package.json required)
-    root_has_no_package_json = not _path_exists(os.path.join(project_dir, "package.json"))
-
-    def _is_service_dir(path):
-        """Check if a directory looks like an independent service/app."""
-        service_indicators = [
-            "package.json", "go.mod", "requirements.txt", "pyproject.toml",
-            "Pipfile", "Cargo.toml", "pom.xml", "build.gradle", "composer.json",
-            "Gemfile", "mix.exs", "pubspec.yaml", "*.csproj"
-        ]
-        for indicator in service_indicators:
-            if "*" in indicator:
-                if glob.glob(os.path.join(path, indicator)):
-                    return True
-            elif _path_exists(os.path.join(path, indicator)):
-                return True
-        return False
+    root_has_no_package_json = not index.exists("package.json")
 
     # Check if services/ or a root with many subdirs is a microservices layout
     microservice_dirs = []
     if has_services_dir:
-        for svc in _list_dir_safe(os.path.join(project_dir, "services")):
-            svc_path = os.path.join(project_dir, "services", svc)
-            if _is_dir(svc_path) and _is_service_dir(svc_path):
-                microservice_dirs.append(("services", svc, svc_path))
+        for svc in index.subdirs("services"):
+            svc_index = index.child(f"services/{svc}")
+            if _is_service_dir(svc_index):
+                microservice_dirs.append(("services", svc, svc_index))
 
     # Also treat root-level subdirs as microservices if no root package.json
     # and multiple subdirs each have their own project manifest
     if root_has_no_package_json and not microservice_dirs:
-        try:
-            root_subdirs = [
-                d for d in os.listdir(project_dir)
-                if _is_dir(os.path.join(project_dir, d))
-                and not d.startswith(".")
-                and d not in {"node_modules", "dist", "build", ".git", "docs", "scripts", "config"}
-            ]
-        except Exception:
-            root_subdirs = []
+        root_subdirs = [d for d in index.subdirs() if not ROOT_SUBDIR_IGNORE.match(d)]
 
         candidate_services = [
             d for d in root_subdirs
-            if _is_service_dir(os.path.join(project_dir, d))
+            if _is_service_dir(index.child(d))
         ]
         if len(candidate_services) >= 2:
             for svc in candidate_services:
-                microservice_dirs.append(("root", svc, os.path.join(project_dir, svc)))
+                microservice_dirs.append(("root", svc, index.child(svc)))
 
     if microservice_dirs:
-        service_types = []
-        for _, svc_name, svc_path in microservice_dirs:
-            svc_type = detect_project_type(svc_path)
-            if svc_type != "Unknown":
-                service_types.append(f"{svc_name}: {svc_type}")
+        services = run.detect_all([
+            (sub_path(f"services/{svc}" if parent == "services" else svc), svc_index, "service")
+            for parent, svc, svc_index in microservice_dirs
+        ], depth)
+        service_types = [
+            f"{node.name}: {node.type}" for node in services if node.type != "Unknown"
+        ]
         if service_types:
-            return f"Microservices [{' | '.join(service_types)}]"
+            return node_for(f"Microservices [{' | '.join(service_types)}]", "microservices", services)
 
     if (has_client_dir and has_server_dir) or (has_apps_dir and has_packages_dir):
-        client_types = []
-        server_types = []
-        is_monorepo = False
-
+        # Fan out every sub-project at once; results are assembled in the original order
+        subprojects = []
         if has_client_dir and has_server_dir:
-            is_monorepo = True
-            client_result = detect_project_type(os.path.join(project_dir, "client"))
-            server_result = detect_project_type(os.path.join(project_dir, "server"))
-            client_types.append(client_result)
-            server_types.append(server_result)
-
+            subprojects.append((sub_path("client"), index.child("client"), "client"))
+            subprojects.append((sub_path("server"), index.child("server"), "server"))
         if has_apps_dir:
-            is_monorepo = True
-            for app in _list_dir_safe(os.path.join(project_dir, "apps")):
-                app_path = os.path.join(project_dir, "apps", app)
-                if not _is_dir(app_path):
-                    continue
-                app_type = detect_project_type(app_path)
-                app_lower = app_type.lower()
-                if any(k in app_lower for k in ["react", "vue", "angular", "front"]):
-                    client_types.append(app_type)
-                else:
-                    server_types.append(app_type)
-
+            subprojects.extend(
+                (sub_path(f"apps/{app}"), index.child(f"apps/{app}"), "app")
+                for app in index.subdirs("apps")
+            )
         if has_packages_dir:
-            is_monorepo = True
-            for pkg in _list_dir_safe(os.path.join(project_dir, "packages")):
-                pkg_path = os.path.join(project_dir, "packages", pkg)
-                if not _is_dir(pkg_path):
-                    continue
-                pkg_type = detect_project_type(pkg_path)
-                if pkg_type != "Unknown":
-                    pkg_lower = pkg_type.lower()
-                    if any(k in pkg_lower for k in ["react", "vue", "angular", "front"]):
-                        client_types.append(pkg_type)
-                    else:
-                        server_types.append(pkg_type)
-
-        if is_monorepo:
-            import re
-            def get_unique_terms(types_list):
-                words = []
-                for t in types_list:
-                    if t != "Unknown":
-                        words.extend(re.split(r'[\s+]+', t))
-                # Remove empty strings and preserve order using dict keys
-                unique_words = list(dict.fromkeys(w for w in words if w))
-                return " ".join(unique_words)
-
-            client_terms = get_unique_terms(client_types)
-            server_terms = get_unique_terms(server_types)
-
-            client_str = f"Client: {client_terms}" if client_terms else ""
-            server_str = f"Server: {server_terms}" if server_terms else ""
-
-            parts = [p for p in [client_str, server_str] if p]
-            return f"Monorepo [{' | '.join(parts)}]"
+            subprojects.extend(
+                (sub_path(f"packages/{pkg}"), index.child(f"packages/{pkg}"), "package")
+                for pkg in index.subdirs("packages")
+            )
+        children = run.detect_all(subprojects, depth)
+
+        client_types = []
+        server_types = []
+        for node in children:
+            if node.role == "client":
+                client_types.append(node.type)
+            elif node.role == "server":
+                server_types.append(node.type)
+            elif node.role == "package" and node.type == "Unknown":
+                continue
+            elif any(k in node.type.lower() for k in ["react", "vue", "angular", "front"]):
+                client_types.append(node.type)
+            else:
+                server_types.append(node.type)
+
+        import re
+        def get_unique_terms(types_list):
+            words = []
+            for t in types_list:
+                if t != "Unknown":
+                    words.extend(re.split(r'[\s+]+', t))
+            # Remove empty strings and preserve order using dict keys
+            unique_words = list(dict.fromkeys(w for w in words if w))
+            return " ".join(unique_words)
+
+        client_terms = get_unique_terms(client_types)
+        server_terms = get_unique_terms(server_types)
+
+        client_str = f"Client: {client_terms}" if client_terms else ""
+        server_str = f"Server: {server_terms}" if server_terms else ""
+
+        parts = [p for p in [client_str, server_str] if p]
+        return node_for(f"Monorepo [{' | '.join(parts)}]", "monorepo", children)
 
     if detected_types:
-        detected_types.sort(key=lambda x: x["confidence"], reverse=True)
-        return detected_types[0]["type"]
+        return node_for(detected_types[0]["type"])
 
-    return "Unknown"
+    return node_for("Unknown")
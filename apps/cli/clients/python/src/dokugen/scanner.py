@@ -0,0 +1,172 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dokugen.ignore import GITIGNORE_FILE, IgnoreStack
+
+MAX_FILE_SIZE = 150 * 1024
+
+
+def default_workers():
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class Scanner:
+    """Parallel os.scandir walker.
+
+    Every directory is listed exactly once on a thread pool; the DirEntry
+    type and stat caches are reused so no file is stat'ed twice.
+
+    With record=True the walk also keeps what it saw for later stages:
+    listings maps each listed directory's absolute path to
+    [(name, is_dir, is_symlink), ...] in scandir order, and stats maps
+    each returned file to (size, mtime_ns, inode).
+    """
+
+    def __init__(self, root_dir, ignore_dirs=(), ignore_file=None, ignore_tree=None,
+                 max_file_size=MAX_FILE_SIZE, max_workers=None, record=False):
+        self.root_dir = root_dir
+        self.ignore_dirs = ignore_dirs
+        self.ignore_file = ignore_file
+        self.ignore_tree = ignore_tree
+        self.max_file_size = max_file_size
+        self.max_workers = max_workers or default_workers()
+        self.record = record
+        self.listings = {}
+        self.stats = {}
+
+    def _scan_dir(self, abs_dir, rel_dir, ignores):
+        files = []
+        subdirs = []
+        rows = [] if self.record else None
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = list(it)
+        except OSError:
+            return rel_dir, files, subdirs
+
+        if self.ignore_tree is not None:
+            ignores = self.ignore_tree.enter(ignores, rel_dir, {e.name for e in entries})
+
+        for entry in entries:
+            name = entry.name
+            rel_path = os.path.join(rel_dir, name) if rel_dir else name
+
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if rows is not None:
+                rows.append((name, is_dir, entry.is_symlink()))
+
+            if is_dir:
+                # Same semantics as os.walk(followlinks=False): symlinked dirs are never entered
+                if name in self.ignore_dirs or entry.is_symlink():
+                    continue
+                # Prune the whole subtree before descending into it
+                if ignores is not None and ignores.is_ignored(rel_path, is_dir=True):
+                    continue
+                subdirs.append((entry.path, rel_path, ignores))
+                continue
+
+            if self.ignore_file and self.ignore_file(name):
+                continue
+
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if st.st_size >= self.max_file_size:
+                continue
+
+            if ignores is not None and ignores.is_ignored(rel_path):
+                continue
+
+            files.append(rel_path)
+            if self.record:
+                self.stats[rel_path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+
+        if rows is not None:
+            self.listings[abs_dir] = rows
+        return rel_dir, files, subdirs
+
+    def walk(self):
+        """Yield (rel_dir, files, subdirs) for each directory as soon as it has been listed."""
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        root_ignores = self.ignore_tree.root_stack() if self.ignore_tree is not None else None
+        pending = {pool.submit(self._scan_dir, self.root_dir, "", root_ignores)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rel_dir, files, subdirs = future.result()
+                    for abs_sub, rel_sub, ignores in subdirs:
+                        pending.add(pool.submit(self._scan_dir, abs_sub, rel_sub, ignores))
+                    yield rel_dir, files, [s[1] for s in subdirs]
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def iter_files(self):
+        """Streaming mode: yield relative file paths in completion order."""
+        for _, files, _ in self.walk():
+            yield from files
+
+    def scan(self):
+        """Return relative file paths in the same top-down order as os.walk."""
+        tree = {}
+        for rel_dir, files, subdirs in self.walk():
+            tree[rel_dir] = (files, subdirs)
+
+        found_files = []
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            files, subdirs = tree.get(rel_dir, ([], []))
+            found_files.extend(files)
+            stack.extend(reversed(subdirs))
+        return found_files
+
+    def filter_entries(self, entries):
+        """Apply the walker's filters to pre-enumerated entries (e.g. from the git index).
+
+        Entries need .path (relative, os.sep separated) and .size; .gitignore
+        layers are taken from the entries themselves, so nothing is walked.
+        """
+        gitignore_dirs = {
+            os.path.dirname(e.path) for e in entries if os.path.basename(e.path) == GITIGNORE_FILE
+        }
+        tree = self.ignore_tree
+        stacks = {}
+
+        def stack_for(rel_dir):
+            # None marks a pruned directory (itself or one of its parents)
+            if rel_dir not in stacks:
+                names = (GITIGNORE_FILE,) if rel_dir in gitignore_dirs else ()
+                if not rel_dir:
+                    stack = tree.enter(tree.root_stack(), rel_dir, names) if tree else IgnoreStack()
+                else:
+                    parent = stack_for(os.path.dirname(rel_dir))
+                    if (parent is None or os.path.basename(rel_dir) in self.ignore_dirs
+                            or parent.is_ignored(rel_dir, is_dir=True)):
+                        stack = None
+                    else:
+                        stack = tree.enter(parent, rel_dir, names) if tree else parent
+                stacks[rel_dir] = stack
+            return stacks[rel_dir]
+
+        found_files = []
+        for entry in entries:
+            rel_dir, name = os.path.split(entry.path)
+            if self.ignore_file and self.ignore_file(name):
+                continue
+            if entry.size >= self.max_file_size:
+                continue
+            stack = stack_for(rel_dir)
+            if stack is None:
+                continue
+            if stack.is_ignored(entry.path):
+                continue
+            found_files.append(entry.path)
+        return found_files
@@ -0,0 +1,198 @@
+import ast
+import os
+import re
+
+MAX_LINE_LENGTH = 200
+MAX_ASSIGNMENT_LENGTH = 200
+
+PYTHON_MARKER = "# dokugen: skeleton, function bodies omitted"
+C_STYLE_MARKER = "// dokugen: skeleton, function bodies omitted"
+
+
+def _clip(line):
+    line = line.rstrip()
+    return line if len(line) <= MAX_LINE_LENGTH else line[:MAX_LINE_LENGTH] + " ..."
+
+
+# Python
+
+def _docstring_node(node):
+    body = getattr(node, "body", None)
+    if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        return body[0]
+    return None
+
+
+def _segment(lines, node):
+    return "\n".join(lines[node.lineno - 1:node.end_lineno])
+
+
+def _header(lines, node):
+    """Decorators plus the def/class line(s), without the body."""
+    start = min([d.lineno for d in getattr(node, "decorator_list", [])] + [node.lineno])
+    first = node.body[0]
+    if first.lineno == node.lineno:
+        return lines[start - 1:node.lineno - 1] + [lines[node.lineno - 1][:first.col_offset].rstrip()]
+    # Stop before the first body statement (or a comment line directly above it)
+    end = first.lineno - 1
+    while end > node.lineno and lines[end - 1].strip().startswith("#"):
+        end -= 1
+    return lines[start - 1:end]
+
+
+def _python_block(lines, node, out, indent):
+    out.extend(_header(lines, node))
+    doc = _docstring_node(node)
+    if doc is not None:
+        out.append(_segment(lines, doc))
+
+    if isinstance(node, ast.ClassDef):
+        emitted = False
+        for child in node.body:
+            if child is doc:
+                continue
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                _python_block(lines, child, out, indent + "    ")
+                emitted = True
+            elif isinstance(child, (ast.Assign, ast.AnnAssign)):
+                out.append(_assignment(lines, child, indent + "    "))
+                emitted = True
+        if not emitted:
+            out.append(f"{indent}    ...")
+    else:
+        out.append(f"{indent}    ...")
+
+
+def _assignment(lines, node, indent=""):
+    text = _segment(lines, node)
+    if len(text) <= MAX_ASSIGNMENT_LENGTH:
+        return text
+    target = node.targets[0] if isinstance(node, ast.Assign) else node.target
+    name = ast.get_source_segment("\n".join(lines), target) or "..."
+    return f"{indent}{name} = ..."
+
+
+def skeletonize_python(content):
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    lines = content.splitlines()
+    out = [PYTHON_MARKER]
+    doc = _docstring_node(tree)
+    if doc is not None:
+        out.append(_segment(lines, doc))
+
+    for node in tree.body:
+        if node is doc:
+            continue
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            out.append(_segment(lines, node))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            _python_block(lines, node, out, "")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            out.append(_assignment(lines, node))
+        elif isinstance(node, ast.If):
+            # Keep `if __name__ == "__main__":` style guards visible
+            out.append(lines[node.lineno - 1].rstrip())
+            out.append("    ...")
+    return "\n".join(out)
+
+
+# Line-oriented languages (JS/TS, Go, Rust)
+
+class _LineRules:
+    def __init__(self, keep, doc, block_start=None, marker=C_STYLE_MARKER, flags=0):
+        self.keep = re.compile(keep, flags)
+        self.doc = re.compile(doc)
+        # Declarations whose whole body is API surface (structs, interfaces, import blocks)
+        self.block_start = re.compile(block_start) if block_start else None
+        self.marker = marker
+
+
+JS_RULES = _LineRules(
+    keep=r"""^\s*(?:
+        import\b | export\b | module\.exports\b | (?:const|let|var)\s+\w+\s*=\s*require\(
+        | (?:async\s+)?function\b
+        | (?:abstract\s+)?class\b
+        | (?:declare\s+)?(?:interface|type|enum|namespace)\s+\w+
+        | (?:const|let|var)\s+\w+\s*(?::[^=]+)?=\s*(?:async\s+)?(?:\([^)]*\)|\w+)\s*(?::\s*[^=]+)?=>
+        | @\w+
+        | (?:public|private|protected|static|readonly|async|get|set|\s)*(?!(?:if|for|while|switch|catch|return|function)\b)\w+\s*\([^;]*\)\s*(?::\s*[^{;]+)?\{\s*$
+        | \w+\.(?:get|post|put|patch|delete|use|all|route|options|head)\s*\(
+    )""",
+    doc=r"^\s*(?:/\*\*|\*|\*/|//)",
+    flags=re.VERBOSE,
+)
+
+GO_RULES = _LineRules(
+    keep=r"^(?:package\s|import\s|func\s|type\s|var\s|const\s)|^\s*\w+\.(?:GET|POST|PUT|PATCH|DELETE|Handle|HandleFunc|Group)\(",
+    doc=r"^\s*//",
+    block_start=r"^(?:import\s*\(|const\s*\(|var\s*\(|type\s+\w+\s+(?:struct|interface)\s*\{)",
+)
+
+RUST_RULES = _LineRules(
+    keep=r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:use|mod|fn|async\s+fn|const\s+fn|unsafe\s+fn|struct|enum|trait|impl|type|const|static|macro_rules!)\b|^\s*#!?\[",
+    doc=r"^\s*//[/!]",
+    block_start=r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:struct|enum)\s+\w+[^;{]*\{\s*$",
+)
+
+
+def _skeletonize_lines(content, rules):
+    out = [rules.marker]
+    doc_buffer = []
+    in_block = False
+    block_depth = 0
+
+    for line in content.splitlines():
+        if in_block:
+            out.append(_clip(line))
+            block_depth += line.count("{") + line.count("(") - line.count("}") - line.count(")")
+            if block_depth <= 0:
+                in_block = False
+            continue
+
+        if rules.doc.match(line):
+            doc_buffer.append(_clip(line))
+            continue
+
+        if rules.block_start and rules.block_start.match(line):
+            out.extend(doc_buffer)
+            out.append(_clip(line))
+            block_depth = line.count("{") + line.count("(") - line.count("}") - line.count(")")
+            in_block = block_depth > 0
+        elif rules.keep.match(line):
+            out.extend(doc_buffer)
+            out.append(_clip(line))
+        doc_buffer = []
+
+    return "\n".join(out)
+
+
+SKELETONIZERS = {
+    ".py": skeletonize_python,
+    ".pyi": skeletonize_python,
+    ".js": lambda c: _skeletonize_lines(c, JS_RULES),
+    ".jsx": lambda c: _skeletonize_lines(c, JS_RULES),
+    ".mjs": lambda c: _skeletonize_lines(c, JS_RULES),
+    ".cjs": lambda c: _skeletonize_lines(c, JS_RULES),
+    ".ts": lambda c: _skeletonize_lines(c, JS_RULES),
+    ".tsx": lambda c: _skeletonize_lines(c, JS_RULES),
+    ".mts": lambda c: _skeletonize_lines(c, JS_RULES),
+    ".go": lambda c: _skeletonize_lines(c, GO_RULES),
+    ".rs": lambda c: _skeletonize_lines(c, RUST_RULES),
+}
+
+
+def can_skeletonize(file):
+    return os.path.splitext(file)[1] in SKELETONIZERS
+
+
+def skeletonize(file, content):
+    """Reduce a source file to imports, signatures, docstrings and routes; None if unsupported."""
+    skeletonizer = SKELETONIZERS.get(os.path.splitext(file)[1])
+    if skeletonizer is None:
+        return None
+    return skeletonizer(content)
@@ -0,0 +1,43 @@
+import os
+
+from dokugen.payload import read_snippet
+from dokugen.project_detect import ProjectIndex, decode_text
+
+
+class ProjectSnapshot:
+    """What one walk of a project learned, shared by every later stage.
+
+    Holds the scanned file list, each file's (size, mtime_ns, inode) and
+    the directory listings the walk made; detection runs on an index
+    seeded with those listings, and manifests it reads are kept so the
+    payload does not read them a second time.
+    """
+
+    def __init__(self, root, files, stats=None, listings=None):
+        self.root = root
+        self.files = files
+        self.stats = stats or {}
+        self.listings = listings or {}
+        self.index = ProjectIndex(root, scanned=self.listings)
+
+    @classmethod
+    def walk(cls, scanner):
+        """Snapshot from a Scanner(record=True) walk."""
+        files = scanner.scan()
+        return cls(scanner.root_dir, files, scanner.stats, scanner.listings)
+
+    def _abspath(self, rel_path):
+        if rel_path in ("", "."):
+            return self.root
+        return os.path.join(self.root, *rel_path.split("/"))
+
+    def stat(self, rel_path):
+        """(size, mtime_ns, inode) recorded by the walk, or None if it was not scanned."""
+        return self.stats.get(rel_path.replace("/", os.sep))
+
+    def read_snippet(self, rel_path):
+        """payload.read_snippet, served from memory for files detection already read."""
+        data = self.index.held_bytes(self._abspath(rel_path.replace(os.sep, "/")))
+        if data is None:
+            return read_snippet(self.root, rel_path)
+        return decode_text(data, "replace"), len(data)
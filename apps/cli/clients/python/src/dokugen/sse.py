@@ -0,0 +1,106 @@
+import codecs
+import re
+
+# A line ends at CRLF, CR or LF; str.splitlines would also split on \x0b, \x1c, U+2028...
+_LINE_END = re.compile(r"\r\n|\r|\n")
+
+
+class Event:
+    """One dispatched server-sent event. data joins the event's data: lines with newlines."""
+
+    __slots__ = ("type", "data", "id")
+
+    def __init__(self, type, data, id):
+        self.type = type
+        self.data = data
+        self.id = id
+
+    def __repr__(self):
+        return f"Event(type={self.type!r}, data={self.data!r}, id={self.id!r})"
+
+
+class SSEDecoder:
+    """Incremental text/event-stream decoder, following the WHATWG EventSource parsing rules.
+
+    feed() takes bytes exactly as they arrive, split anywhere (mid-line,
+    mid-CRLF, mid-UTF-8 sequence), and returns the events they complete.
+    Comment lines (":" heartbeats) are skipped, multi-line data is joined
+    with "\\n", id: sets last_event_id for this and later events, and
+    retry: is kept in retry. An event still open at the end of the stream
+    is discarded, as EventSource does.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._buffer = ""
+        self._started = False
+        self._type = ""
+        self._data = []
+        self.last_event_id = ""
+        self.retry = None
+
+    def feed(self, chunk):
+        text = self._buffer + self._decoder.decode(chunk)
+        if not self._started and text:
+            self._started = True
+            if text[0] == "\ufeff":
+                text = text[1:]
+
+        # A trailing CR may be the first half of a CRLF split across chunks
+        carry = ""
+        if text.endswith("\r"):
+            text, carry = text[:-1], "\r"
+        lines = _LINE_END.split(text) if "\r" in text else text.split("\n")
+        self._buffer = lines.pop() + carry
+        return self._lines(lines)
+
+    def close(self):
+        """Finish the stream; returns the events completed by its last bytes."""
+        text = self._buffer + self._decoder.decode(b"", final=True)
+        self._buffer = ""
+        # A held-back CR ends its line now; an unterminated last line goes with the open event
+        lines = _LINE_END.split(text)
+        lines.pop()
+        events = self._lines(lines)
+        self._type = ""
+        self._data = []
+        return events
+
+    def _lines(self, lines):
+        # Runs once per line of the stream, so data lines and dispatch stay inline
+        events = []
+        data = self._data
+        for line in lines:
+            if not line:
+                if data:
+                    events.append(Event(self._type or "message", "\n".join(data), self.last_event_id))
+                    data = self._data = []
+                self._type = ""
+            elif line.startswith("data:"):
+                data.append(line[6:] if line[5:6] == " " else line[5:])
+            elif line[0] != ":":
+                self._field(line)
+        return events
+
+    def _field(self, line):
+        field, sep, value = line.partition(":")
+        if sep and value[:1] == " ":
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._type = value
+        elif field == "id":
+            if "\0" not in value:
+                self.last_event_id = value
+        elif field == "retry":
+            if value.isascii() and value.isdigit():
+                self.retry = int(value)
+
+
+def iter_events(chunks, decoder=None):
+    """Yield the events in an iterable of byte chunks, e.g. response.iter_content(chunk_size=None)."""
+    decoder = decoder or SSEDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
@@ -0,0 +1,128 @@
+import gzip
+import hashlib
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dokugen import network
+
+CHUNKED_UPLOAD_FEATURE = "chunked-upload"
+# The generate request may be metadata JSON plus raw compressed code instead of base64 in JSON
+BINARY_UPLOAD_FEATURE = "binary-upload"
+
+# Less code than this goes inline with the generate request; chunking costs extra round trips
+CHUNKED_UPLOAD_MIN_BYTES = 512 * 1024
+
+# A chunk ends after a piece whose CRC is 0 mod this, so chunk boundaries follow
+# content rather than offsets and an edited file only re-chunks its neighbourhood
+CHUNK_BOUNDARY_PIECES = 8
+MAX_CHUNK_CHARS = 1024 * 1024
+
+# Hashes per "which chunks are missing" query; uploads go out between queries
+MISSING_BATCH = 256
+UPLOAD_WORKERS = 8
+# Chunks read and hashed ahead of the uploads before the reader waits
+MAX_IN_FLIGHT = UPLOAD_WORKERS * 4
+UPLOAD_TIMEOUT = 60
+
+
+class ChunkUploadError(Exception):
+    pass
+
+
+class Chunk:
+    """A slice of the fullCode text, addressed by the SHA-256 of its UTF-8 bytes."""
+
+    __slots__ = ("hash", "size", "_data")
+
+    def __init__(self, text):
+        self._data = text.encode("utf-8")
+        self.hash = hashlib.sha256(self._data).hexdigest()
+        self.size = len(self._data)
+
+    def compressed(self):
+        return gzip.compress(self._data, 6)
+
+
+def iter_chunks(pieces, boundary=CHUNK_BOUNDARY_PIECES, max_chars=MAX_CHUNK_CHARS):
+    """Group text pieces (e.g. one per file) into chunks; concatenated, they give back the text."""
+    parts, size = [], 0
+    for text in pieces:
+        while size + len(text) > max_chars:
+            cut = max_chars - size
+            parts.append(text[:cut])
+            yield Chunk("".join(parts))
+            parts, size = [], 0
+            text = text[cut:]
+        if not text:
+            continue
+        parts.append(text)
+        size += len(text)
+        if zlib.crc32(text.encode("utf-8")) % boundary == 0:
+            yield Chunk("".join(parts))
+            parts, size = [], 0
+    if parts:
+        yield Chunk("".join(parts))
+
+
+def find_missing(backend_domain, hashes):
+    with network.post(f"{backend_domain}/api/chunks/missing", json={"hashes": hashes}, timeout=UPLOAD_TIMEOUT) as response:
+        if response.status_code != 200:
+            raise ChunkUploadError(f"Error {response.status_code} checking chunks: {response.text}")
+        return set(response.json().get("missing", []))
+
+
+def put_chunk(backend_domain, chunk):
+    """Upload one gzipped chunk; returns the bytes sent. The server checks the hash."""
+    data = chunk.compressed()
+    with network.request(
+        "PUT",
+        f"{backend_domain}/api/chunks/{chunk.hash}",
+        data=data,
+        headers={"Content-Type": "application/octet-stream"},
+        timeout=UPLOAD_TIMEOUT,
+    ) as response:
+        if response.status_code not in (200, 201, 204):
+            raise ChunkUploadError(f"Error {response.status_code} uploading chunk {chunk.hash[:12]}: {response.text}")
+    return len(data)
+
+
+def upload_chunks(backend_domain, pieces):
+    """Upload the chunks of pieces that the backend doesn't already hold, in parallel.
+
+    Returns (manifest, stats): the chunk hashes in order, which the generate
+    request sends instead of the code, and chunk/upload counts. Chunks the
+    server kept from an earlier, interrupted run are not sent again.
+    """
+    manifest = []
+    stats = {"chunks": 0, "uploaded": 0, "bytes": 0}
+    batch = []
+    in_flight = deque()
+
+    def wait_one():
+        stats["bytes"] += in_flight.popleft().result()
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+        def flush():
+            missing = find_missing(backend_domain, list(dict.fromkeys(c.hash for c in batch)))
+            for chunk in batch:
+                if chunk.hash in missing:
+                    missing.discard(chunk.hash)
+                    while len(in_flight) >= MAX_IN_FLIGHT:
+                        wait_one()
+                    in_flight.append(pool.submit(put_chunk, backend_domain, chunk))
+                    stats["uploaded"] += 1
+            batch.clear()
+
+        for chunk in iter_chunks(pieces):
+            manifest.append(chunk.hash)
+            batch.append(chunk)
+            if len(batch) >= MISSING_BATCH:
+                flush()
+        if batch:
+            flush()
+        while in_flight:
+            wait_one()
+
+    stats["chunks"] = len(manifest)
+    return manifest, stats
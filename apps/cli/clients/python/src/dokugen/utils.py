@@ -5,24 +5,28 @@ import hashlib
 import json
 import os
 import platform
+import queue
 import subprocess
 import sys
 import time
 import threading
-from pathlib import Path
 
-import pathspec
-import requests
 from rich.console import Console
 from rich.live import Live
 from rich.spinner import Spinner
 
+from dokugen import git_index, hashing, network, payload, project_detect
+from dokugen.ignore import IgnoreMatcher, IgnoreTree
+from dokugen.scanner import Scanner
+from dokugen.snapshot import ProjectSnapshot
+
 console = Console()
 readme_backup = None
 current_readme_path = ""
 
 PACKAGE_NAME = "dokugen"
 PYPI_URL = f"https://pypi.org/pypi/{PACKAGE_NAME}/json"
+DOKUGEN_HOME = os.path.expanduser("~/.dokugen")
 
 # Sentinel: prevents double check_and_update when interactive menu + subcommand both call it
 _update_checked = False
@@ -116,85 +120,155 @@ def is_newer_version(latest, current):
         return False
 
 
+UPDATE_CHECK_PATH = os.path.join(DOKUGEN_HOME, "update-check.json")
+UPDATE_CHECK_TTL = 24 * 60 * 60
+UPDATE_CHECK_TIMEOUT = 3
+
+
+def update_check_disabled():
+    """Opt out with DOKUGEN_NO_UPDATE_CHECK=1, on CI, or "updateCheck": false in ~/.dokugen/config.json."""
+    if os.environ.get("DOKUGEN_NO_UPDATE_CHECK", "").lower() not in ("", "0", "false", "no"):
+        return True
+    if os.environ.get("CI", "").lower() not in ("", "0", "false"):
+        return True
+    return load_profile().get("updateCheck") is False
+
+
+def load_update_check():
+    try:
+        with open(UPDATE_CHECK_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def refresh_update_check():
+    """Fetch the latest release from PyPI and record it for the next invocation."""
+    state = load_update_check()
+    state["checkedAt"] = time.time()
+    try:
+        with network.get(PYPI_URL, timeout=UPDATE_CHECK_TIMEOUT) as response:
+            if response.status_code == 200:
+                state["latestVersion"] = response.json()["info"]["version"]
+    except Exception:
+        pass
+    write_json_atomic(UPDATE_CHECK_PATH, state)
+
+
+def _spawn_detached(code):
+    # A detached interpreter outlives this command, so short commands still refresh their caches
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    try:
+        subprocess.Popen([sys.executable, "-c", code], **kwargs)
+    except Exception:
+        pass
+
+
+def _install_update(latest_version):
+    with create_spinner(f"Updating {PACKAGE_NAME}..."):
+        try:
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "uv",
+                    "pip",
+                    "install",
+                    "--upgrade",
+                    f"{PACKAGE_NAME}=={latest_version}",
+                ],
+                capture_output=True,
+                timeout=60,
+                check=True,
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            try:
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "pip",
+                        "install",
+                        "--upgrade",
+                        f"{PACKAGE_NAME}=={latest_version}",
+                    ],
+                    capture_output=True,
+                    timeout=60,
+                    check=True,
+                )
+            except Exception:
+                console.print(
+                    f"[yellow]Auto-update failed. Please run: pip install --upgrade {PACKAGE_NAME}[/yellow]"
+                )
+                return
+
+    console.print(f"[green]Successfully updated to v{latest_version}![/green]")
+    console.print(
+        "[yellow]Please re-run your command to use the new version.\n[/yellow]"
+    )
+    sys.exit(0)
+
+
 def check_and_update():
+    """Offer an upgrade found by a previous run; never waits on PyPI.
+
+    The latest version is cached in ~/.dokugen/update-check.json and
+    refreshed by a detached process once the entry is older than a day.
+    """
     global _update_checked
     if _update_checked:
         return
     _update_checked = True
     try:
+        if update_check_disabled():
+            return
         current_version = get_installed_version()
         if not current_version:
             return
 
-        with requests.get(PYPI_URL, timeout=3) as response:
-            if response.status_code != 200:
-                return
-            latest_version = response.json()["info"]["version"]
+        state = load_update_check()
+        if time.time() - state.get("checkedAt", 0) >= UPDATE_CHECK_TTL:
+            _spawn_detached("from dokugen import utils; utils.refresh_update_check()")
 
-        if is_newer_version(latest_version, current_version):
-            console.print(
-                f"\n[cyan]New version available: {latest_version} (current: {current_version})[/cyan]"
-            )
+        latest_version = state.get("latestVersion")
+        if not is_newer_version(latest_version, current_version):
+            return
 
-            with create_spinner(f"Updating {PACKAGE_NAME}..."):
-                try:
-                    subprocess.run(
-                        [
-                            sys.executable,
-                            "-m",
-                            "uv",
-                            "pip",
-                            "install",
-                            "--upgrade",
-                            f"{PACKAGE_NAME}=={latest_version}",
-                        ],
-                        capture_output=True,
-                        timeout=60,
-                        check=True,
-                    )
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    try:
-                        subprocess.run(
-                            [
-                                sys.executable,
-                                "-m",
-                                "pip",
-                                "install",
-                                "--upgrade",
-                                f"{PACKAGE_NAME}=={latest_version}",
-                            ],
-                            capture_output=True,
-                            timeout=60,
-                            check=True,
-                        )
-                    except Exception:
-                        console.print(
-                            f"[yellow]Auto-update failed. Please run: pip install --upgrade {PACKAGE_NAME}[/yellow]"
-                        )
-                        return
-
-            console.print(f"[green]Successfully updated to v{latest_version}![/green]")
-            console.print(
-                "[yellow]Please re-run your command to use the new version.\n[/yellow]"
-            )
-            sys.exit(0)
+        console.print(
+            f"\n[cyan]New version available: {latest_version} (current: {current_version})[/cyan]"
+        )
+        if not sys.stdin.isatty() or state.get("dismissedVersion") == latest_version:
+            console.print(f"[cyan]Run: pip install --upgrade {PACKAGE_NAME}[/cyan]\n")
+            return
+
+        import questionary
+        if questionary.confirm("Update now?", default=True).ask():
+            _install_update(latest_version)
+        else:
+            # Don't ask again for this release
+            state["dismissedVersion"] = latest_version
+            write_json_atomic(UPDATE_CHECK_PATH, state)
     except Exception:
         return
 
 
-def get_user_info():
+def get_user_info(project_dir=None):
     git_name = ""
     git_email = ""
     try:
         git_name = subprocess.check_output(
-            ["git", "config", "--get", "user.name"], encoding="utf-8"
+            ["git", "config", "--get", "user.name"], encoding="utf-8", cwd=project_dir
         ).strip()
     except Exception:
         pass
 
     try:
         git_email = subprocess.check_output(
-            ["git", "config", "--get", "user.email"], encoding="utf-8"
+            ["git", "config", "--get", "user.email"], encoding="utf-8", cwd=project_dir
         ).strip()
     except Exception:
         pass
@@ -226,20 +300,31 @@ def get_user_info():
     }
 
 
-def check_internet_connection():
-    try:
-        with requests.get("https://www.google.com", timeout=5, stream=True) as r:
-            return True
-    except Exception:
-        return False
+def print_connection_error():
+    raw_username = get_user_info().get("username", "")
+    username = "".join([i for i in raw_username if not i.isdigit()]) if raw_username else ""
+    console.print(f"[red]Opps... {username} kindly check your device or pc internet connection and try again.[/red]")
 
 
-def compress_data(data):
-    compressed = gzip.compress(data.encode("utf-8"))
+def compress_data(data, codec=None):
+    """base64 of data compressed with codec (a payload.Codec), gzip by default."""
+    compressed = codec.compress(data) if codec is not None else gzip.compress(data.encode("utf-8"))
     return base64.b64encode(compressed).decode("utf-8")
 
 
-DOKUGEN_HOME = os.path.expanduser("~/.dokugen")
+def write_json_atomic(path, data):
+    """Write compact JSON via a temp file so concurrent readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 def get_project_key(project_dir):
     abs_path = os.path.abspath(project_dir)
@@ -270,19 +355,24 @@ def save_profile(profile):
     except Exception:
         pass
 
+def write_readme_backup(project_dir, content):
+    """Keep the previous README on disk for `dokugen revert`."""
+    backup_file = get_dokugen_backup_path(project_dir)
+    try:
+        os.makedirs(os.path.dirname(backup_file), exist_ok=True)
+        with open(backup_file, "w", encoding="utf-8") as bf:
+            bf.write(content)
+    except Exception:
+        pass
+
+
 def backup_readme(readme_path):
     global readme_backup, current_readme_path
     if os.path.exists(readme_path):
         current_readme_path = readme_path
         with open(readme_path, "r", encoding="utf-8", errors="ignore") as f:
             readme_backup = f.read()
-        backup_file = get_dokugen_backup_path(os.path.dirname(readme_path))
-        try:
-            os.makedirs(os.path.dirname(backup_file), exist_ok=True)
-            with open(backup_file, "w", encoding="utf-8") as bf:
-                bf.write(readme_backup)
-        except Exception:
-            pass
+        write_readme_backup(os.path.dirname(readme_path), readme_backup)
         console.print(
             f"[green][{datetime.datetime.now().isoformat()}] Current README backed up in memory[/green]"
         )
@@ -329,22 +419,37 @@ def revert_readme_from_disk(project_dir=None):
         return None, str(e)
 
 
-def get_git_repo_url():
+def get_git_repo_url(project_dir=None):
     try:
         url = subprocess.check_output(
-            ["git", "config", "--get", "remote.origin.url"], encoding="utf-8"
+            ["git", "config", "--get", "remote.origin.url"], encoding="utf-8", cwd=project_dir
         ).strip()
         return url if url else None
     except Exception:
         return None
 
 
-def is_git_repository():
+def get_recently_changed_files(project_dir, commits=20):
+    """Paths (relative to project_dir) touched by the last few commits."""
+    try:
+        out = subprocess.check_output(
+            ["git", "log", f"-n{commits}", "--name-only", "--pretty=format:", "--relative"],
+            cwd=project_dir,
+            encoding="utf-8",
+            stderr=subprocess.DEVNULL,
+        )
+    except Exception:
+        return set()
+    return {os.path.normpath(line) for line in out.splitlines() if line.strip()}
+
+
+def is_git_repository(project_dir=None):
     try:
         subprocess.run(
             ["git", "rev-parse", "--is-inside-work-tree"],
             capture_output=True,
             check=True,
+            cwd=project_dir,
         )
         return True
     except Exception:
@@ -352,14 +457,70 @@ def is_git_repository():
 
 
 def get_file_hash(file_path):
-    try:
-        hasher = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
-        return hasher.hexdigest()
-    except Exception:
-        return ""
+    return hashing.hash_file(file_path, "sha256")
+
+
+CACHE_VERSION = "2.0"
+
+
+def get_file_fingerprint(file_path):
+    st = os.stat(file_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+
+def cached_file_hash(entry):
+    # Cache v1 stored bare hashes, v2 stores {size, mtime_ns, inode, hash}
+    if isinstance(entry, dict):
+        return entry.get("hash")
+    return entry
+
+
+def cache_hash_algorithm(cache):
+    # v1 caches predate the field and were always SHA-256
+    return (cache or {}).get("hashAlgorithm", "sha256")
+
+
+def fingerprint_files(project_dir, project_files, cached_files=None, algorithm=hashing.DEFAULT_ALGORITHM, snapshot=None):
+    """Build {path: {size, mtime_ns, inode, hash}} for project_files.
+
+    A file is only re-hashed when its stat fingerprint differs from the
+    entry in cached_files (which must use the same algorithm); changed
+    files are hashed in parallel. Stats already taken by a ProjectSnapshot
+    walk are reused instead of stat'ing again.
+    """
+    cached_files = cached_files or {}
+    known_stats = snapshot.stats if snapshot is not None else {}
+    entries = {}
+    to_hash = []
+    for f in project_files:
+        known = known_stats.get(f)
+        try:
+            if known is not None:
+                entry = {"size": known[0], "mtime_ns": known[1], "inode": known[2]}
+            else:
+                entry = get_file_fingerprint(os.path.join(project_dir, f))
+        except OSError:
+            entries[f] = {"size": None, "mtime_ns": None, "inode": None, "hash": ""}
+            continue
+
+        cached = cached_files.get(f)
+        if (
+            isinstance(cached, dict)
+            and cached.get("hash")
+            and cached.get("size") == entry["size"]
+            and cached.get("mtime_ns") == entry["mtime_ns"]
+            and cached.get("inode") == entry["inode"]
+        ):
+            entry["hash"] = cached["hash"]
+        else:
+            to_hash.append(f)
+        entries[f] = entry
+
+    if to_hash:
+        digests = hashing.hash_files([os.path.join(project_dir, f) for f in to_hash], algorithm)
+        for f, digest in zip(to_hash, digests):
+            entries[f]["hash"] = digest
+    return entries
 
 
 def load_cache(project_dir):
@@ -374,353 +535,519 @@ def load_cache(project_dir):
 
 
 def save_cache(project_dir, cache):
-    cache_path = get_dokugen_cache_path(project_dir)
-    try:
-        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-        with open(cache_path, "w", encoding="utf-8") as f:
-            json.dump(cache, f, indent=2)
-    except Exception:
-        pass
+    """Write the given top-level sections, keeping the others (e.g. "detection") intact."""
+    merged = load_cache(project_dir) or {}
+    merged.update(cache)
+    write_json_atomic(get_dokugen_cache_path(project_dir), merged)
+
+
+def detect_project_tree_cached(project_dir, snapshot=None):
+    """detect_project_tree, skipped when nothing it consulted last time has changed.
+
+    The result is stored in the project's cache file with a fingerprint of
+    the paths detection looked up and the manifests it read. Given the
+    ProjectSnapshot of a scan, both the check and detection itself reuse
+    what the walk already listed and stat'ed.
+    """
+    entry = (load_cache(project_dir) or {}).get("detection")
+    if (
+        isinstance(entry, dict)
+        and entry.get("detectorVersion") == project_detect.DETECTOR_VERSION
+        and project_detect.fingerprint_matches(project_dir, entry.get("fingerprint"), snapshot)
+    ):
+        try:
+            return project_detect.DetectionNode.from_dict(entry["tree"])
+        except (KeyError, TypeError):
+            pass
 
+    index = snapshot.index if snapshot is not None else project_detect.ProjectIndex(project_dir)
+    tree = project_detect.detect_project_tree(project_dir, index=index)
+    save_cache(project_dir, {"detection": {
+        "detectorVersion": project_detect.DETECTOR_VERSION,
+        "fingerprint": index.fingerprint(),
+        "tree": tree.to_dict(),
+    }})
+    return tree
+
+
+def detect_project_type_cached(project_dir, snapshot=None):
+    return detect_project_tree_cached(project_dir, snapshot).type
+
+
+IGNORE_DIRS = {
+    "node_modules",
+    "bower_components",
+    "jspm_packages",
+    "web_modules",
+    "dist",
+    "build",
+    "out",
+    "target",
+    "bin",
+    "obj",
+    "lib",
+    "release",
+    "debug",
+    "artifacts",
+    "generated",
+    "temp",
+    "tmp",
+    "cache",
+    ".cache",
+    ".temp",
+    ".next",
+    ".nuxt",
+    ".svelte-kit",
+    ".vercel",
+    ".serverless",
+    ".expo",
+    ".output",
+    "dist-electron",
+    "release-builds",
+    ".parcel-cache",
+    "android",
+    "ios",
+    "windows",
+    "linux",
+    "macos",
+    "web",
+    ".dart_tool",
+    ".pub-cache",
+    ".pub",
+    "Pods",
+    ".bundle",
+    "venv",
+    ".venv",
+    "env",
+    ".env",
+    "virtualenv",
+    "envs",
+    "__pycache__",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".tox",
+    "htmlcov",
+    "site-packages",
+    "vendor",
+    "var",
+    "storage",
+    ".gradle",
+    ".mvn",
+    ".idea",
+    "tests",
+    "_tests_",
+    "_test_",
+    "__tests__",
+    "coverage",
+    "test",
+    "spec",
+    "cypress",
+    "e2e",
+    "reports",
+    ".git",
+    ".svn",
+    ".hg",
+    ".vscode",
+    ".turbo",
+    ".vs",
+    ".history",
+    ".github",
+    ".gitlab",
+    "public",
+    "static",
+    "assets",
+    "images",
+    "media",
+    "uploads",
+    "fonts",
+    "icons",
+    "migrations",
+    "data",
+    "db",
+    "database",
+    "logs",
+    "log",
+    "dump",
+    "backups",
+    "docs",
+    "javadoc",
+    "tools",
+    "scripts",
+    "config",
+    "settings",
+    "cmake-build-debug",
+    "packages",
+    "plugins",
+    "examples",
+    "samples",
+}
+
+IGNORE_FILES = {
+    "*.exe",
+    "*.dll",
+    "*.so",
+    "*.dylib",
+    "*.bin",
+    "*.iso",
+    "*.img",
+    "*.dmg",
+    "*.zip",
+    "*.tar",
+    "*.gz",
+    "*.rar",
+    "*.7z",
+    "*.bz2",
+    "*.xz",
+    "*.mp4",
+    "*.mkv",
+    "*.avi",
+    "*.mov",
+    "*.wmv",
+    "*.flv",
+    "*.webm",
+    "*.mp3",
+    "*.wav",
+    "*.flac",
+    "*.aac",
+    "*.ogg",
+    "*.wma",
+    "*.jpg",
+    "*.jpeg",
+    "*.png",
+    "*.gif",
+    "*.bmp",
+    "*.ico",
+    "*.svg",
+    "*.webp",
+    "*.tiff",
+    "*.pdf",
+    "*.doc",
+    "*.docx",
+    "*.ppt",
+    "*.pptx",
+    "*.xls",
+    "*.xlsx",
+    "*.csv",
+    "*.ttf",
+    "*.otf",
+    "*.woff",
+    "*.woff2",
+    "*.eot",
+    "*.pyc",
+    "*.pyo",
+    "*.pyd",
+    "*.class",
+    "*.jar",
+    "*.war",
+    "*.ear",
+    "*.o",
+    "*.obj",
+    "*.a",
+    "*.lib",
+    "*.lock",
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "Gemfile.lock",
+    "composer.lock",
+    "mix.lock",
+    "pubspec.lock",
+    "Cargo.lock",
+    "*.log",
+    "*.tmp",
+    "*.temp",
+    "*.swp",
+    "*.swo",
+    "*.bak",
+    "*.old",
+    "*.orig",
+    ".DS_Store",
+    "Thumbs.db",
+    "desktop.ini",
+    ".env",
+    ".env.local",
+    ".env.development",
+    ".env.test",
+    ".env.production",
+    "Dockerfile",
+    "docker-compose.yml",
+    "Makefile",
+    "CMakeLists.txt",
+    "LICENSE",
+    "CHANGELOG.md",
+    "CONTRIBUTING.md",
+    "CODE_OF_CONDUCT.md",
+    ".gitignore",
+    ".dokugenignore",
+    ".npmignore",
+    ".dockerignore",
+    ".eslintrc*",
+    ".prettierrc*",
+    "tsconfig.json",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*.d.ts",
+    "*.apk",
+    "*.aab",
+    "*.ipa",
+    "*.hap",
+}
+
+
+IGNORE_FILES_MATCHER = IgnoreMatcher(IGNORE_FILES)
+
+
+def _make_scanner(root_dir, max_workers=None, record=False):
+    return Scanner(
+        root_dir,
+        ignore_dirs=IGNORE_DIRS,
+        ignore_file=IGNORE_FILES_MATCHER.match,
+        ignore_tree=IgnoreTree(root_dir),
+        max_workers=max_workers,
+        record=record,
+    )
+
+
+def scan_files(root_dir, max_workers=None, use_git_index=False):
+    scanner = _make_scanner(root_dir, max_workers)
+    if use_git_index:
+        try:
+            entries = git_index.tracked_entries(root_dir) + git_index.untracked_entries(root_dir)
+            return scanner.filter_entries(entries)
+        except (subprocess.CalledProcessError, OSError, ValueError):
+            pass
+    return scanner.scan()
 
-def matches_ignore_pattern(filename, pattern):
-    if pattern.startswith("*."):
-        ext = pattern[1:]
-        return filename.endswith(ext)
-    return filename == pattern
-
-
-def scan_files(root_dir):
-    ignore_dirs = {
-        "node_modules",
-        "bower_components",
-        "jspm_packages",
-        "web_modules",
-        "dist",
-        "build",
-        "out",
-        "target",
-        "bin",
-        "obj",
-        "lib",
-        "release",
-        "debug",
-        "artifacts",
-        "generated",
-        "temp",
-        "tmp",
-        "cache",
-        ".cache",
-        ".temp",
-        ".next",
-        ".nuxt",
-        ".svelte-kit",
-        ".vercel",
-        ".serverless",
-        ".expo",
-        ".output",
-        "dist-electron",
-        "release-builds",
-        ".parcel-cache",
-        "android",
-        "ios",
-        "windows",
-        "linux",
-        "macos",
-        "web",
-        ".dart_tool",
-        ".pub-cache",
-        ".pub",
-        "Pods",
-        ".bundle",
-        "venv",
-        ".venv",
-        "env",
-        ".env",
-        "virtualenv",
-        "envs",
-        "__pycache__",
-        ".pytest_cache",
-        ".mypy_cache",
-        ".tox",
-        "htmlcov",
-        "site-packages",
-        "vendor",
-        "var",
-        "storage",
-        ".gradle",
-        ".mvn",
-        ".idea",
-        "tests",
-        "_tests_",
-        "_test_",
-        "__tests__",
-        "coverage",
-        "test",
-        "spec",
-        "cypress",
-        "e2e",
-        "reports",
-        ".git",
-        ".svn",
-        ".hg",
-        ".vscode",
-        ".turbo",
-        ".vs",
-        ".history",
-        ".github",
-        ".gitlab",
-        "public",
-        "static",
-        "assets",
-        "images",
-        "media",
-        "uploads",
-        "fonts",
-        "icons",
-        "migrations",
-        "data",
-        "db",
-        "database",
-        "logs",
-        "log",
-        "dump",
-        "backups",
-        "docs",
-        "javadoc",
-        "tools",
-        "scripts",
-        "config",
-        "settings",
-        "cmake-build-debug",
-        "packages",
-        "plugins",
-        "examples",
-        "samples",
-    }
 
-    ignore_files = {
-        "*.exe",
-        "*.dll",
-        "*.so",
-        "*.dylib",
-        "*.bin",
-        "*.iso",
-        "*.img",
-        "*.dmg",
-        "*.zip",
-        "*.tar",
-        "*.gz",
-        "*.rar",
-        "*.7z",
-        "*.bz2",
-        "*.xz",
-        "*.mp4",
-        "*.mkv",
-        "*.avi",
-        "*.mov",
-        "*.wmv",
-        "*.flv",
-        "*.webm",
-        "*.mp3",
-        "*.wav",
-        "*.flac",
-        "*.aac",
-        "*.ogg",
-        "*.wma",
-        "*.jpg",
-        "*.jpeg",
-        "*.png",
-        "*.gif",
-        "*.bmp",
-        "*.ico",
-        "*.svg",
-        "*.webp",
-        "*.tiff",
-        "*.pdf",
-        "*.doc",
-        "*.docx",
-        "*.ppt",
-        "*.pptx",
-        "*.xls",
-        "*.xlsx",
-        "*.csv",
-        "*.ttf",
-        "*.otf",
-        "*.woff",
-        "*.woff2",
-        "*.eot",
-        "*.pyc",
-        "*.pyo",
-        "*.pyd",
-        "*.class",
-        "*.jar",
-        "*.war",
-        "*.ear",
-        "*.o",
-        "*.obj",
-        "*.a",
-        "*.lib",
-        "*.lock",
-        "package-lock.json",
-        "yarn.lock",
-        "pnpm-lock.yaml",
-        "Gemfile.lock",
-        "composer.lock",
-        "mix.lock",
-        "pubspec.lock",
-        "Cargo.lock",
-        "*.log",
-        "*.tmp",
-        "*.temp",
-        "*.swp",
-        "*.swo",
-        "*.bak",
-        "*.old",
-        "*.orig",
-        ".DS_Store",
-        "Thumbs.db",
-        "desktop.ini",
-        ".env",
-        ".env.local",
-        ".env.development",
-        ".env.test",
-        ".env.production",
-        "Dockerfile",
-        "docker-compose.yml",
-        "Makefile",
-        "CMakeLists.txt",
-        "LICENSE",
-        "CHANGELOG.md",
-        "CONTRIBUTING.md",
-        "CODE_OF_CONDUCT.md",
-        ".gitignore",
-        ".npmignore",
-        ".dockerignore",
-        ".eslintrc*",
-        ".prettierrc*",
-        "tsconfig.json",
-        "*.min.js",
-        "*.min.css",
-        "*.map",
-        "*.d.ts",
-        "*.apk",
-        "*.aab",
-        "*.ipa",
-        "*.hap",
-    }
+def snapshot_project(root_dir, max_workers=None, use_git_index=False):
+    """scan_files as a ProjectSnapshot: the file list plus the stats and listings behind it.
 
-    gitignore_spec = None
-    gitignore_path = os.path.join(root_dir, ".gitignore")
-    if os.path.exists(gitignore_path):
+    Pass it on to detect_project_tree_cached, fingerprint_files and
+    extract_full_code so the run touches each file and directory once.
+    """
+    scanner = _make_scanner(root_dir, max_workers, record=not use_git_index)
+    if use_git_index:
         try:
-            with open(gitignore_path, "r") as f:
-                gitignore_spec = pathspec.PathSpec.from_lines("gitwildmatch", f)
-        except Exception:
-            pass
+            entries = git_index.tracked_entries(root_dir) + git_index.untracked_entries(root_dir)
+            # Index stat data can lag the working tree, so stats are left to be taken fresh
+            return ProjectSnapshot(root_dir, scanner.filter_entries(entries))
+        except (subprocess.CalledProcessError, OSError, ValueError):
+            scanner.record = True
+    return ProjectSnapshot.walk(scanner)
+
+
+def iter_scan_files(root_dir, max_workers=None):
+    """Stream relative file paths while the walk is still running."""
+    return _make_scanner(root_dir, max_workers).iter_files()
+
+
+def extract_full_code(project_files, project_dir, snapshot=None):
+    """Extract code from project files as one string (see payload.iter_code_snippets to stream it)."""
+    read = snapshot.read_snippet if snapshot is not None else None
+    return "".join(payload.iter_code_snippets(project_files, project_dir, read=read))
+
+
+LOCAL_BACKEND_PORTS = ["3000", "3002", "3001"]
+LOCAL_PROBE_TIMEOUT = 0.5
+SERVER_URL_ENDPOINT = "https://dokugen.samueltuoyo.com/api/get-server-url"
+SERVER_URL_TIMEOUT = 5
+DEFAULT_BACKEND_DOMAIN = "https://api-dokugen.samueltuoyo.com"
+BACKEND_CACHE_PATH = os.path.join(DOKUGEN_HOME, "backend.json")
+BACKEND_CACHE_TTL = 6 * 60 * 60
+# Cached entries older than this are still used, and re-checked against
+# /api/health by a detached process for the next invocation
+BACKEND_REVALIDATE_AFTER = 60 * 60
+
+_backend_domain = None
+_backend_lock = threading.Lock()
+# Optional protocol features each backend advertised on /api/health
+_backend_features = {}
+
+
+def _health_features(domain, timeout):
+    """The features domain lists on /api/health, or None if it isn't healthy."""
+    with network.get(f"{domain}/api/health", timeout=timeout) as r:
+        health = r.json() if r.status_code == 200 else {}
+    if health.get("status") != "Ok":
+        return None
+    return health.get("features", [])
 
-    found_files = []
 
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        dirnames[:] = [d for d in dirnames if d not in ignore_dirs]
+def _probe_local_backend(port):
+    domain = f"http://localhost:{port}"
+    features = _health_features(domain, LOCAL_PROBE_TIMEOUT)
+    if features is None:
+        return None
+    _backend_features[domain] = features
+    return domain
 
-        rel_dir = os.path.relpath(dirpath, root_dir)
-        if rel_dir == ".":
-            rel_dir = ""
 
-        if gitignore_spec and rel_dir and gitignore_spec.match_file(rel_dir):
-            dirnames[:] = []
-            continue
+def _fetch_server_url():
+    with network.get(SERVER_URL_ENDPOINT, timeout=SERVER_URL_TIMEOUT) as r:
+        if r.status_code == 200:
+            return r.json().get("domain")
+    return None
 
-        for filename in filenames:
-            should_ignore = False
-            for pattern in ignore_files:
-                if matches_ignore_pattern(filename, pattern):
-                    should_ignore = True
-                    break
 
-            if should_ignore:
-                continue
+def resolve_backend_domain():
+    """Probe local dev servers and the remote server-url endpoint at the same time.
 
-            rel_file_path = os.path.join(rel_dir, filename)
-            full_path = os.path.join(dirpath, filename)
+    A healthy local server wins as soon as it answers, as it did when ports
+    were probed in order; otherwise the remote answer is used once every
+    local probe has failed. Returns None if nothing answered.
+    """
+    results = queue.Queue()
 
-            try:
-                if os.path.getsize(full_path) >= 150 * 1024:
-                    continue
-            except Exception:
-                continue
+    def run(is_local, probe, *args):
+        try:
+            results.put((is_local, probe(*args)))
+        except Exception:
+            results.put((is_local, None))
+
+    # Daemon threads so a slow remote never holds up interpreter exit
+    for port in LOCAL_BACKEND_PORTS:
+        threading.Thread(target=run, args=(True, _probe_local_backend, port), daemon=True).start()
+    threading.Thread(target=run, args=(False, _fetch_server_url), daemon=True).start()
+
+    pending_local = len(LOCAL_BACKEND_PORTS)
+    remote_done = False
+    remote = None
+    deadline = time.monotonic() + SERVER_URL_TIMEOUT + 1
+    while pending_local or not remote_done:
+        try:
+            is_local, domain = results.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            break
+        if is_local:
+            pending_local -= 1
+            if domain:
+                return domain
+        else:
+            remote_done = True
+            remote = domain
+        if not pending_local and remote:
+            return remote
+    return remote
 
-            if gitignore_spec and gitignore_spec.match_file(rel_file_path):
-                continue
 
-            found_files.append(rel_file_path)
+def _read_backend_cache():
+    try:
+        with open(BACKEND_CACHE_PATH, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        return entry if isinstance(entry, dict) else {}
+    except Exception:
+        return {}
 
-    return found_files
 
+def _load_backend_cache():
+    entry = _read_backend_cache()
+    if entry.get("domain") and time.time() - entry.get("checkedAt", 0) < BACKEND_CACHE_TTL:
+        return entry
+    return None
 
-def extract_full_code(project_files, project_dir):
-    """Extract code from project files with memory-efficient processing."""
-    snippets = []
 
-    file_groups = {}
-    for f in project_files:
-        d = os.path.dirname(f)
-        if d not in file_groups:
-            file_groups[d] = []
-        file_groups[d].append(f)
-
-    for d, files in file_groups.items():
-        dir_snippets = []
-        for file in files:
-            file_path = os.path.join(project_dir, file)
-            try:
-                size_kb = os.path.getsize(file_path) / 1024
-                # Use context manager to ensure file is closed
-                with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                    content = f.read()
+def _update_backend_cache(domain, features=None):
+    """Mark domain as checked now, keeping what the cache already knows about it (e.g. its features)."""
+    entry = _read_backend_cache()
+    if entry.get("domain") != domain:
+        entry = {}
+    entry.update(domain=domain, checkedAt=time.time())
+    if features is not None:
+        entry["features"] = features
+    write_json_atomic(BACKEND_CACHE_PATH, entry)
+
+
+def _refresh_backend_cache():
+    domain = resolve_backend_domain()
+    if domain:
+        _update_backend_cache(domain, _backend_features.get(domain))
+    else:
+        try:
+            os.remove(BACKEND_CACHE_PATH)
+        except OSError:
+            pass
+    return domain
 
-                ext = Path(file).suffix[1:] or "txt"
-                snippet = f"### {file}\n- **Path:** {file}\n- **Size:** {size_kb:.2f} KB\n```{ext}\n{content}\n```\n"
-                dir_snippets.append(snippet)
 
-                # Clear content reference to free memory
-                del content
+def revalidate_backend_cache():
+    """Re-check the cached backend and record the answer for the next invocation; run detached.
 
-            except Exception as e:
-                console.print(f"[red]Failed to read file: {file} - {e}[/red]")
+    A healthy backend gets a fresh checkedAt and features. One that is down
+    is replaced by whatever resolve_backend_domain finds; if nothing answers
+    the entry is left alone, to be resolved in the foreground once it expires.
+    """
+    domain = _read_backend_cache().get("domain")
+    if not domain:
+        return
+    try:
+        features = _health_features(domain, SERVER_URL_TIMEOUT)
+    except Exception:
+        features = None
+    if features is not None:
+        _update_backend_cache(domain, features)
+        return
+    replacement = resolve_backend_domain()
+    if replacement:
+        _update_backend_cache(replacement, _backend_features.get(replacement))
 
-        if dir_snippets:
-            snippets.append(f"## {d}\n" + "".join(dir_snippets))
-            # Clear dir_snippets to free memory
-            del dir_snippets
 
-    result = "".join(snippets) or "No code snippets available"
-    # Clear snippets list to free memory
-    del snippets
-    return result
+def prefetch_backend_domain():
+    """Start resolving the backend while the caller scans and detects; get_backend_domain waits for it."""
+    if _backend_domain is None:
+        threading.Thread(target=get_backend_domain, daemon=True).start()
 
 
 def get_backend_domain():
+    global _backend_domain
     env_domain = os.environ.get("DOKUGEN_LOCAL_BACKEND_DOMAIN") or os.environ.get("BACKEND_DOMAIN")
     if env_domain:
         return env_domain
 
-    for port in ["3000", "3002", "3001"]:
+    with _backend_lock:
+        if _backend_domain:
+            return _backend_domain
+
+        entry = _load_backend_cache()
+        domain = entry and entry["domain"]
+        if domain and domain.startswith("http://localhost:"):
+            # Dev servers come and go; a refused localhost connection costs ~1 ms
+            try:
+                domain = _probe_local_backend(domain.rsplit(":", 1)[1])
+            except Exception:
+                domain = None
+        elif domain and time.time() - entry["checkedAt"] > BACKEND_REVALIDATE_AFTER:
+            # Use it now; a thread would die with short commands before writing the result
+            _spawn_detached("from dokugen import utils; utils.revalidate_backend_cache()")
+
+        if not domain:
+            domain = _refresh_backend_cache()
+
+        _backend_domain = domain or DEFAULT_BACKEND_DOMAIN
+        return _backend_domain
+
+
+def get_backend_features(backend_domain):
+    """Optional protocol features (e.g. "chunked-upload") the backend lists on /api/health.
+
+    Remembered per process and alongside the cached backend domain; a backend
+    that can't be asked is assumed to support none.
+    """
+    if backend_domain in _backend_features:
+        return _backend_features[backend_domain]
+
+    entry = _load_backend_cache()
+    if entry and entry["domain"] == backend_domain and "features" in entry:
+        features = entry["features"]
+    else:
+        timeout = LOCAL_PROBE_TIMEOUT if backend_domain.startswith(network.LOCAL_PREFIXES) else SERVER_URL_TIMEOUT
         try:
-            with requests.get(f"http://localhost:{port}/api/health", timeout=0.5) as r:
-                if r.status_code == 200 and r.json().get("status") == "Ok":
-                    return f"http://localhost:{port}"
+            features = _health_features(backend_domain, timeout)
         except Exception:
-            pass
-
-    try:
-        with requests.get(
-            "https://dokugen.samueltuoyo.com/api/get-server-url", timeout=5
-        ) as r:
-            if r.status_code == 200:
-                return r.json().get("domain")
-    except Exception:
-        pass
+            features = None
+        if features is not None and entry and entry["domain"] == backend_domain:
+            _update_backend_cache(backend_domain, features)
+        features = features or []
 
-    return "https://api-dokugen.samueltuoyo.com"
+    _backend_features[backend_domain] = features
+    return features
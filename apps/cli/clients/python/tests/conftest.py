@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+from dokugen import utils
+
+
+@pytest.fixture
+def dokugen_home(tmp_path, monkeypatch):
+    """Point ~/.dokugen (caches, backups, profile, backend and update state) at a temporary directory."""
+    home = tmp_path / "dokugen-home"
+    monkeypatch.setattr(utils, "DOKUGEN_HOME", str(home))
+    monkeypatch.setattr(utils, "BACKEND_CACHE_PATH", os.path.join(home, "backend.json"))
+    monkeypatch.setattr(utils, "UPDATE_CHECK_PATH", os.path.join(home, "update-check.json"))
+    return home
@@ -0,0 +1,95 @@
+import json
+import time
+
+import pytest
+
+from dokugen import utils
+
+CACHED = "https://cached.example"
+REPLACEMENT = "https://replacement.example"
+
+
+@pytest.fixture
+def backend(dokugen_home, monkeypatch):
+    """Fresh per-process backend state; records health checks, full resolves and detached spawns."""
+    monkeypatch.delenv("DOKUGEN_LOCAL_BACKEND_DOMAIN", raising=False)
+    monkeypatch.delenv("BACKEND_DOMAIN", raising=False)
+    monkeypatch.setattr(utils, "_backend_domain", None)
+    monkeypatch.setattr(utils, "_backend_features", {})
+
+    calls = {"health": [], "resolve": 0, "spawn": []}
+    calls["healthy"] = {CACHED: ["chunked-upload"], REPLACEMENT: ["zstd"]}
+    calls["resolves_to"] = REPLACEMENT
+
+    def health(domain, timeout):
+        calls["health"].append(domain)
+        return calls["healthy"].get(domain)
+
+    def resolve():
+        calls["resolve"] += 1
+        return calls["resolves_to"]
+
+    monkeypatch.setattr(utils, "_health_features", health)
+    monkeypatch.setattr(utils, "resolve_backend_domain", resolve)
+    monkeypatch.setattr(utils, "_spawn_detached", calls["spawn"].append)
+    return calls
+
+
+def write_cache(age, domain=CACHED, **extra):
+    utils.write_json_atomic(utils.BACKEND_CACHE_PATH, {"domain": domain, "checkedAt": time.time() - age, **extra})
+
+
+def read_cache():
+    with open(utils.BACKEND_CACHE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_fresh_entry_is_used_as_is(backend):
+    write_cache(60)
+    assert utils.get_backend_domain() == CACHED
+    assert backend["health"] == [] and backend["resolve"] == 0 and backend["spawn"] == []
+
+
+def test_stale_entry_is_used_and_revalidated_detached(backend):
+    write_cache(utils.BACKEND_REVALIDATE_AFTER + 60)
+    assert utils.get_backend_domain() == CACHED
+    assert backend["health"] == [] and backend["resolve"] == 0
+    assert backend["spawn"] == ["from dokugen import utils; utils.revalidate_backend_cache()"]
+
+
+def test_expired_entry_resolves_in_foreground(backend):
+    write_cache(utils.BACKEND_CACHE_TTL + 60)
+    assert utils.get_backend_domain() == REPLACEMENT
+    assert backend["resolve"] == 1 and backend["spawn"] == []
+    assert read_cache()["domain"] == REPLACEMENT
+
+
+def test_revalidate_healthy_keeps_domain(backend):
+    write_cache(utils.BACKEND_REVALIDATE_AFTER + 60, features=[])
+    utils.revalidate_backend_cache()
+
+    entry = read_cache()
+    assert entry["domain"] == CACHED
+    assert entry["features"] == ["chunked-upload"]
+    assert time.time() - entry["checkedAt"] < 60
+    assert backend["resolve"] == 0
+
+
+def test_revalidate_down_switches_to_replacement(backend):
+    backend["healthy"].pop(CACHED)
+    write_cache(utils.BACKEND_REVALIDATE_AFTER + 60, features=["chunked-upload"])
+    utils.revalidate_backend_cache()
+
+    entry = read_cache()
+    assert entry["domain"] == REPLACEMENT
+    assert "features" not in entry
+
+
+def test_revalidate_keeps_entry_when_nothing_answers(backend):
+    backend["healthy"].clear()
+    backend["resolves_to"] = None
+    write_cache(utils.BACKEND_REVALIDATE_AFTER + 60)
+    before = read_cache()
+    utils.revalidate_backend_cache()
+
+    assert read_cache() == before
@@ -0,0 +1,118 @@
+import io
+import subprocess
+
+from dokugen.commands import batch, generate
+
+DOKUGEN_README = "# Project\n\n<!-- DOKUGEN: generated -->\n"
+
+
+def make_repo(path, readme=None):
+    path.mkdir(parents=True)
+    (path / "requirements.txt").write_text("flask\n")
+    (path / "app.py").write_text("from flask import Flask\n")
+    if readme is not None:
+        (path / "README.md").write_text(readme)
+    subprocess.check_call(["git", "init", "-q"], cwd=path)
+    return path
+
+
+def settings(existing="skip"):
+    return {
+        "existing": existing,
+        "git_index": False,
+        "template": None,
+        "token_budget": None,
+        "skeleton": False,
+        "options": {},
+    }
+
+
+def test_expand_repos_globs_sorted(tmp_path):
+    for name in ("b", "a", "c"):
+        (tmp_path / "services" / name).mkdir(parents=True)
+    (tmp_path / "services" / "notes.txt").write_text("")
+
+    repos = batch.expand_repos([str(tmp_path / "services" / "*")])
+    assert repos == [str(tmp_path / "services" / name) for name in ("a", "b", "c")]
+
+
+def test_expand_repos_from_file(tmp_path):
+    (tmp_path / "one").mkdir()
+    (tmp_path / "two").mkdir()
+    list_file = tmp_path / "repos.txt"
+    list_file.write_text(f"# services\n{tmp_path / 'two'}\n\n  \n{tmp_path / 'one'}\n")
+
+    repos = batch.expand_repos([], str(list_file))
+    assert repos == [str(tmp_path / "two"), str(tmp_path / "one")]
+
+
+def test_expand_repos_from_stdin(tmp_path, monkeypatch):
+    (tmp_path / "one").mkdir()
+    monkeypatch.setattr("sys.stdin", io.StringIO(f"{tmp_path / 'one'}\n"))
+    assert batch.expand_repos([], "-") == [str(tmp_path / "one")]
+
+
+def test_expand_repos_dedups_in_order(tmp_path, monkeypatch):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+    monkeypatch.chdir(tmp_path)
+
+    repos = batch.expand_repos(["b", str(tmp_path / "*"), "./a", "b/"])
+    assert repos == [str(tmp_path / "b"), str(tmp_path / "a")]
+
+
+def test_expand_repos_drops_non_directories(tmp_path):
+    (tmp_path / "repo").mkdir()
+    (tmp_path / "file.txt").write_text("")
+
+    repos = batch.expand_repos([str(tmp_path / "file.txt"), str(tmp_path / "missing"), str(tmp_path / "repo")])
+    assert repos == [str(tmp_path / "repo")]
+
+
+def test_prepare_repo_skips_non_git_directory(tmp_path):
+    (tmp_path / "plain").mkdir()
+    result, job = batch.prepare_repo(str(tmp_path / "plain"), settings())
+    assert job is None
+    assert result["status"] == "skipped"
+    assert result["reason"] == "not a git repository"
+
+
+def test_prepare_repo_skips_existing_readme(tmp_path, dokugen_home):
+    repo = make_repo(tmp_path / "repo", readme="# Mine\n")
+    result, job = batch.prepare_repo(str(repo), settings("skip"))
+    assert job is None
+    assert (result["status"], result["reason"]) == ("skipped", "README.md exists")
+
+
+def test_prepare_repo_update_skips_foreign_readme(tmp_path, dokugen_home):
+    repo = make_repo(tmp_path / "repo", readme="# Hand-written\n")
+    result, job = batch.prepare_repo(str(repo), settings("update"))
+    assert job is None
+    assert (result["status"], result["reason"]) == ("skipped", "README.md was not generated by Dokugen")
+
+
+def test_prepare_repo_overwrite_replaces_foreign_readme(tmp_path, dokugen_home):
+    repo = make_repo(tmp_path / "repo", readme="# Hand-written\n")
+    result, job = batch.prepare_repo(str(repo), settings("overwrite"))
+    assert job is not None
+    assert job.payload["existingReadme"] is None
+    assert result["projectType"] == "Python Flask"
+
+
+def test_prepare_repo_update_up_to_date(tmp_path, dokugen_home):
+    repo = make_repo(tmp_path / "repo", readme=DOKUGEN_README)
+    result, job = batch.prepare_repo(str(repo), settings("update"))
+    assert result["status"] is None
+    assert job.payload["existingReadme"] == DOKUGEN_README
+
+    # As if the README had just been generated from this tree
+    generate.save_readme_cache(job)
+    result, job = batch.prepare_repo(str(repo), settings("update"))
+    assert job is None
+    assert result["status"] == "up-to-date"
+
+    (repo / "app.py").write_text("from flask import Flask\napp = Flask(__name__)\n")
+    result, job = batch.prepare_repo(str(repo), settings("update"))
+    assert job is not None
+    assert job.is_incremental
+    assert job.modified_files == ["app.py"]
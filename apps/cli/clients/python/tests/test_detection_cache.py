@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from dokugen import project_detect, utils
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "src").mkdir(parents=True)
+    (root / "requirements.txt").write_text("flask\n")
+    (root / "app.py").write_text("from flask import Flask\n")
+    (root / "src" / "views.py").write_text("")
+    (root / "README.md").write_text("# project\n")
+    return root
+
+
+@pytest.fixture(params=[False, True], ids=["index", "snapshot"])
+def detect(request, dokugen_home, monkeypatch):
+    """Cached detection; .runs counts how often the detector itself ran."""
+    real = project_detect.detect_project_tree
+
+    def counting(*args, **kwargs):
+        run.runs += 1
+        return real(*args, **kwargs)
+
+    def run(root):
+        snapshot = utils.snapshot_project(str(root)) if request.param else None
+        return utils.detect_project_tree_cached(str(root), snapshot).type
+
+    run.runs = 0
+    monkeypatch.setattr(project_detect, "detect_project_tree", counting)
+    return run
+
+
+def test_unchanged_project_hits(project, detect):
+    assert detect(project) == "Python Flask"
+    assert detect(project) == "Python Flask"
+    assert detect.runs == 1
+
+
+def test_unrelated_changes_hit(project, detect):
+    detect(project)
+    (project / "notes.txt").write_text("todo\n")
+    (project / ".app.py.swp").write_text("")
+    (project / "src" / "models.py").write_text("")
+    (project / "README.md").write_text("# project\n\nRewritten by Dokugen.\n")
+    os.rename(project / "src" / "views.py", project / "src" / "pages.py")
+
+    assert detect(project) == "Python Flask"
+    assert detect.runs == 1
+
+
+@pytest.mark.parametrize("change", ["edit", "add", "remove", "source"])
+def test_manifest_changes_miss(project, detect, change):
+    detect(project)
+    if change == "edit":
+        (project / "requirements.txt").write_text("flask\nsqlalchemy\n")
+        expected = "Python Flask + SQLAlchemy"
+    elif change == "add":
+        (project / "go.mod").write_text("module example.com/project\n")
+        expected = "Go"
+    elif change == "remove":
+        (project / "requirements.txt").unlink()
+        (project / "app.py").unlink()
+        expected = "Unknown"
+    else:
+        # The detector counts root *.py files, so a new one is a real input
+        (project / "manage.py").write_text("")
+        expected = "Python Flask"
+
+    assert detect(project) == expected
+    assert detect.runs == 2
+    assert detect(project) == expected
+    assert detect.runs == 2
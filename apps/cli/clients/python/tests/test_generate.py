@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import subprocess
+
+import pytest
+
+from dokugen import headless, project_detect, utils
+from dokugen.commands import generate
+
+
+def sse_body(*texts, error=None):
+    events = [f"data: {json.dumps({'response': text})}\n\n" for text in texts]
+    if error:
+        events.append(f"data: {json.dumps({'error': error})}\n\n")
+    return "".join(events).encode("utf-8")
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.status_code = status_code
+        self.text = ""
+        self._body = body
+
+    def iter_content(self, chunk_size=None):
+        # Cut mid-event, as the network would
+        return [self._body[i:i + 7] for i in range(0, len(self._body), 7)]
+
+    def close(self):
+        pass
+
+
+def listing(path):
+    return sorted(os.listdir(path))
+
+
+def test_write_readme_stream_replaces_file(tmp_path):
+    path = tmp_path / "README.md"
+    path.write_text("old\n")
+    generate.write_readme_stream(FakeResponse(sse_body("# New", "\n\nbody ✅\n")).iter_content(), str(path))
+
+    assert path.read_text(encoding="utf-8") == "# New\n\nbody ✅\n"
+    assert listing(tmp_path) == ["README.md"]
+
+
+@pytest.mark.parametrize("body", [sse_body("# Half", error="model overloaded"), b"", b"data: not json\n\n"])
+def test_write_readme_stream_failure_keeps_file(tmp_path, body):
+    path = tmp_path / "README.md"
+    path.write_text("old\n")
+    with pytest.raises(generate.ReadmeRequestError):
+        generate.write_readme_stream(FakeResponse(body).iter_content(), str(path))
+
+    assert path.read_text() == "old\n"
+    assert listing(tmp_path) == ["README.md"]
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """Serve every README request from a canned stream; returns the list of jobs sent."""
+    jobs = []
+
+    def post_readme_job(job, backend_domain):
+        jobs.append(job)
+        return FakeResponse(sse_body("# Project\n", "\nGenerated.\n"))
+
+    monkeypatch.setattr(utils, "prefetch_backend_domain", lambda: None)
+    monkeypatch.setattr(utils, "get_backend_domain", lambda: "http://backend.test")
+    monkeypatch.setattr(generate, "_post_readme_job", post_readme_job)
+    return jobs
+
+
+def test_generate_keeps_detection_cache(tmp_path, dokugen_home, fake_backend, monkeypatch):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "requirements.txt").write_text("flask\n")
+    (project / "app.py").write_text("from flask import Flask\n")
+    subprocess.check_call(["git", "init", "-q"], cwd=project)
+
+    runs = []
+    real = project_detect.detect_project_tree
+    monkeypatch.setattr(project_detect, "detect_project_tree", lambda *a, **kw: runs.append(1) or real(*a, **kw))
+
+    settings = headless.resolve_settings(argparse.Namespace(), {})
+    result = generate.run_headless(str(project), settings)
+
+    assert result["status"] == "generated", result
+    assert len(fake_backend) == 1
+    assert (project / "README.md").read_text() == "# Project\n\nGenerated.\n"
+    # Writing README.md (via a temp file beside it) must not invalidate the detection cache
+    assert utils.detect_project_tree_cached(str(project)).type == "Python Flask"
+    assert len(runs) == 1
@@ -0,0 +1,82 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from dokugen import git_index
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+FILES = {
+    "README.md": "# demo\n",
+    "src/app.py": "print('hi')\n",
+    "src/app_test.py": "assert True\n",
+    "src/nested/deep/module.py": "x = 1\n",
+}
+
+
+def git(repo, *args):
+    return subprocess.check_output(["git", *args], cwd=repo)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    for rel_path, text in FILES.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    git(tmp_path, "add", ".")
+    return tmp_path
+
+
+def read_index(repo):
+    data = (repo / ".git" / "index").read_bytes()
+    return data, {entry.path: entry for entry in git_index.parse_index(data)}
+
+
+@pytest.mark.parametrize("version", [2, 4])
+def test_parse_index_versions(repo, version):
+    git(repo, "update-index", "--index-version", str(version))
+    data, entries = read_index(repo)
+
+    assert int.from_bytes(data[4:8], "big") == version
+    assert sorted(entries) == sorted(FILES)
+    for rel_path, text in FILES.items():
+        st = os.stat(repo / rel_path)
+        assert entries[rel_path].size == len(text)
+        # Sub-second precision depends on how git was built
+        assert entries[rel_path].mtime_ns // 1_000_000_000 == int(st.st_mtime)
+        assert entries[rel_path].ino == st.st_ino
+
+
+def test_parse_index_v3_skips_skip_worktree(repo):
+    # An extended flag is what makes git write a v3 index
+    git(repo, "update-index", "--skip-worktree", "src/app_test.py")
+    data, entries = read_index(repo)
+
+    assert int.from_bytes(data[4:8], "big") == 3
+    assert sorted(entries) == sorted(set(FILES) - {"src/app_test.py"})
+
+
+def test_parse_index_skips_symlinks(repo):
+    (repo / "link").symlink_to("README.md")
+    git(repo, "add", "link")
+    _, entries = read_index(repo)
+
+    assert "link" not in entries
+
+
+def test_parse_index_rejects_other_files():
+    with pytest.raises(git_index.UnsupportedIndex):
+        git_index.parse_index(b"not an index at all")
+    with pytest.raises(git_index.UnsupportedIndex):
+        git_index.parse_index(b"DIRC" + (5).to_bytes(4, "big") + bytes(4))
+
+
+def test_tracked_entries_from_subdirectory_leaves_out_deleted(repo):
+    (repo / "src" / "app_test.py").unlink()
+    entries = git_index.tracked_entries(str(repo / "src"))
+
+    assert sorted(entry.path.replace(os.sep, "/") for entry in entries) == ["app.py", "nested/deep/module.py"]
@@ -0,0 +1,65 @@
+import argparse
+import json
+
+import pytest
+
+from dokugen import headless
+
+
+def write_config(tmp_path, text):
+    (tmp_path / ".dokugen").mkdir()
+    (tmp_path / headless.CONFIG_PATH).write_text(text, encoding="utf-8")
+
+
+def parse(argv):
+    parser = argparse.ArgumentParser()
+    headless.add_headless_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_missing_config_is_empty(tmp_path):
+    assert headless.load_project_config(str(tmp_path)) == {}
+
+
+def test_valid_config_loads(tmp_path):
+    config = {"headless": True, "setup": False, "tokenBudget": 20000, "linkedin": "someone", "template": None}
+    write_config(tmp_path, json.dumps(config))
+    assert headless.load_project_config(str(tmp_path)) == config
+
+
+@pytest.mark.parametrize("text, message", [
+    ('{"headles": true}', "unknown key 'headles'"),
+    ('{"setup": "yes"}', "'setup' must be a bool"),
+    ('{"tokenBudget": true}', "'tokenBudget' must be a int"),
+    ('{"tokenBudget": 1.5}', "'tokenBudget' must be a int"),
+    ('["headless"]', "expected a JSON object"),
+    ('{"setup": true,}', headless.CONFIG_PATH),
+])
+def test_invalid_config_is_rejected(tmp_path, text, message):
+    write_config(tmp_path, text)
+    with pytest.raises(headless.ConfigError, match=message):
+        headless.load_project_config(str(tmp_path))
+
+
+def test_flags_override_config(monkeypatch):
+    monkeypatch.delenv("CI", raising=False)
+    config = {"setup": True, "contrib": True, "twitter": "from_config", "overwrite": False}
+    args = parse(["--no-setup", "--twitter", "from_flag"])
+    settings = headless.resolve_settings(args, config)
+
+    assert settings["options"]["include_setup"] is False
+    assert settings["options"]["include_contrib"] is True
+    assert settings["options"]["twitter_username"] == "from_flag"
+    assert settings["overwrite"] is False
+    assert headless.resolve_settings(parse([]), {}, update=True)["overwrite"] is False
+
+
+def test_is_headless(monkeypatch):
+    monkeypatch.delenv("CI", raising=False)
+    assert not headless.is_headless(parse([]), {})
+    assert headless.is_headless(parse(["-y"]), {})
+    assert headless.is_headless(parse([]), {"headless": True})
+    monkeypatch.setenv("CI", "false")
+    assert not headless.is_headless(parse([]), {})
+    monkeypatch.setenv("CI", "true")
+    assert headless.is_headless(parse([]), {})
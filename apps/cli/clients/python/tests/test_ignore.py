@@ -0,0 +1,42 @@
+import os
+
+from dokugen.utils import scan_files
+
+
+def write(root, rel_path, text=""):
+    path = os.path.join(root, *rel_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def scanned(root):
+    return sorted(path.replace(os.sep, "/") for path in scan_files(str(root)))
+
+
+def test_nested_gitignore_applies_below_its_directory(tmp_path):
+    write(tmp_path, "app/.gitignore", "gen/\n*.snap\n")
+    write(tmp_path, "app/main.py")
+    write(tmp_path, "app/gen/schema.py")
+    write(tmp_path, "app/view.snap")
+    write(tmp_path, "src/view.snap")
+
+    assert scanned(tmp_path) == ["app/main.py", "src/view.snap"]
+
+
+def test_deeper_gitignore_reincludes(tmp_path):
+    write(tmp_path, ".gitignore", "*.sql\n")
+    write(tmp_path, "sql/.gitignore", "!schema.sql\n")
+    write(tmp_path, "sql/schema.sql")
+    write(tmp_path, "sql/seed.sql")
+
+    assert scanned(tmp_path) == ["sql/schema.sql"]
+
+
+def test_dokugenignore_overrides_gitignore(tmp_path):
+    write(tmp_path, ".gitignore", "tasks/\n")
+    write(tmp_path, ".dokugenignore", "!tasks/\nguides/\n")
+    write(tmp_path, "tasks/build.py")
+    write(tmp_path, "guides/intro.py")
+
+    assert scanned(tmp_path) == ["tasks/build.py"]
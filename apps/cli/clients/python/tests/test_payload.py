@@ -0,0 +1,80 @@
+import base64
+import gzip
+
+import pytest
+
+from dokugen import payload
+
+CHUNKS = ["def main():\n", "    print('héllo ✅')\n" * 500, "", "main()\n"]
+TEXT = "".join(CHUNKS)
+
+
+def encode(encoder, chunks=CHUNKS):
+    out = [encoder.write(chunk) for chunk in chunks]
+    out.append(encoder.close())
+    return out
+
+
+def test_gzip_round_trip():
+    assert gzip.decompress(b"".join(encode(payload.GzipEncoder()))).decode("utf-8") == TEXT
+
+
+def test_gzip_base64_chunks_concatenate():
+    out = encode(payload.GzipBase64Encoder())
+    # Every chunk but the last is whole base64 quanta, so plain concatenation decodes
+    assert all(len(chunk) % 4 == 0 for chunk in out[:-1])
+    assert gzip.decompress(base64.b64decode("".join(out))).decode("utf-8") == TEXT
+
+
+def test_iter_encoded_defaults_to_gzip_base64():
+    body = "".join(payload.iter_encoded(iter(CHUNKS)))
+    assert gzip.decompress(base64.b64decode(body)).decode("utf-8") == TEXT
+
+
+def test_gzip_empty_input():
+    assert gzip.decompress(b"".join(encode(payload.GzipEncoder(), []))) == b""
+
+
+def test_zstd_round_trip():
+    zstandard = pytest.importorskip("zstandard")
+    data = b"".join(encode(payload.ZstdEncoder()))
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(data).decode("utf-8") == TEXT
+
+
+def test_zstd_dictionary_round_trip():
+    zstandard = pytest.importorskip("zstandard")
+    dictionary = payload.load_dictionary()
+    codec = payload.Codec(payload.ZSTD, dictionary=dictionary)
+    data = codec.compress(TEXT)
+
+    assert codec.payload_fields() == {"compression": "zstd", "compressionDictionary": dictionary.dict_id()}
+    decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+    assert decompressor.decompressobj().decompress(data).decode("utf-8") == TEXT
+
+
+def test_negotiate_codec(monkeypatch):
+    pytest.importorskip("zstandard")
+    monkeypatch.delenv("DOKUGEN_COMPRESSION", raising=False)
+    monkeypatch.delenv("DOKUGEN_ZSTD_LEVEL", raising=False)
+    dict_feature = f"zstd-dictionary:{payload.load_dictionary().dict_id()}"
+
+    assert payload.negotiate_codec([]).name == payload.GZIP
+    assert payload.negotiate_codec(["zstd"]).dictionary is None
+    assert payload.negotiate_codec(["zstd", dict_feature]).dictionary is not None
+    assert payload.negotiate_codec(["zstd", dict_feature], payload.DICTIONARY_MAX_BYTES).dictionary is None
+
+    monkeypatch.setenv("DOKUGEN_ZSTD_LEVEL", "3")
+    assert payload.negotiate_codec(["zstd"]).level == 3
+    monkeypatch.setenv("DOKUGEN_COMPRESSION", "gzip")
+    assert payload.negotiate_codec(["zstd"]).name == payload.GZIP
+
+
+def test_unreadable_file_warns_on_stderr(tmp_path, capsys):
+    (tmp_path / "app.py").write_text("print('hi')\n")
+
+    text = "".join(payload.iter_code_snippets(["app.py", "[gone].py"], str(tmp_path)))
+    assert "app.py" in text and "[gone].py" not in text
+
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "Failed to read file: [gone].py" in err
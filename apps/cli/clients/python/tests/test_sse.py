@@ -0,0 +1,56 @@
+import pytest
+
+from dokugen.sse import SSEDecoder, iter_events
+
+
+def decode(stream, size=None):
+    """(type, data, id) of every event in stream, fed whole or in size-byte pieces."""
+    data = stream.encode("utf-8")
+    chunks = [data] if size is None else [data[i:i + size] for i in range(0, len(data), size)]
+    return [(event.type, event.data, event.id) for event in iter_events(chunks)]
+
+
+@pytest.mark.parametrize("size", [None, 1, 2, 3])
+def test_line_endings(size):
+    stream = "data: lf\n\ndata: crlf\r\n\r\ndata: cr\r\rdata: mixed\r\n\n"
+    assert decode(stream, size) == [
+        ("message", "lf", ""),
+        ("message", "crlf", ""),
+        ("message", "cr", ""),
+        ("message", "mixed", ""),
+    ]
+
+
+@pytest.mark.parametrize("size", [None, 1])
+def test_multi_line_data(size):
+    stream = "data: first\ndata:second\ndata\ndata:  indented\n\n"
+    assert decode(stream, size) == [("message", "first\nsecond\n\n indented", "")]
+
+
+def test_comments_are_skipped():
+    stream = ": keep-alive\n\n:\ndata: a\n: in the middle\ndata: b\n\n: trailing\n"
+    assert decode(stream) == [("message", "a\nb", "")]
+
+
+def test_final_event_without_blank_line_is_discarded():
+    assert decode("data: done\n\ndata: cut off\n") == [("message", "done", "")]
+    assert decode("data: done\n\ndata: cut off") == [("message", "done", "")]
+
+
+def test_trailing_cr_ends_the_last_line():
+    assert decode("data: x\r\r") == [("message", "x", "")]
+
+
+def test_event_type_and_id():
+    stream = "event: status\nid: 7\ndata: {}\n\ndata: next\n\nid\ndata: reset\n\n"
+    assert decode(stream) == [("status", "{}", "7"), ("message", "next", "7"), ("message", "reset", "")]
+
+
+def test_bom_and_utf8_split_across_chunks():
+    assert decode("\ufeffdata: héllo ✅\n\n", size=1) == [("message", "héllo ✅", "")]
+
+
+def test_retry_field():
+    decoder = SSEDecoder()
+    decoder.feed(b"retry: 1500\nretry: soon\n\n")
+    assert decoder.retry == 1500
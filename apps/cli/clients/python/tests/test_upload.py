@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+import json
+import random
+
+import pytest
+
+from dokugen import network, upload, utils
+from dokugen.commands import generate
+
+BACKEND = "http://backend.test"
+
+
+def make_pieces(count=600, seed=1):
+    rng = random.Random(seed)
+    words = ["def", "return", "import", "class", "self", "value", "✅", "\n", "    "]
+    return [
+        f"--- src/file_{i}.py ---\n" + " ".join(rng.choice(words) for _ in range(rng.randint(5, 80))) + "\n"
+        for i in range(count)
+    ]
+
+
+def chunk_text(chunk):
+    return gzip.decompress(chunk.compressed()).decode("utf-8")
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body or {}
+        self.text = json.dumps(self._body)
+
+    def json(self):
+        return self._body
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeChunkServer:
+    """The backend's chunk routes and chunked generate request, in memory."""
+
+    def __init__(self):
+        self.chunks = {}
+        self.puts = []
+        self.generate_requests = []
+        self.expire_before_generate = 0
+
+    def post(self, url, data=None, **kwargs):
+        if url == f"{BACKEND}/api/chunks/missing":
+            return FakeResponse(200, {"missing": [h for h in kwargs["json"]["hashes"] if h not in self.chunks]})
+        assert url == f"{BACKEND}/api/generate-readme"
+        manifest = json.loads(data)["fullCodeManifest"]
+        self.generate_requests.append(manifest)
+        if self.expire_before_generate:
+            self.expire_before_generate -= 1
+            self.chunks.clear()
+        missing = [h for h in manifest if h not in self.chunks]
+        if missing:
+            return FakeResponse(409, {"missing": missing})
+        return FakeResponse(200, {"fullCode": "".join(self.chunks[h] for h in manifest)})
+
+    def request(self, method, url, data=None, **kwargs):
+        assert method == "PUT"
+        digest = url.rsplit("/", 1)[1]
+        text = gzip.decompress(data)
+        assert hashlib.sha256(text).hexdigest() == digest
+        self.puts.append(digest)
+        self.chunks[digest] = text.decode("utf-8")
+        return FakeResponse(201, {"hash": digest})
+
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeChunkServer()
+    monkeypatch.setattr(network, "post", fake.post)
+    monkeypatch.setattr(network, "request", fake.request)
+    return fake
+
+
+def test_iter_chunks_round_trip():
+    pieces = make_pieces() + ["x" * 2500, "", "tail ✅"]
+    chunks = list(upload.iter_chunks(pieces, max_chars=1000))
+
+    assert "".join(chunk_text(c) for c in chunks) == "".join(pieces)
+    assert all(len(chunk_text(c)) <= 1000 for c in chunks)
+    assert all(c.size == len(chunk_text(c).encode("utf-8")) for c in chunks)
+
+
+def test_iter_chunks_edit_stays_local():
+    pieces = make_pieces()
+    edited = list(pieces)
+    edited[300] = edited[300].replace("\n", "\n# edited\n", 1)
+
+    before = [c.hash for c in upload.iter_chunks(pieces)]
+    after = [c.hash for c in upload.iter_chunks(edited)]
+
+    assert len(before) > 20
+    changed = set(after) - set(before)
+    # Boundaries follow content, so only the chunk holding the edited piece differs
+    assert len(changed) == 1
+    assert len(after) == len(before)
+
+
+def test_upload_chunks_sends_only_missing(server, monkeypatch):
+    monkeypatch.setattr(upload, "MISSING_BATCH", 7)
+    pieces = make_pieces()
+
+    manifest, stats = upload.upload_chunks(BACKEND, pieces)
+    assert "".join(server.chunks[h] for h in manifest) == "".join(pieces)
+    assert stats["uploaded"] == len(set(manifest)) == len(server.puts)
+
+    server.puts.clear()
+    again, stats = upload.upload_chunks(BACKEND, pieces)
+    assert again == manifest
+    assert stats == {"chunks": len(manifest), "uploaded": 0, "bytes": 0}
+    assert server.puts == []
+
+    pieces[300] += "# edited\n"
+    _, stats = upload.upload_chunks(BACKEND, pieces)
+    assert stats["uploaded"] == len(server.puts) == 1
+
+
+def test_upload_chunks_sends_duplicates_once(server):
+    # A full-size piece always ends its chunk, so each copy is a chunk of its own
+    piece = "s" * upload.MAX_CHUNK_CHARS
+    manifest, stats = upload.upload_chunks(BACKEND, [piece] * 4)
+
+    assert len(manifest) == 4 and len(set(manifest)) == 1
+    assert stats["uploaded"] == 1 and server.puts == manifest[:1]
+
+
+def test_upload_chunks_raises_on_server_error(server, monkeypatch):
+    monkeypatch.setattr(network, "request", lambda *a, **kw: FakeResponse(429, {"error": "quota"}))
+    with pytest.raises(upload.ChunkUploadError, match="429"):
+        upload.upload_chunks(BACKEND, make_pieces(50))
+
+
+class ChunkedJob:
+    """The parts of generate.ReadmeJob that _post_readme_job uses for a chunked upload."""
+
+    code_bytes = upload.CHUNKED_UPLOAD_MIN_BYTES
+    upload_stats = None
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    def snippets(self):
+        return iter(self.pieces)
+
+    def manifest_body(self, manifest, codec=None):
+        return json.dumps({"fullCodeManifest": manifest}).encode("utf-8")
+
+
+@pytest.fixture
+def chunked_backend(server, monkeypatch):
+    monkeypatch.setattr(utils, "get_backend_features", lambda domain: [upload.CHUNKED_UPLOAD_FEATURE])
+    return server
+
+
+def test_post_readme_job_reuploads_after_409(chunked_backend):
+    pieces = make_pieces()
+    chunked_backend.expire_before_generate = 1
+    job = ChunkedJob(pieces)
+
+    response = generate._post_readme_job(job, BACKEND)
+
+    assert response.status_code == 200
+    assert response.json()["fullCode"] == "".join(pieces)
+    assert len(chunked_backend.generate_requests) == 2
+    # Everything was uploaded, expired, then uploaded again on the second pass
+    assert len(chunked_backend.puts) == 2 * len(set(chunked_backend.generate_requests[0]))
+    assert job.upload_stats["uploaded"] == len(set(chunked_backend.generate_requests[0]))
+
+
+def test_post_readme_job_gives_up_after_second_409(chunked_backend):
+    chunked_backend.expire_before_generate = 2
+    response = generate._post_readme_job(ChunkedJob(make_pieces(50)), BACKEND)
+
+    assert response.status_code == 409
+    assert len(chunked_backend.generate_requests) == 2
@@ -0,0 +1,36 @@
+import { PayloadError, decompress } from "./codecs";
+
+/**
+ * Binary generate-readme bodies (application/octet-stream): the request's
+ * JSON fields, X-Dokugen-Metadata-Length bytes long, followed by fullCode
+ * compressed as named by the metadata's "compression" field (see codecs.ts). Nothing is
+ * base64-encoded, so the body is a third smaller than the JSON transport.
+ */
+
+const MAX_METADATA_BYTES = 16 * 1024 * 1024;
+
+/** The request fields of a binary body, with fullCode decompressed to text. */
+export const decodeBinaryPayload = async (body: Buffer, metadataLength: number, maxCodeBytes: number) => {
+  if (!Number.isInteger(metadataLength) || metadataLength <= 0 || metadataLength > Math.min(body.length, MAX_METADATA_BYTES)) {
+    throw new PayloadError(400, "Missing or invalid X-Dokugen-Metadata-Length header");
+  }
+
+  let metadata: any;
+  try {
+    metadata = JSON.parse(body.subarray(0, metadataLength).toString("utf-8"));
+  } catch {
+    throw new PayloadError(400, "Metadata is not valid JSON");
+  }
+  if (!metadata || typeof metadata !== "object" || Array.isArray(metadata)) {
+    throw new PayloadError(400, "Metadata must be a JSON object");
+  }
+
+  const fullCode = await decompress(
+    body.subarray(metadataLength),
+    maxCodeBytes,
+    metadata.compression || "gzip",
+    metadata.compressionDictionary,
+  );
+  // existingReadme travels as plain text inside the metadata
+  return { ...metadata, fullCode: fullCode.toString("utf-8"), compressed: false };
+};
@@ -0,0 +1,112 @@
+import { createHash } from "crypto";
+
+/**
+ * In-memory, content-addressed store for chunked README uploads.
+ * Chunks are keyed by their owner (the uploading client's IP) and the
+ * SHA-256 of their (decompressed) bytes, so a client can only see, query
+ * and assemble chunks it uploaded itself; identical chunks from two
+ * clients are stored twice. They are kept for CHUNK_TTL_MS after their
+ * last use and evicted oldest-first once the store holds more than
+ * MAX_STORE_BYTES. Each owner may hold at most MAX_CLIENT_BYTES, so no one
+ * client can push everyone else's out. A client re-uploads whatever a
+ * manifest names that is no longer here.
+ *
+ * The store is per process: with more than one server instance, chunks
+ * and the generate request that names them must reach the same instance
+ * (sticky sessions) or the request gets a 409 for chunks held elsewhere.
+ */
+
+export const CHUNK_HASH_PATTERN = /^[0-9a-f]{64}$/;
+export const MAX_CHUNK_BYTES = 8 * 1024 * 1024;
+const CHUNK_TTL_MS = 60 * 60 * 1000;
+const MAX_STORE_BYTES = 512 * 1024 * 1024;
+// Room for one upload at readme.ts's 50 MB decompressed limit
+const MAX_CLIENT_BYTES = 64 * 1024 * 1024;
+
+interface StoredChunk {
+  data: Buffer;
+  expires: number;
+  owner: string;
+}
+
+// Map iteration order doubles as least-recently-used order, and so expiry order
+const chunks = new Map<string, StoredChunk>();
+const chunkKey = (owner: string, hash: string) => `${owner} ${hash}`;
+const bytesByOwner = new Map<string, number>();
+let storedBytes = 0;
+
+const addOwnerBytes = (owner: string, delta: number) => {
+  const total = (bytesByOwner.get(owner) || 0) + delta;
+  if (total > 0) bytesByOwner.set(owner, total);
+  else bytesByOwner.delete(owner);
+};
+
+const remove = (key: string) => {
+  const chunk = chunks.get(key);
+  if (!chunk) return;
+  storedBytes -= chunk.data.length;
+  addOwnerBytes(chunk.owner, -chunk.data.length);
+  chunks.delete(key);
+};
+
+const sweepExpired = () => {
+  const now = Date.now();
+  for (const [key, chunk] of chunks) {
+    if (chunk.expires >= now) break;
+    remove(key);
+  }
+};
+
+const touch = (key: string): StoredChunk | undefined => {
+  const chunk = chunks.get(key);
+  if (!chunk) return undefined;
+  if (chunk.expires < Date.now()) {
+    remove(key);
+    return undefined;
+  }
+  chunks.delete(key);
+  chunk.expires = Date.now() + CHUNK_TTL_MS;
+  chunks.set(key, chunk);
+  return chunk;
+};
+
+export const hashChunk = (data: Buffer): string => createHash("sha256").update(data).digest("hex");
+
+/** The owner chunks from this request are stored under and looked up as. */
+export const chunkOwner = (req: { ip?: string }): string => req.ip || "unknown";
+
+export const hasChunk = (hash: string, owner: string): boolean => touch(chunkKey(owner, hash)) !== undefined;
+
+export const missingChunks = (hashes: string[], owner: string): string[] =>
+  hashes.filter((hash) => !hasChunk(hash, owner));
+
+/** Store a chunk for owner; false if that would take owner past its quota. */
+export const putChunk = (hash: string, data: Buffer, owner: string): boolean => {
+  const key = chunkKey(owner, hash);
+  if (touch(key)) return true;
+  sweepExpired();
+  if ((bytesByOwner.get(owner) || 0) + data.length > MAX_CLIENT_BYTES) return false;
+
+  chunks.set(key, { data, expires: Date.now() + CHUNK_TTL_MS, owner });
+  storedBytes += data.length;
+  addOwnerBytes(owner, data.length);
+
+  for (const oldest of chunks.keys()) {
+    if (storedBytes <= MAX_STORE_BYTES) break;
+    remove(oldest);
+  }
+  return true;
+};
+
+/** owner's chunks named by the manifest joined in order, or the hashes owner no longer has stored. */
+export const assembleChunks = (manifest: string[], owner: string): { data?: Buffer; missing: string[] } => {
+  const parts: Buffer[] = [];
+  const missing: string[] = [];
+  for (const hash of manifest) {
+    const chunk = touch(chunkKey(owner, hash));
+    if (chunk) parts.push(chunk.data);
+    else missing.push(hash);
+  }
+  if (missing.length) return { missing: Array.from(new Set(missing)) };
+  return { data: Buffer.concat(parts), missing };
+};
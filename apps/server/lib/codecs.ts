@@ -0,0 +1,103 @@
+import fs from "fs";
+import path from "path";
+import zlib from "zlib";
+import { promisify } from "util";
+import { gunzipAsync } from "../middleware/compression";
+import logger from "../utils/logger";
+
+/**
+ * Decompression for generate-readme payloads, named by the request's
+ * "compression" field: gzip always, zstd when this Node runtime has it
+ * (22.15+), optionally against one of the dictionaries in
+ * apps/server/dictionaries/ (the same files the CLI ships). /api/health
+ * lists what is available so clients only pick what this server reads.
+ */
+
+const ZSTD_DICTIONARY_MAGIC = 0xec30a437;
+const DICTIONARY_DIRS = [
+  path.join(__dirname, "..", "dictionaries"),
+  path.join(__dirname, "..", "..", "dictionaries"),
+];
+
+export class PayloadError extends Error {
+  status: number;
+
+  constructor(status: number, message: string) {
+    super(message);
+    this.status = status;
+  }
+}
+
+const zstdDecompressSync: ((buf: Buffer, options?: object) => Buffer) | undefined = (zlib as any).zstdDecompressSync;
+const zstdDecompressAsync: ((buf: Buffer, options?: object) => Promise<Buffer>) | undefined =
+  (zlib as any).zstdDecompress && promisify((zlib as any).zstdDecompress);
+const zstdCompressSync: ((buf: Buffer, options?: object) => Buffer) | undefined = (zlib as any).zstdCompressSync;
+
+const loadDictionaries = (): Map<number, Buffer> => {
+  const dictionaries = new Map<number, Buffer>();
+  if (!zstdDecompressSync || !zstdCompressSync) return dictionaries;
+
+  const dir = DICTIONARY_DIRS.find((d) => fs.existsSync(d));
+  if (!dir) return dictionaries;
+
+  for (const name of fs.readdirSync(dir).filter((n) => n.endsWith(".zdict"))) {
+    const dictionary = fs.readFileSync(path.join(dir, name));
+    if (dictionary.length < 8 || dictionary.readUInt32LE(0) !== ZSTD_DICTIONARY_MAGIC) continue;
+
+    // Older runtimes ignore the dictionary option; a frame that still decodes without it gives that away
+    try {
+      const probe = Buffer.from(`dokugen dictionary probe ${name}`);
+      const frame = zstdCompressSync(probe, { dictionary });
+      let ignored = true;
+      try {
+        zstdDecompressSync(frame);
+      } catch {
+        ignored = false;
+      }
+      if (ignored || !zstdDecompressSync(frame, { dictionary }).equals(probe)) continue;
+    } catch {
+      continue;
+    }
+    dictionaries.set(dictionary.readUInt32LE(4), dictionary);
+  }
+  if (dictionaries.size) logger.info({ dictionaries: [...dictionaries.keys()] }, "Loaded zstd dictionaries");
+  return dictionaries;
+};
+
+const dictionaries = loadDictionaries();
+
+/** Entries for the health endpoint's feature list. */
+export const compressionFeatures = (): string[] => {
+  if (!zstdDecompressAsync) return [];
+  return ["zstd", ...[...dictionaries.keys()].map((id) => `zstd-dictionary:${id}`)];
+};
+
+/** Decompress one payload field; PayloadError carries the HTTP status to answer with. */
+export const decompress = async (
+  data: Buffer,
+  maxOutputLength: number,
+  compression: string = "gzip",
+  dictionaryId: number | null = null,
+): Promise<Buffer> => {
+  let decode: Promise<Buffer>;
+  if (compression === "gzip") {
+    decode = gunzipAsync(data, { maxOutputLength });
+  } else if (compression === "zstd" && zstdDecompressAsync) {
+    const dictionary = dictionaryId ? dictionaries.get(dictionaryId) : undefined;
+    if (dictionaryId && !dictionary) {
+      throw new PayloadError(415, `Unknown zstd dictionary: ${dictionaryId}`);
+    }
+    decode = zstdDecompressAsync(data, { maxOutputLength, ...(dictionary && { dictionary }) });
+  } else {
+    throw new PayloadError(415, `Unsupported compression: ${compression}`);
+  }
+
+  try {
+    return await decode;
+  } catch (error: any) {
+    if (error?.code === "ERR_BUFFER_TOO_LARGE") {
+      throw new PayloadError(413, `Payload too large after decompression (max ${Math.round(maxOutputLength / 1024 / 1024)} MB)`);
+    }
+    throw new PayloadError(400, `Payload is not valid ${compression} data`);
+  }
+};
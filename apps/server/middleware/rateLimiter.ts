@@ -10,7 +10,18 @@ export const limiter = rateLimit({
   skip: (req: Request) => {
     return (
       req.path === "/health" ||
-      req.path === "/api/health"
+      req.path === "/api/health" ||
+      req.path.startsWith("/api/chunks/")
     );
   },
 });
+
+// A chunked upload is many small requests that never reach the model; applied
+// per route in routes/chunks.ts, with a per-client byte quota in lib/chunkStore.ts
+export const chunkLimiter = rateLimit({
+  windowMs: 10 * 60 * 1000,
+  max: 5000,
+  message: "Too many chunk uploads, try again later.",
+  standardHeaders: true,
+  legacyHeaders: false,
+});
@@ -0,0 +1,66 @@
+import express, { Router, Request, Response } from "express";
+import { gunzipAsync } from "../middleware/compression";
+import {
+  CHUNK_HASH_PATTERN,
+  MAX_CHUNK_BYTES,
+  chunkOwner,
+  hashChunk,
+  missingChunks,
+  putChunk,
+} from "../lib/chunkStore";
+import { chunkLimiter } from "../middleware/rateLimiter";
+import logger from "../utils/logger";
+
+const router = Router();
+
+const MAX_HASHES_PER_QUERY = 1024;
+
+const isChunkHash = (value: unknown): value is string =>
+  typeof value === "string" && CHUNK_HASH_PATTERN.test(value);
+
+router.post(
+  "/chunks/missing",
+  chunkLimiter,
+  express.json({ limit: "1mb" }),
+  (req: Request, res: Response): any => {
+    const { hashes } = req.body || {};
+    if (!Array.isArray(hashes) || hashes.length > MAX_HASHES_PER_QUERY || !hashes.every(isChunkHash)) {
+      return res.status(400).json({ error: `Expected up to ${MAX_HASHES_PER_QUERY} SHA-256 hex chunk hashes` });
+    }
+    return res.status(200).json({ missing: missingChunks(hashes, chunkOwner(req)) });
+  },
+);
+
+router.put(
+  "/chunks/:hash",
+  chunkLimiter,
+  express.raw({ type: "application/octet-stream", limit: MAX_CHUNK_BYTES }),
+  async (req: Request, res: Response): Promise<any> => {
+    const { hash } = req.params;
+    if (!isChunkHash(hash)) {
+      return res.status(400).json({ error: "Chunk hash must be a SHA-256 hex digest" });
+    }
+    if (!Buffer.isBuffer(req.body) || !req.body.length) {
+      return res.status(400).json({ error: "Expected a gzipped application/octet-stream body" });
+    }
+
+    try {
+      const data = await gunzipAsync(req.body, { maxOutputLength: MAX_CHUNK_BYTES });
+      if (hashChunk(data) !== hash) {
+        return res.status(422).json({ error: "Chunk content does not match its hash" });
+      }
+      if (!putChunk(hash, data, chunkOwner(req))) {
+        return res.status(429).json({ error: "Chunk storage quota reached, try again later" });
+      }
+      return res.status(201).json({ hash });
+    } catch (error: any) {
+      if (error?.code === "ERR_BUFFER_TOO_LARGE") {
+        return res.status(413).json({ error: `Chunk too large after decompression (max ${MAX_CHUNK_BYTES} bytes)` });
+      }
+      logger.warn({ hash, message: error?.message }, "Rejected chunk upload");
+      return res.status(400).json({ error: "Chunk body is not valid gzip" });
+    }
+  },
+);
+
+export default router;
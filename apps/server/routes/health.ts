@@ -1,11 +1,16 @@
 import { Router, Request, Response } from "express";
+import { compressionFeatures } from "../lib/codecs";
 
 const router = Router();
 
+// Optional protocol features clients may use when they see them listed here
+const FEATURES = ["chunked-upload", "binary-upload", ...compressionFeatures()];
+
 router.get("/health", (_req: Request, res: Response) => {
   res.status(200).json({
     status: "Ok",
     uptime: process.uptime(),
+    features: FEATURES,
   });
 });
 
@@ -3,7 +3,9 @@ import os from "os";
 import { v4 as uuidv4 } from "uuid";
 import OpenAI from "openai";
 import { fetchGitHubReadme } from "../lib/fetchGitHubReadme";
-import { gunzipAsync } from "../middleware/compression";
+import { assembleChunks, chunkOwner } from "../lib/chunkStore";
+import { decodeBinaryPayload } from "../lib/binaryPayload";
+import { PayloadError, decompress } from "../lib/codecs";
 import { trackUser } from "../lib/supabaseTracker";
 import { getSystemInstruction } from "../prompts/systemInstruction";
 import { buildUserPrompt } from "../prompts/userPrompt";
@@ -11,9 +13,13 @@ import logger from "../utils/logger";
 
 const router = Router();
 
+const MAX_DECOMPRESSED_BYTES = 50 * 1024 * 1024;
+const SSE_HEARTBEAT_MS = 15 * 1000;
+
 router.post(
   "/generate-readme",
   express.json({ limit: "500mb" }),
+  express.raw({ type: "application/octet-stream", limit: "500mb" }),
   async (req: Request, res: Response): Promise<any> => {
     const controller = new AbortController();
     let clientDisconnected = false;
@@ -25,20 +31,33 @@ router.post(
     });
 
     try {
+      let body = req.body;
+      if (Buffer.isBuffer(req.body)) {
+        try {
+          body = await decodeBinaryPayload(req.body, Number(req.get("X-Dokugen-Metadata-Length")), MAX_DECOMPRESSED_BYTES);
+        } catch (error) {
+          if (error instanceof PayloadError) {
+            return res.status(error.status).json({ error: error.message });
+          }
+          throw error;
+        }
+      }
+
       const {
         projectType,
         projectFiles,
         fullCode: rawFullCode,
+        fullCodeManifest,
         userInfo,
         options = {},
         existingReadme: rawExistingReadme,
         repoUrl,
         customReadmeFormat,
         compressed = false,
-      } = req.body;
+      } = body;
 
       logger.info(
-        { projectType, compressed, hasExistingReadme: !!rawExistingReadme },
+        { projectType, compressed, binary: Buffer.isBuffer(req.body), chunks: fullCodeManifest?.length, hasExistingReadme: !!rawExistingReadme },
         "Generate README request received (DeepSeek OpenAI SDK)"
       );
 
@@ -50,23 +69,30 @@ router.post(
       let fullCode = rawFullCode;
       let existingReadme = rawExistingReadme;
 
-      if (compressed) {
-        const MAX_DECOMPRESSED_BYTES = 50 * 1024 * 1024;
-        if (rawFullCode) {
-          const buffer = Buffer.from(rawFullCode, "base64");
-          const decompressed = await gunzipAsync(buffer);
-          if (decompressed.length > MAX_DECOMPRESSED_BYTES) {
-            return res.status(413).json({ error: "Payload too large after decompression (max 50 MB)" });
-          }
-          fullCode = decompressed.toString("utf-8");
+      // Chunked uploads name their code by manifest; the chunks were PUT beforehand
+      if (Array.isArray(fullCodeManifest)) {
+        const { data, missing } = assembleChunks(fullCodeManifest, chunkOwner(req));
+        if (!data) {
+          return res.status(409).json({ error: "Some chunks are missing, upload them and retry", missing });
+        }
+        if (data.length > MAX_DECOMPRESSED_BYTES) {
+          return res.status(413).json({ error: "Payload too large after decompression (max 50 MB)" });
         }
-        if (rawExistingReadme) {
-          const buffer = Buffer.from(rawExistingReadme, "base64");
-          const decompressed = await gunzipAsync(buffer);
-          if (decompressed.length > MAX_DECOMPRESSED_BYTES) {
-            return res.status(413).json({ error: "Payload too large after decompression (max 50 MB)" });
+        fullCode = data.toString("utf-8");
+      }
+
+      if (compressed) {
+        // gzip unless the client negotiated zstd through /api/health features
+        const decode = async (field: string) =>
+          (await decompress(Buffer.from(field, "base64"), MAX_DECOMPRESSED_BYTES, body.compression, body.compressionDictionary)).toString("utf-8");
+        try {
+          if (rawFullCode) fullCode = await decode(rawFullCode);
+          if (rawExistingReadme) existingReadme = await decode(rawExistingReadme);
+        } catch (error) {
+          if (error instanceof PayloadError) {
+            return res.status(error.status).json({ error: error.message });
           }
-          existingReadme = decompressed.toString("utf-8");
+          throw error;
         }
       }
 
@@ -124,29 +150,35 @@ router.post(
       res.setHeader("Cache-Control", "no-cache");
       res.setHeader("Connection", "keep-alive");
 
-      let isFirstText = true;
-      let initialBuffer = "";
-
-      for await (const chunk of stream) {
-        if (clientDisconnected) break;
-        const text = chunk.choices[0]?.delta?.content || "";
-        if (!text) continue;
-
-        if (isFirstText) {
-          initialBuffer += text;
-          if (initialBuffer.length >= 20 || initialBuffer.includes("\n")) {
-            initialBuffer = initialBuffer.replace(/^```(?:markdown)?\s*\n?/i, "");
-            isFirstText = false;
-            res.write(`data: ${JSON.stringify({ response: initialBuffer })}\n\n`);
+      // Comment lines keep proxies and the client's read timeout from closing a stream the model is slow to fill
+      const heartbeat = setInterval(() => res.write(": keep-alive\n\n"), SSE_HEARTBEAT_MS);
+      try {
+        let isFirstText = true;
+        let initialBuffer = "";
+
+        for await (const chunk of stream) {
+          if (clientDisconnected) break;
+          const text = chunk.choices[0]?.delta?.content || "";
+          if (!text) continue;
+
+          if (isFirstText) {
+            initialBuffer += text;
+            if (initialBuffer.length >= 20 || initialBuffer.includes("\n")) {
+              initialBuffer = initialBuffer.replace(/^```(?:markdown)?\s*\n?/i, "");
+              isFirstText = false;
+              res.write(`data: ${JSON.stringify({ response: initialBuffer })}\n\n`);
+            }
+          } else {
+            res.write(`data: ${JSON.stringify({ response: text })}\n\n`);
           }
-        } else {
-          res.write(`data: ${JSON.stringify({ response: text })}\n\n`);
         }
-      }
 
-      if (isFirstText && initialBuffer && !clientDisconnected) {
-        initialBuffer = initialBuffer.replace(/^```(?:markdown)?\s*\n?/i, "");
-        res.write(`data: ${JSON.stringify({ response: initialBuffer })}\n\n`);
+        if (isFirstText && initialBuffer && !clientDisconnected) {
+          initialBuffer = initialBuffer.replace(/^```(?:markdown)?\s*\n?/i, "");
+          res.write(`data: ${JSON.stringify({ response: initialBuffer })}\n\n`);
+        }
+      } finally {
+        clearInterval(heartbeat);
       }
 
       if (!clientDisconnected) {
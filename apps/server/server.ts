@@ -6,6 +6,7 @@ import logger from "./utils/logger";
 import { limiter } from "./middleware/rateLimiter";
 import healthRouter from "./routes/health";
 import readmeRouter from "./routes/readme";
+import chunksRouter from "./routes/chunks";
 import commitRouter from "./routes/commit";
 import trackRouter from "./routes/track";
 import ogRouter from "./routes/og";
@@ -19,7 +20,7 @@ app.set("trust proxy", 1);
 app.use(
   cors({
     origin: "*",
-    methods: ["GET", "POST", "OPTIONS"],
+    methods: ["GET", "POST", "PUT", "OPTIONS"],
     allowedHeaders: ["*"],
   }),
 );
@@ -28,6 +29,7 @@ app.use(express.json({ limit: "10mb" }));
 app.use(express.urlencoded({ limit: "10mb", extended: true }));
 app.use(limiter);
 app.use("/api", healthRouter);
+app.use("/api", chunksRouter);
 app.use("/api", readmeRouter);
 app.use("/api", commitRouter);
 app.use("/api", trackRouter);